@@ -0,0 +1,53 @@
+"""
+Toplu model analizi
+
+Analiz edilmemiş modelleri bir süreç havuzunda analiz eder; sonuçlar
+tek bulk_create ile yazılır.
+
+Kullanım:
+    python manage.py analyze_models
+    python manage.py analyze_models --project <proje-id> --processes 8
+    python manage.py analyze_models --models <model-id> <model-id> --include-stale
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analysis.services.bulk import bulk_analyze, default_processes
+from apps.models.models import Model3D, Project
+
+
+class Command(BaseCommand):
+    help = 'Analiz edilmemiş modelleri paralel analiz eder'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', help='Yalnızca bu projenin modelleri')
+        parser.add_argument('--models', nargs='+', help='Yalnızca bu model id\'leri')
+        parser.add_argument('--processes', type=int, default=default_processes(),
+                            help='Paralel süreç sayısı')
+        parser.add_argument('--include-stale', action='store_true',
+                            help='Model değiştikten sonra eskimiş analizleri de yenile')
+
+    def handle(self, *args, **options):
+        queryset = Model3D.objects.all()
+        if options['project']:
+            if not Project.objects.filter(id=options['project']).exists():
+                raise CommandError(f'Proje bulunamadı: {options["project"]}')
+            queryset = queryset.filter(project_id=options['project'])
+        if options['models']:
+            queryset = queryset.filter(id__in=options['models'])
+
+        def progress(entry):
+            if entry['success']:
+                self.stdout.write(f'  {entry["name"]:<40} {entry["bytes"] / 1e6:8.1f} MB  {entry["seconds"]:7.2f} s')
+            else:
+                self.stderr.write(f'  {entry["name"]:<40} HATA: {entry["error"]}')
+
+        report = bulk_analyze(queryset, processes=options['processes'],
+                              include_stale=options['include_stale'], on_result=progress)
+
+        self.stdout.write(
+            f'{report["analyzed"]} model analiz edildi, {report["failed"]} hata, '
+            f'{report["seconds"]:.2f} s ({report["processes"]} süreç)'
+        )
+        self.stdout.write(
+            f'Verim: {report["models_per_second"]:.2f} model/s, {report["mb_per_second"]:.2f} MB/s'
+        )
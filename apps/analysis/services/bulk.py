@@ -0,0 +1,143 @@
+"""
+Toplu Analiz Servisi
+Analiz edilmemiş modelleri bir süreç havuzunda analiz eder, sonuçları tek sorguda yazar
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import connections
+
+from apps.core.services.mesh_cache import mesh_cache
+from apps.core.services.profiling import PhaseTimer
+from apps.models.models import ModelAnalysis
+from .feature_detector import FeatureDetector
+from .incremental import ANALYSIS_FIELDS, analysis_fields
+
+
+def default_processes():
+    return getattr(settings, 'ANALYSIS_BULK_PROCESSES', None) or os.cpu_count() or 1
+
+
+def pending_models(queryset, include_stale=False):
+    """
+    Analiz bekleyen modeller, büyükten küçüğe dosya boyutuna göre
+
+    En büyük modeller önce dağıtılır; küçükler sona kalan boşlukları
+    doldurduğu için süreçler arasında yük dengelenir.
+
+    Args:
+        queryset: Model3D queryset'i
+        include_stale: Model değiştikten sonra eskimiş analizleri de dahil et
+
+    Returns:
+        [(model, dosya yolu, bayt)] listesi
+    """
+    pending = []
+    for model in queryset.select_related('analysis', 'current_step'):
+        path = model.current_file.path
+        analysis = getattr(model, 'analysis', None)
+        if analysis is not None:
+            if not include_stale or analysis.mesh_hash == mesh_cache.key_for(path):
+                continue
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = model.file_size
+        pending.append((model, path, size))
+
+    pending.sort(key=lambda item: item[2], reverse=True)
+    return pending
+
+
+def analyze_file(path):
+    """
+    Tek dosyayı analiz et (havuz süreçlerinde çalışır; veritabanına dokunmaz)
+
+    Returns:
+        (ModelAnalysis alanları, mesh özeti, ölçümler)
+    """
+    timer = PhaseTimer()
+    with timer.phase('load'):
+        detector = FeatureDetector(path)
+    timer.record_mesh('input', detector.mesh)
+    with timer.phase('compute'):
+        fields = analysis_fields(detector.analyze())
+    return fields, mesh_cache.key_for(path), timer.as_dict()
+
+
+def bulk_analyze(queryset, processes=None, include_stale=False, on_result=None, before_save=None):
+    """
+    Modelleri paralel analiz et ve sonuçları tek bulk_create ile kaydet
+
+    Args:
+        queryset: Model3D queryset'i
+        processes: Süreç sayısı (1 ise havuz kurulmaz)
+        include_stale: Eskimiş analizleri de yenile
+        on_result: Her model bittiğinde çağrılır (ilerleme çıktısı için)
+        before_save: Sonuçlar yazılmadan hemen önce çağrılır (görev kayıt aşaması)
+
+    Returns:
+        Rapor dictionary'si (model başına süreler ve toplam verim)
+    """
+    processes = processes or default_processes()
+    pending = pending_models(queryset, include_stale)
+    start = time.perf_counter()
+    results = []
+    analyses = []
+
+    def collect(model, size, outcome=None, error=None):
+        entry = {'model_id': str(model.id), 'name': model.name, 'bytes': size}
+        if error is None:
+            fields, digest, metrics = outcome
+            analyses.append(ModelAnalysis(model=model, mesh_hash=digest, metrics=metrics, **fields))
+            entry.update(success=True, seconds=round(metrics['total'], 3))
+        else:
+            entry.update(success=False, error=error)
+        results.append(entry)
+        if on_result is not None:
+            on_result(entry)
+
+    if processes <= 1 or len(pending) <= 1:
+        for model, path, size in pending:
+            try:
+                collect(model, size, analyze_file(path))
+            except Exception as e:
+                collect(model, size, error=str(e))
+    else:
+        # Fork edilen süreçler ebeveynin veritabanı bağlantılarını paylaşmamalı
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=min(processes, len(pending))) as pool:
+            futures = {pool.submit(analyze_file, path): (model, size) for model, path, size in pending}
+            for future in as_completed(futures):
+                model, size = futures[future]
+                try:
+                    collect(model, size, future.result())
+                except Exception as e:
+                    collect(model, size, error=str(e))
+
+    if analyses:
+        if before_save is not None:
+            before_save()
+        # Eskimiş kayıtlar (aynı model) yerinde güncellenir
+        ModelAnalysis.objects.bulk_create(
+            analyses,
+            update_conflicts=True,
+            unique_fields=['model'],
+            update_fields=list(ANALYSIS_FIELDS) + ['mesh_hash', 'metrics', 'updated_at'],
+        )
+
+    elapsed = time.perf_counter() - start
+    succeeded = [entry for entry in results if entry['success']]
+    total_bytes = sum(entry['bytes'] for entry in succeeded)
+    return {
+        'processes': processes,
+        'analyzed': len(succeeded),
+        'failed': len(results) - len(succeeded),
+        'seconds': round(elapsed, 3),
+        'models_per_second': round(len(succeeded) / elapsed, 3) if elapsed > 0 else 0.0,
+        'mb_per_second': round(total_bytes / 1e6 / elapsed, 3) if elapsed > 0 else 0.0,
+        'results': results,
+    }
+
@@ -0,0 +1,318 @@
+"""
+Kesit Profili Servisi
+Mesh'i ana (PCA) ekseni boyunca paralel düzlemlerle keserek kesit alanı ve çevresi çıkarır
+"""
+import numpy as np
+import trimesh
+from django.core.cache import cache
+
+# Önbelleğe alınan temel çözünürlük; daha düşük çözünürlükler buradan örneklenir
+BASE_LEVELS = 256
+
+# Uçlardaki kesitler (uç noktalar) en dar kesit adayı sayılmaz
+END_TRIM = 0.1
+
+AXIS_NAMES = ['x', 'y', 'z']
+
+
+def principal_axis(mesh: trimesh.Trimesh):
+    """
+    Alan ağırlıklı yüzey dağılımının ana ekseni
+
+    Returns:
+        (merkez, birim eksen vektörü)
+    """
+    centers = mesh.triangles_center
+    weights = mesh.area_faces
+    total = weights.sum()
+    if total <= 0:
+        weights = np.ones(len(centers))
+        total = float(len(centers))
+
+    center = (centers * weights[:, None]).sum(axis=0) / total
+    offset = centers - center
+    covariance = (offset * weights[:, None]).T @ offset / total
+    _, vectors = np.linalg.eigh(covariance)
+    axis = vectors[:, -1]
+
+    # İşaret belirsizliğini kaldır: en büyük bileşen pozitif olsun
+    if axis[np.argmax(np.abs(axis))] < 0:
+        axis = -axis
+    return center, axis
+
+
+def profile_key(mesh_hash: str) -> str:
+    """Temel profilin önbellek anahtarı"""
+    return f'section-profile:{mesh_hash}:{BASE_LEVELS}'
+
+
+def _rotated_axis(rotation, axis):
+    """Dönmüş ana eksen ve işaret kuralı eksenin yönünü çevirdi mi?"""
+    axis = rotation @ np.asarray(axis, dtype=np.float64)
+    flipped = bool(axis[np.argmax(np.abs(axis))] < 0)
+    return (-axis if flipped else axis), flipped
+
+
+def transform_profile(profile: dict, matrix) -> dict:
+    """
+    Katı dönüşüm sonrası kesit profili (yeniden kesmeden)
+
+    Ana eksen ve ağırlık merkezi mesh'le birlikte döner; alan ve çevre
+    değişmez. İşaret kuralı (en büyük bileşen pozitif) eksenin yönünü
+    çevirirse seviyeler ters sırada, yükseklikler negatif olur.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    axis, flipped = _rotated_axis(matrix[:3, :3], profile['axis'])
+    order = slice(None, None, -1) if flipped else slice(None)
+    return {
+        'origin': trimesh.transformations.transform_points([profile['origin']], matrix)[0],
+        'axis': axis,
+        'heights': -profile['heights'][::-1] if flipped else profile['heights'],
+        'area': profile['area'][order],
+        'perimeter': profile['perimeter'][order],
+        'centers': trimesh.transformations.transform_points(profile['centers'], matrix)[order],
+    }
+
+
+def transform_section(section: dict, matrix) -> dict:
+    """describe() çıktısını katı dönüşümle taşı (transform_profile ile aynı kural)"""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    axis, flipped = _rotated_axis(matrix[:3, :3], section['axis'])
+    position = section['position']
+    moved = trimesh.transformations.transform_points([[position['x'], position['y'], position['z']]], matrix)[0]
+    return dict(
+        section,
+        position={'x': float(moved[0]), 'y': float(moved[1]), 'z': float(moved[2])},
+        direction=AXIS_NAMES[int(np.argmax(np.abs(axis)))],
+        axis=[float(v) for v in axis],
+        height=-section['height'] if flipped else section['height'],
+    )
+
+
+def carry_over_rotation(previous_hash: str, mesh_hash: str, matrix) -> bool:
+    """
+    Önceki mesh'in önbellekteki profilini döndürülmüş mesh'e taşı
+
+    Returns:
+        Profil taşındı mı? (önceki profil önbellekte yoksa False)
+    """
+    profile = cache.get(profile_key(previous_hash))
+    if profile is None:
+        return False
+    cache.set(profile_key(mesh_hash), transform_profile(profile, matrix), timeout=None)
+    return True
+
+
+class CrossSectionEngine:
+    """
+    Ana eksen boyunca N seviyede kesit alanı/çevresi hesaplayan sınıf.
+
+    Tüm seviyeler tek vektörel geçişte kesilir (vertex yükseklikleri bir
+    kez hesaplanır; trimesh.intersections.mesh_multiplane ise her düzlem
+    için tüm mesh'i yeniden tarar). Profil mesh özetiyle önbelleğe
+    alınır; farklı çözünürlükler yeniden kesilmeden temel profilden
+    örneklenir.
+    """
+
+    def __init__(self, mesh: trimesh.Trimesh, mesh_hash: str = None):
+        """
+        Args:
+            mesh: Kesilecek mesh
+            mesh_hash: Mesh içerik özeti (None ise önbellek kullanılmaz)
+        """
+        self.mesh = mesh
+        self.mesh_hash = mesh_hash
+
+    def _slice(self, levels: int) -> dict:
+        """
+        Mesh'i levels adet eşit aralıklı düzlemle tek geçişte kes
+
+        Her yüz yalnızca yükseklik aralığına düşen düzlemlerle eşlenir;
+        tüm (yüz, düzlem) çiftlerinin kesit segmentleri birlikte hesaplanır
+        ve seviye başına bincount ile toplanır.
+        """
+        mesh = self.mesh
+        origin, axis = principal_axis(mesh)
+        vertices = np.asarray(mesh.vertices, dtype=np.float64) - origin
+        projection = vertices @ axis
+        low, high = projection.min(), projection.max()
+
+        # Kutu ortaları: uçlardaki tek noktalı kesitler atlanır
+        step = (high - low) / levels
+        heights = low + step * (np.arange(levels) + 0.5)
+
+        # Yüz → kestiği düzlem aralığı [first, last): fmin <= h < fmax
+        faces = mesh.faces
+        face_heights = projection[faces]
+        first = np.searchsorted(heights, face_heights.min(axis=1), side='left')
+        last = np.searchsorted(heights, face_heights.max(axis=1), side='left')
+        counts = last - first
+        face = np.repeat(np.arange(len(faces)), counts)
+        offsets = np.cumsum(counts) - counts
+        level = first[face] + np.arange(len(face)) - offsets[face]
+        height = heights[level]
+
+        # Her çiftte düzlemi kesen iki kenarı bul ve kesişim noktalarını hesapla
+        corners = face_heights[face]
+        above = corners > height[:, None]
+        crossing = above != np.roll(above, -1, axis=1)
+        edge_a = np.argmax(crossing, axis=1)
+        edge_b = 2 - np.argmax(crossing[:, ::-1], axis=1)
+
+        def intersect(edge):
+            i, j = faces[face, edge], faces[face, (edge + 1) % 3]
+            di, dj = projection[i], projection[j]
+            t = (height - di) / (dj - di)
+            return vertices[i] + t[:, None] * (vertices[j] - vertices[i])
+
+        start, end = intersect(edge_a), intersect(edge_b)
+
+        # Segmentleri yüz normali dışa bakacak şekilde yönlendir (eksene göre CCW)
+        outward = np.cross(end - start, axis)
+        flip = np.einsum('ij,ij->i', outward, mesh.face_normals[face]) < 0
+        start, end = np.where(flip[:, None], end, start), np.where(flip[:, None], start, end)
+
+        # Düzlem üzerindeki bir noktaya göre shoelace: 2 × işaretli alan
+        plane_points = heights[level][:, None] * axis
+        start, end = start - plane_points, end - plane_points
+        cross = np.cross(start, end) @ axis
+
+        signed = np.bincount(level, weights=cross, minlength=levels) / 2.0
+        perimeter = np.bincount(level, weights=np.linalg.norm(end - start, axis=1), minlength=levels)
+        moment = np.column_stack([
+            np.bincount(level, weights=(start[:, i] + end[:, i]) * cross, minlength=levels)
+            for i in range(3)
+        ])
+
+        safe = np.where(signed != 0, signed, 1.0)
+        centers = origin + heights[:, None] * axis + np.where(
+            (signed != 0)[:, None], moment / (6.0 * safe[:, None]), 0.0
+        )
+
+        return {
+            'origin': origin,
+            'axis': axis,
+            'heights': heights,
+            'area': np.abs(signed),
+            'perimeter': perimeter,
+            'centers': centers,
+        }
+
+    def _base_profile(self) -> dict:
+        if self.mesh_hash is None:
+            return self._slice(BASE_LEVELS)
+        key = profile_key(self.mesh_hash)
+        profile = cache.get(key)
+        if profile is None:
+            profile = self._slice(BASE_LEVELS)
+            cache.set(key, profile, timeout=None)
+        return profile
+
+    def profile(self, levels: int = 64) -> dict:
+        """
+        Kesit profili
+
+        Args:
+            levels: Seviye sayısı
+
+        Returns:
+            {'origin', 'axis', 'heights', 'area', 'perimeter', 'centers'}
+            (seviye başına diziler ana eksen boyunca sıralı)
+        """
+        levels = int(levels)
+        if levels > BASE_LEVELS:
+            return self._slice(levels)
+
+        base = self._base_profile()
+        if levels == BASE_LEVELS:
+            return base
+
+        # Temel profili istenen kutu ortalarında doğrusal örnekle
+        heights = base['heights']
+        half = (heights[1] - heights[0]) / 2.0 if len(heights) > 1 else 0.0
+        low, high = heights[0] - half, heights[-1] + half
+        step = (high - low) / levels
+        targets = low + step * (np.arange(levels) + 0.5)
+        return {
+            'origin': base['origin'],
+            'axis': base['axis'],
+            'heights': targets,
+            'area': np.interp(targets, heights, base['area']),
+            'perimeter': np.interp(targets, heights, base['perimeter']),
+            'centers': np.column_stack([
+                np.interp(targets, heights, base['centers'][:, i]) for i in range(3)
+            ]),
+        }
+
+    def centerline(self, levels: int = 64, smoothing: int = 2) -> dict:
+        """
+        Kesit ağırlık merkezlerinden merkez eğrisi (iskelet)
+
+        Kıvrık kanal boyunca her seviyenin kesit merkezi bir yol noktasıdır;
+        boş kesitler atlanır, uçlar sabit tutularak hafifçe yumuşatılır.
+
+        Args:
+            levels: Seviye sayısı (yol noktası sayısı)
+            smoothing: [1, 2, 1] yumuşatma tekrarı
+
+        Returns:
+            {'points': (N, 3), 'area': (N,), 'heights': (N,), 'axis'}
+            ana eksen boyunca sıralı
+        """
+        profile = self.profile(levels)
+        keep = profile['area'] > 0
+        points = profile['centers'][keep]
+        for _ in range(smoothing if len(points) > 2 else 0):
+            points[1:-1] = (points[:-2] + 2.0 * points[1:-1] + points[2:]) / 4.0
+        return {
+            'points': points,
+            'area': profile['area'][keep],
+            'heights': profile['heights'][keep],
+            'axis': profile['axis'],
+        }
+
+    def extremes(self, levels: int = 64):
+        """
+        En geniş ve en dar kesit seviyeleri
+
+        En dar kesit, iki yanında daha geniş kesit bulunan (boğaz)
+        seviyeler arasından seçilir; böyle bir seviye yoksa uçlar
+        hariç en küçük kesit alınır.
+
+        Returns:
+            (en geniş indeks, en dar indeks, profil)
+        """
+        profile = self.profile(levels)
+        area = profile['area']
+        widest = int(np.argmax(area))
+
+        left_max = np.maximum.accumulate(area)
+        right_max = np.maximum.accumulate(area[::-1])[::-1]
+        valley = (area > 0) & (area < left_max) & (area < right_max)
+        if valley.any():
+            candidates = np.flatnonzero(valley)
+        else:
+            trim = int(len(area) * END_TRIM)
+            candidates = np.arange(trim, len(area) - trim)
+            candidates = candidates[area[candidates] > 0]
+            if not len(candidates):
+                candidates = np.flatnonzero(area > 0)
+        narrowest = int(candidates[np.argmin(area[candidates])]) if len(candidates) else widest
+        return widest, narrowest, profile
+
+    @staticmethod
+    def describe(profile: dict, index: int) -> dict:
+        """Kesit seviyesini analiz kaydı formatına çevir"""
+        center = profile['centers'][index]
+        axis = profile['axis']
+        area = float(profile['area'][index])
+        return {
+            'position': {'x': float(center[0]), 'y': float(center[1]), 'z': float(center[2])},
+            # Eşdeğer daire çapı
+            'width': float(2.0 * np.sqrt(area / np.pi)),
+            'direction': AXIS_NAMES[int(np.argmax(np.abs(axis)))],
+            'axis': [float(v) for v in axis],
+            'height': float(profile['heights'][index]),
+            'area': area,
+            'perimeter': float(profile['perimeter'][index]),
+        }
@@ -0,0 +1,83 @@
+"""
+Eğrilik Hesaplama Servisi
+Vertex komşuluğu üzerinden vektörize ayrık eğrilik hesapları
+"""
+import numpy as np
+import trimesh
+
+
+class CurvatureEngine:
+    """
+    Mesh'in vertex komşuluğunu bir kez kurup tüm eğrilik
+    hesaplarını NumPy ile vektörize yapan sınıf.
+
+    Her ölçüm O(V + E) karmaşıklığındadır; Python döngüsü yoktur.
+    """
+
+    def __init__(self, mesh: trimesh.Trimesh, edges: np.ndarray = None):
+        """
+        Args:
+            mesh: Eğriliği hesaplanacak trimesh nesnesi
+            edges: Önceden hesaplanmış tekil kenarlar (None ise mesh'ten)
+        """
+        self.mesh = mesh
+        self.vertex_count = len(mesh.vertices)
+
+        # 1-ring komşuluğunu tekil kenarlardan kur (trimesh cache'ler)
+        if edges is None:
+            edges = mesh.edges_unique
+        self.edge_a = edges[:, 0]
+        self.edge_b = edges[:, 1]
+        self.degree = self._scatter(np.ones(len(edges)))
+
+    def _scatter(self, edge_values: np.ndarray) -> np.ndarray:
+        """Kenar değerlerini iki uç vertex'e topla"""
+        n = self.vertex_count
+        return (np.bincount(self.edge_a, weights=edge_values, minlength=n) +
+                np.bincount(self.edge_b, weights=edge_values, minlength=n))
+
+    def _ring_mean(self, edge_values: np.ndarray) -> np.ndarray:
+        """Kenar değerlerinin vertex başına 1-ring ortalaması"""
+        sums = self._scatter(edge_values)
+        return np.divide(sums, self.degree, out=np.zeros_like(sums), where=self.degree > 0)
+
+    def normal_variance(self) -> np.ndarray:
+        """
+        1-ring komşu normallerinin vertex normaline göre ortalama mutlak farkı
+
+        Returns:
+            Vertex başına eğrilik değeri (V,)
+        """
+        normals = self.mesh.vertex_normals
+        diff = np.abs(normals[self.edge_a] - normals[self.edge_b]).mean(axis=1)
+        return self._ring_mean(diff)
+
+    @staticmethod
+    def top_k(values: np.ndarray, k: int, threshold: float = None) -> np.ndarray:
+        """
+        En yüksek k değerin indekslerini argpartition ile seç
+
+        Args:
+            values: Vertex başına değerler
+            k: Seçilecek maksimum indeks sayısı
+            threshold: Bu değerin üstündekiler aday olur (None ise hepsi)
+
+        Returns:
+            Değere göre azalan sırada indeksler
+        """
+        candidates = np.arange(len(values))
+        if threshold is not None:
+            candidates = candidates[values > threshold]
+
+        k = min(int(k), len(candidates))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        candidate_values = values[candidates]
+        if k < len(candidates):
+            part = np.argpartition(-candidate_values, k - 1)[:k]
+        else:
+            part = np.arange(len(candidates))
+
+        order = np.argsort(-candidate_values[part], kind='stable')
+        return candidates[part[order]]
@@ -2,9 +2,139 @@
 3D Model Özellik Tespit Servisi
 Model yükleme, analiz ve özellik çıkarma
 """
+from functools import cached_property
+
 import numpy as np
 import trimesh
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable
+
+from apps.core.services.mesh_cache import mesh_cache
+from .cross_section import CrossSectionEngine
+from .curvature import CurvatureEngine
+from .thickness import ThicknessEngine
+
+# analyze() çıktısındaki metrikler
+METRICS = (
+    'vertices_count', 'faces_count', 'is_watertight', 'volume', 'surface_area',
+    'bounding_box', 'top_points', 'bottom_points', 'sharp_points',
+    'widest_area', 'narrowest_area', 'topology_status', 'wall_thickness',
+)
+
+# En geniş/en dar kesit aramasında ana eksen boyunca seviye sayısı
+SECTION_LEVELS = 64
+
+
+class MeshPass:
+    """
+    Analiz metriklerinin ortak ara sonuçları
+
+    Vertex ve face dizileri üzerinden her ara sonuç yalnızca ilk
+    ihtiyaç anında ve bir kez hesaplanır; bounds, centroid, hacim,
+    kenar topolojisi ve Euler sayısı aynı taramaları paylaşır.
+    """
+
+    def __init__(self, mesh: trimesh.Trimesh):
+        self.vertices = np.asarray(mesh.vertices, dtype=np.float64)
+        self.faces = np.asarray(mesh.faces, dtype=np.int64)
+
+    @cached_property
+    def referenced(self) -> np.ndarray:
+        referenced = np.zeros(len(self.vertices), dtype=bool)
+        referenced[self.faces] = True
+        return referenced
+
+    @cached_property
+    def bounds(self) -> np.ndarray:
+        in_mesh = self.vertices[self.referenced]
+        return np.array([in_mesh.min(axis=0), in_mesh.max(axis=0)])
+
+    @cached_property
+    def triangles(self):
+        """Köşeler, çapraz çarpım ve alanlar (tek geçiş)"""
+        a = self.vertices[self.faces[:, 0]]
+        b = self.vertices[self.faces[:, 1]]
+        c = self.vertices[self.faces[:, 2]]
+        cross = np.cross(b - a, c - a)
+        areas = np.sqrt(np.einsum('ij,ij->i', cross, cross)) / 2.0
+        return a, b, c, cross, areas
+
+    @cached_property
+    def area(self) -> float:
+        return float(self.triangles[4].sum())
+
+    @cached_property
+    def centroid(self) -> np.ndarray:
+        """Alan ağırlıklı üçgen merkezlerinin ortalaması"""
+        a, b, c, _, areas = self.triangles
+        centers = (a + b + c) / 3.0
+        if areas.sum() > 0:
+            return (centers * areas[:, None]).sum(axis=0) / areas.sum()
+        return centers.mean(axis=0)
+
+    @cached_property
+    def volume(self) -> float:
+        """Kapalı yüzeyin hacmi (diverjans teoremi, trimesh ile aynı integral)"""
+        a, b, c, cross, _ = self.triangles
+        return float((cross[:, 0] * (a[:, 0] + b[:, 0] + c[:, 0])).sum() / 6.0)
+
+    @cached_property
+    def edge_topology(self):
+        """
+        Kenarlar tek sıralamayla gruplanır
+
+        Returns:
+            (tekil kenarlar, watertight mı, sarım tutarlı mı)
+        """
+        faces = self.faces
+        directed = np.stack([faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]], axis=1).reshape(-1, 2)
+        low = directed.min(axis=1)
+        high = directed.max(axis=1)
+        keys = low * len(self.vertices) + high
+
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        counts = np.diff(np.r_[starts, len(keys)])
+
+        unique = np.column_stack([low[order[starts]], high[order[starts]]])
+        watertight = bool(len(faces) > 0 and (counts == 2).all())
+
+        # İki kez geçen her kenar iki yüzde zıt yönde olmalı
+        pairs = starts[counts == 2]
+        forward = directed[:, 0] < directed[:, 1]
+        winding = bool(len(faces) > 0 and
+                       (forward[order[pairs]] != forward[order[pairs + 1]]).all())
+        return unique, watertight, winding
+
+    @property
+    def is_watertight(self) -> bool:
+        return self.edge_topology[1]
+
+    @property
+    def is_winding_consistent(self) -> bool:
+        return self.edge_topology[2]
+
+    @cached_property
+    def euler_number(self) -> int:
+        return int(self.referenced.sum() - len(self.edge_topology[0]) + len(self.faces))
+
+    def extreme_indices(self, axis: int, n: int, largest: bool) -> np.ndarray:
+        """
+        Eksendeki en büyük/küçük n vertex (argpartition, O(V))
+
+        Returns:
+            Değere göre artan sırada indeksler
+        """
+        values = self.vertices[:, axis]
+        n = min(int(n), len(values))
+        if n <= 0:
+            return np.empty(0, dtype=np.int64)
+        if n < len(values):
+            part = np.argpartition(values, -n if largest else n - 1)
+            part = part[-n:] if largest else part[:n]
+        else:
+            part = np.arange(len(values))
+        return part[np.argsort(values[part], kind='stable')]
 
 
 class FeatureDetector:
@@ -22,41 +152,58 @@ class FeatureDetector:
     def load_mesh(self):
         """Mesh dosyasını yükle"""
         try:
-            self.mesh = trimesh.load(self.file_path)
-            if isinstance(self.mesh, trimesh.Scene):
-                # Eğer scene ise ilk geometry'yi al
-                self.mesh = list(self.mesh.geometry.values())[0]
+            # Paylaşımlı önbellek; Scene ise ilk geometry alınır
+            self.mesh = mesh_cache.load(self.file_path)
         except Exception as e:
             raise ValueError(f"Mesh yüklenemedi: {str(e)}")
+        self.shared = MeshPass(self.mesh)
     
-    def analyze(self) -> Dict[str, Any]:
+    def analyze(self, metrics: Iterable[str] = None) -> Dict[str, Any]:
         """
         Tüm analizi yap ve sonuçları döndür
         
+        Metrikler ortak ara sonuçları (MeshPass) paylaşır; her biri
+        mesh üzerinde yeniden tarama yapmaz.
+        
+        Args:
+            metrics: İstenen METRICS alt kümesi (None ise hepsi)
+        
         Returns:
             Model analiz sonuçlarını içeren dictionary
         """
         if self.mesh is None:
             raise ValueError("Mesh yüklenmemiş")
         
-        return {
-            'vertices_count': len(self.mesh.vertices),
-            'faces_count': len(self.mesh.faces),
-            'is_watertight': self.mesh.is_watertight,
-            'volume': float(self.mesh.volume) if self.mesh.is_watertight else None,
-            'surface_area': float(self.mesh.area),
-            'bounding_box': self.get_bounding_box(),
-            'top_points': self.get_top_points(),
-            'bottom_points': self.get_bottom_points(),
-            'sharp_points': self.get_sharp_points(),
-            'widest_area': self.get_widest_area(),
-            'narrowest_area': self.get_narrowest_area(),
-            'topology_status': self.check_topology()
+        wanted = METRICS if metrics is None else tuple(metrics)
+        unknown = set(wanted) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen analiz metrikleri: {', '.join(sorted(unknown))}")
+        
+        shared = self.shared
+        compute = {
+            'vertices_count': lambda: len(shared.vertices),
+            'faces_count': lambda: len(shared.faces),
+            'is_watertight': lambda: shared.is_watertight,
+            'volume': lambda: shared.volume if shared.is_watertight else None,
+            'surface_area': lambda: shared.area,
+            'bounding_box': self.get_bounding_box,
+            'top_points': self.get_top_points,
+            'bottom_points': self.get_bottom_points,
+            'sharp_points': self.get_sharp_points,
+            'widest_area': self.get_widest_area,
+            'narrowest_area': self.get_narrowest_area,
+            'topology_status': self.check_topology,
+            'wall_thickness': self.get_wall_thickness,
         }
+        return {name: compute[name]() for name in wanted}
+    
+    @staticmethod
+    def _point(point) -> Dict:
+        return {'x': float(point[0]), 'y': float(point[1]), 'z': float(point[2])}
     
     def get_bounding_box(self) -> Dict:
         """Bounding box bilgilerini al"""
-        bounds = self.mesh.bounds
+        bounds = self.shared.bounds
         min_point = bounds[0].tolist()
         max_point = bounds[1].tolist()
         dimensions = (bounds[1] - bounds[0]).tolist()
@@ -77,20 +224,10 @@ class FeatureDetector:
         Returns:
             En yüksek n noktanın listesi
         """
-        vertices = self.mesh.vertices
-        # Y ekseninde en yüksek noktalar
-        sorted_indices = np.argsort(vertices[:, 1])[-n:]
-        
-        top_points = []
-        for idx in sorted_indices:
-            point = vertices[idx]
-            top_points.append({
-                'x': float(point[0]),
-                'y': float(point[1]),
-                'z': float(point[2])
-            })
-        
-        return top_points
+        # Y ekseninde en yüksek noktalar (artan sırada)
+        vertices = self.shared.vertices
+        indices = self.shared.extreme_indices(1, n, largest=True)
+        return [self._point(vertices[idx]) for idx in indices]
     
     def get_bottom_points(self, n=5) -> List[Dict]:
         """
@@ -102,20 +239,10 @@ class FeatureDetector:
         Returns:
             En alçak n noktanın listesi
         """
-        vertices = self.mesh.vertices
-        # Y ekseninde en düşük noktalar
-        sorted_indices = np.argsort(vertices[:, 1])[:n]
-        
-        bottom_points = []
-        for idx in sorted_indices:
-            point = vertices[idx]
-            bottom_points.append({
-                'x': float(point[0]),
-                'y': float(point[1]),
-                'z': float(point[2])
-            })
-        
-        return bottom_points
+        # Y ekseninde en düşük noktalar (artan sırada)
+        vertices = self.shared.vertices
+        indices = self.shared.extreme_indices(1, n, largest=False)
+        return [self._point(vertices[idx]) for idx in indices]
     
     def get_sharp_points(self, curvature_threshold=0.7, max_points=20) -> List[Dict]:
         """
@@ -129,27 +256,10 @@ class FeatureDetector:
             Sivri noktaların listesi
         """
         try:
-            # Vertex normal'lerini hesapla
-            vertex_normals = self.mesh.vertex_normals
-            
-            # Her vertex için komşu vertex'lerin normallerini karşılaştır
-            # Büyük normal farkları = yüksek eğrilik = sivri nokta
-            curvatures = []
-            
-            for i, vertex in enumerate(self.mesh.vertices):
-                # Yakın vertex'leri bul (basit yaklaşım)
-                distances = np.linalg.norm(self.mesh.vertices - vertex, axis=1)
-                neighbors = np.where(distances < np.percentile(distances, 5))[0]
-                
-                if len(neighbors) > 1:
-                    # Komşu normal'lerin varyansını hesapla
-                    neighbor_normals = vertex_normals[neighbors]
-                    variance = np.mean(np.abs(neighbor_normals - vertex_normals[i]))
-                    curvatures.append((i, float(variance)))
-            
-            # En yüksek eğriliğe sahip noktaları seç
-            curvatures.sort(key=lambda x: x[1], reverse=True)
-            sharp_indices = [idx for idx, curv in curvatures[:max_points] if curv > curvature_threshold]
+            # Komşu normallerinin farkı = eğrilik; büyük fark = sivri nokta
+            engine = CurvatureEngine(self.mesh, edges=self.shared.edge_topology[0])
+            curvatures = engine.normal_variance()
+            sharp_indices = engine.top_k(curvatures, max_points, threshold=curvature_threshold)
             
             sharp_points = []
             for idx in sharp_indices:
@@ -158,56 +268,45 @@ class FeatureDetector:
                     'x': float(point[0]),
                     'y': float(point[1]),
                     'z': float(point[2]),
-                    'curvature': curvatures[idx][1] if idx < len(curvatures) else 0
+                    'curvature': float(curvatures[idx])
                 })
             
-            return sharp_points[:max_points]
+            return sharp_points
             
         except Exception as e:
             print(f"Sivri nokta tespitinde hata: {e}")
             return []
     
+    @property
+    def mesh_hash(self):
+        """Dosyadan yüklendiyse mesh içerik özeti (önbellek anahtarı)"""
+        file_path = getattr(self, 'file_path', None)
+        return mesh_cache.key_for(file_path) if file_path else None
+    
+    @cached_property
+    def sections(self):
+        """Ana eksen boyunca kesit profili: (en geniş, en dar, profil)"""
+        engine = CrossSectionEngine(self.mesh, mesh_hash=self.mesh_hash)
+        return engine.extremes(SECTION_LEVELS)
+    
     def get_widest_area(self) -> Dict:
-        """En geniş alanı bul"""
-        bounds = self.mesh.bounds
-        dimensions = bounds[1] - bounds[0]
-        
-        # En geniş ekseni bul
-        widest_axis = np.argmax(dimensions)
-        axis_names = ['x', 'y', 'z']
-        
-        center = self.mesh.centroid
-        
-        return {
-            'position': {
-                'x': float(center[0]),
-                'y': float(center[1]),
-                'z': float(center[2])
-            },
-            'width': float(dimensions[widest_axis]),
-            'direction': axis_names[widest_axis]
-        }
+        """En geniş kesiti bul (ana eksen boyunca en büyük kesit alanı)"""
+        widest, _, profile = self.sections
+        return CrossSectionEngine.describe(profile, widest)
     
     def get_narrowest_area(self) -> Dict:
-        """En dar alanı bul"""
-        bounds = self.mesh.bounds
-        dimensions = bounds[1] - bounds[0]
-        
-        # En dar ekseni bul
-        narrowest_axis = np.argmin(dimensions)
-        axis_names = ['x', 'y', 'z']
-        
-        center = self.mesh.centroid
+        """En dar kesiti bul (iki yanı daha geniş olan en küçük kesit, boğaz)"""
+        _, narrowest, profile = self.sections
+        return CrossSectionEngine.describe(profile, narrowest)
+    
+    def get_wall_thickness(self) -> Dict:
+        """
+        Duvar kalınlığı özeti (vertex'lerden içe atılan ışınlar)
         
-        return {
-            'position': {
-                'x': float(center[0]),
-                'y': float(center[1]),
-                'z': float(center[2])
-            },
-            'width': float(dimensions[narrowest_axis]),
-            'direction': axis_names[narrowest_axis]
-        }
+        Returns:
+            {'min', 'p1', 'p5', 'p50', 'mean', 'max', 'rays', 'hit_ratio', 'thin_ratio'}
+        """
+        return ThicknessEngine(self.mesh, mesh_hash=self.mesh_hash).stats()
     
     def check_topology(self) -> str:
         """
@@ -217,15 +316,15 @@ class FeatureDetector:
             'good', 'has_holes', 'non_manifold', 'complex'
         """
         # Watertight kontrolü
-        if not self.mesh.is_watertight:
+        if not self.shared.is_watertight:
             return 'has_holes'
         
         # Manifold kontrolü
-        if not self.mesh.is_winding_consistent:
+        if not self.shared.is_winding_consistent:
             return 'non_manifold'
         
         # Euler characteristic kontrolü (topolojik karmaşıklık)
-        euler = self.mesh.euler_number
+        euler = self.shared.euler_number
         
         # Basit kapalı mesh için euler = 2 olmalı
         if euler == 2:
@@ -0,0 +1,321 @@
+"""
+Artımlı Analiz Güncelleme Servisi
+Model analizini mesh içerik özetine göre sürümler, işlem sonrası yalnızca gerekeni yeniden hesaplar
+"""
+import numpy as np
+import trimesh
+
+from apps.core.services.mesh_cache import mesh_cache
+from apps.core.services.profiling import PhaseTimer
+from apps.models.models import ModelAnalysis
+from . import cross_section, thickness
+from .curvature import CurvatureEngine
+from .feature_detector import METRICS, FeatureDetector
+
+# FeatureDetector.get_sharp_points varsayılanları
+SHARP_THRESHOLD = 0.7
+SHARP_MAX_POINTS = 20
+
+# Geri alma/yinelemede yeniden hesaplamadan geri yüklenmek üzere
+# saklanan son sürüm analizi sayısı
+SNAPSHOT_LIMIT = 8
+
+# analysis_fields() tarafından doldurulan ModelAnalysis alanları
+ANALYSIS_FIELDS = (
+    'vertices_count', 'faces_count', 'is_watertight', 'volume', 'surface_area',
+    'bounding_box_min', 'bounding_box_max', 'top_points', 'bottom_points',
+    'sharp_points', 'widest_area', 'narrowest_area', 'topology_status',
+    'wall_thickness', 'min_wall_thickness',
+)
+
+
+def analysis_fields(data):
+    """FeatureDetector.analyze() çıktısını ModelAnalysis alanlarına çevir"""
+    wall_thickness = data.get('wall_thickness') or {}
+    return {
+        'vertices_count': data['vertices_count'],
+        'faces_count': data['faces_count'],
+        'is_watertight': data['is_watertight'],
+        'volume': data.get('volume'),
+        'surface_area': data.get('surface_area'),
+        'bounding_box_min': data['bounding_box']['min'],
+        'bounding_box_max': data['bounding_box']['max'],
+        'top_points': data['top_points'],
+        'bottom_points': data['bottom_points'],
+        'sharp_points': data['sharp_points'],
+        'widest_area': data['widest_area'],
+        'narrowest_area': data['narrowest_area'],
+        'topology_status': data['topology_status'],
+        'wall_thickness': wall_thickness,
+        'min_wall_thickness': wall_thickness.get('min'),
+    }
+
+
+def remember_snapshot(analysis):
+    """Analizin güncel sonucunu mesh özetiyle saklananlara ekle (kaydetmez)"""
+    if not analysis.mesh_hash:
+        return
+    snapshots = [item for item in analysis.snapshots or [] if item['mesh_hash'] != analysis.mesh_hash]
+    snapshots.append({
+        'mesh_hash': analysis.mesh_hash,
+        'fields': {name: getattr(analysis, name) for name in ANALYSIS_FIELDS},
+        'metrics': analysis.metrics,
+    })
+    analysis.snapshots = snapshots[-SNAPSHOT_LIMIT:]
+
+
+def save_analysis(model, fields, mesh_hash, metrics=None):
+    """Analizi oluştur veya mevcut kaydı güncelle"""
+    analysis, _ = ModelAnalysis.objects.update_or_create(
+        model=model,
+        defaults=dict(fields, mesh_hash=mesh_hash, metrics=metrics or {})
+    )
+    remember_snapshot(analysis)
+    analysis.save(update_fields=['snapshots'])
+    return analysis
+
+
+def restore_analysis(model):
+    """
+    Güncel mesh daha önce analiz edildiyse saklanan sonucu geri yükle
+
+    Sürüm değişiminde (geri alma/yineleme) çağrılır; hiçbir şey
+    yeniden hesaplanmaz.
+
+    Returns:
+        Güncel ModelAnalysis veya sonuç saklanmamışsa None
+    """
+    analysis = ModelAnalysis.objects.filter(model=model).first()
+    if analysis is None:
+        return None
+    digest = mesh_cache.key_for(model.current_file.path)
+    if analysis.mesh_hash == digest:
+        return analysis
+
+    snapshot = next((item for item in analysis.snapshots or [] if item['mesh_hash'] == digest), None)
+    if snapshot is None:
+        return None
+    remember_snapshot(analysis)
+    for name, value in snapshot['fields'].items():
+        setattr(analysis, name, value)
+    analysis.mesh_hash = digest
+    analysis.metrics = dict(snapshot['metrics'], mode='restored')
+    remember_snapshot(analysis)
+    analysis.save()
+    return analysis
+
+
+def is_current(analysis):
+    """Analiz modelin güncel mesh'ine mi ait?"""
+    return analysis.mesh_hash == mesh_cache.key_for(analysis.model.current_file.path)
+
+
+def _point_array(points):
+    return np.array([[p['x'], p['y'], p['z']] for p in points]).reshape(-1, 3)
+
+
+def _moved_points(points, matrix, extra=()):
+    """Nokta listesini dönüştür (extra: korunacak ek anahtarlar)"""
+    moved = trimesh.transformations.transform_points(_point_array(points), matrix)
+    return [
+        dict({'x': float(x), 'y': float(y), 'z': float(z)}, **{key: point[key] for key in extra})
+        for (x, y, z), point in zip(moved, points)
+    ]
+
+
+def _is_axis_permutation(rotation):
+    """Dönüşüm eksenleri eksenlere mi taşıyor? (90° katları)"""
+    magnitude = np.abs(rotation)
+    return np.allclose(magnitude.sum(axis=0), 1.0) and np.allclose(magnitude.max(axis=0), 1.0)
+
+
+def _rotated_fields(analysis, detector, matrix):
+    """
+    Katı dönüşüm sonrası alanlar
+
+    Sayım, hacim, alan, topoloji ve duvar kalınlığı dönüşümden
+    bağımsızdır; kalınlık ölçümü ve kesit profili önbellekte yeni mesh
+    özetine taşınır. Kesitler (konum, eksen) ve dönüşüm Y eksenini
+    koruyor ya da ters çeviriyorsa en üst/alt noktalar önbellekten
+    dönüştürülür. Sınır kutusu eksen permütasyonunda köşelerden
+    hesaplanır, diğer açılarda tek min/max geçişi yapılır. Normal farkı
+    eğriliği eksen bileşenleri üzerinden ölçüldüğü için yalnızca eksen
+    permütasyonu altında değişmez; o durumda sivri noktalar taşınır.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    rotation = matrix[:3, :3]
+    permutation = _is_axis_permutation(rotation)
+    fields = {}
+
+    thickness.carry_over_rotation(analysis.mesh_hash, detector.mesh_hash)
+    cross_section.carry_over_rotation(analysis.mesh_hash, detector.mesh_hash, matrix)
+
+    if permutation and analysis.bounding_box_min and analysis.bounding_box_max:
+        corners = trimesh.transformations.transform_points(
+            [analysis.bounding_box_min, analysis.bounding_box_max], matrix
+        )
+        fields['bounding_box_min'] = [float(v) for v in corners.min(axis=0)]
+        fields['bounding_box_max'] = [float(v) for v in corners.max(axis=0)]
+    else:
+        bounding_box = detector.get_bounding_box()
+        fields['bounding_box_min'] = bounding_box['min']
+        fields['bounding_box_max'] = bounding_box['max']
+
+    # Y ekseni korunuyorsa sıra aynı kalır, ters dönüyorsa üst ve alt yer değiştirir
+    if np.allclose(rotation[1], [0.0, 1.0, 0.0]):
+        fields['top_points'] = _moved_points(analysis.top_points, matrix)
+        fields['bottom_points'] = _moved_points(analysis.bottom_points, matrix)
+    elif np.allclose(rotation[1], [0.0, -1.0, 0.0]):
+        fields['top_points'] = _moved_points(analysis.bottom_points, matrix)[::-1]
+        fields['bottom_points'] = _moved_points(analysis.top_points, matrix)[::-1]
+    else:
+        fields['top_points'] = detector.get_top_points()
+        fields['bottom_points'] = detector.get_bottom_points()
+
+    for name, compute in (('widest_area', detector.get_widest_area),
+                          ('narrowest_area', detector.get_narrowest_area)):
+        section = getattr(analysis, name)
+        fields[name] = cross_section.transform_section(section, matrix) if section and 'axis' in section else compute()
+
+    if permutation:
+        fields['sharp_points'] = _moved_points(analysis.sharp_points, matrix, extra=('curvature',))
+    else:
+        fields['sharp_points'] = detector.get_sharp_points()
+    return fields
+
+
+def _cut_band(mesh, origin, normal):
+    """
+    Kesmeden etkilenen bant genişliği: 2 kenar boyu
+
+    Kapak üçgenlemesinin düzlem üzerindeki uzun kenarları sayılmaz;
+    kenar boyu yalnızca ilk mesh'ten kalan yüzlerden ölçülür.
+    """
+    distance = np.abs((mesh.vertices - origin) @ normal)
+    edges = mesh.edges_unique
+    tolerance = 1e-9 * max(float(np.ptp(mesh.vertices)), 1.0)
+    surface = (distance[edges] > tolerance).any(axis=1)
+    lengths = mesh.edges_unique_length[surface] if surface.any() else mesh.edges_unique_length
+    return 2.0 * float(lengths.max())
+
+
+def _cut_sharp_points(analysis, mesh, origin, normal, affected):
+    """
+    Kesme sonrası sivri noktalar
+
+    Eğrilik 2-ring komşuluğa bağlıdır; düzleme 2 kenar boyundan
+    (affected) uzak vertex'lerin değeri değişmez. Yalnızca düzlem
+    çevresindeki bant yeniden hesaplanır ve kalan önbellekli noktalarla
+    birleştirilir.
+
+    Returns:
+        Sivri nokta listesi veya sonuç kesin değilse None
+    """
+
+    distance = (mesh.vertices - origin) @ normal
+    band_faces = np.flatnonzero((np.abs(distance[mesh.faces]) <= 2.0 * affected).any(axis=1))
+
+    candidates = []
+    if len(band_faces):
+        band = mesh.submesh([band_faces], append=True, repair=False)
+        band_distance = (band.vertices - origin) @ normal
+        engine = CurvatureEngine(band)
+        curvatures = engine.normal_variance()
+        inner = np.flatnonzero((np.abs(band_distance) <= affected) & (curvatures > SHARP_THRESHOLD))
+        candidates = [
+            {'x': float(band.vertices[i][0]), 'y': float(band.vertices[i][1]),
+             'z': float(band.vertices[i][2]), 'curvature': float(curvatures[i])}
+            for i in inner
+        ]
+
+    cached = analysis.sharp_points
+    positions = _point_array(cached)
+    kept = (positions - origin) @ normal > affected
+    candidates += [point for point, keep in zip(cached, kept) if keep]
+
+    candidates.sort(key=lambda point: point['curvature'], reverse=True)
+    result = candidates[:SHARP_MAX_POINTS]
+
+    # Önbellekteki liste doluysa, listeye girmemiş vertex'ler en küçük
+    # önbellekli değerin altındadır; sonuç ancak o değere kadar doluysa kesindir
+    if len(cached) >= SHARP_MAX_POINTS:
+        floor = min(point['curvature'] for point in cached)
+        if len(result) < SHARP_MAX_POINTS or result[-1]['curvature'] < floor:
+            return None
+    return result
+
+
+def update_analysis(model, previous_digest=None, rigid_transform=None, cut_plane=None):
+    """
+    İşlem sonrası mevcut analizi güncel mesh'e taşı
+
+    Analiz hiç yapılmamışsa bir şey yapılmaz. Önceki mesh'e ait analiz
+    döndürme sonrası dönüştürülür (bkz. _rotated_fields); tek kesme
+    sonrası yalnızca etkilenen bölge yeniden değerlendirilir, diğer
+    durumlarda tam analiz yapılır.
+
+    Kesmede tam geçiş gerektirenler:
+        - sayım, hacim, yüzey alanı, topoloji, sınır kutusu ve en
+          üst/alt noktalar: kapak yüzleri eklendiği için (tek O(V + F)
+          geçiş, ışın atmaz)
+        - en geniş/en dar kesit: ana eksen ve ağırlık merkezi kalan
+          parçaya göre değiştiği için profil yeniden kesilir
+    Duvar kalınlığında kalan tarafta kalan ışınlar, sivri noktalarda
+    kesme bandı dışındaki noktalar önceki sonuçtan alınır. Kalınlık ölçümünün
+    ve kesit profilinin taşınması önceki mesh'in ve ölçümünün (süreç
+    içi) önbellekte olmasına bağlıdır; yoksa o metrik tam hesaplanır.
+
+    Args:
+        model: Model3D
+        previous_digest: İşlemden önceki mesh özeti
+        rigid_transform: Önceki mesh'ten güncel mesh'e 4x4 dönüşüm
+        cut_plane: Tek kesme yapıldıysa kalan yarı uzay (origin, normal)
+
+    Returns:
+        Güncellenen ModelAnalysis veya None
+    """
+    analysis = ModelAnalysis.objects.filter(model=model).first()
+    if analysis is None:
+        return None
+
+    path = model.current_file.path
+    digest = mesh_cache.key_for(path)
+    if analysis.mesh_hash == digest:
+        return analysis
+
+    timer = PhaseTimer()
+    with timer.phase('load'):
+        detector = FeatureDetector(path)
+    timer.record_mesh('input', detector.mesh)
+    incremental = previous_digest is not None and analysis.mesh_hash == previous_digest
+
+    with timer.phase('compute'):
+        if incremental and rigid_transform is not None:
+            mode = 'rotation'
+            fields = _rotated_fields(analysis, detector, rigid_transform)
+        elif incremental and cut_plane is not None:
+            mode = 'cut'
+            origin, normal = cut_plane
+            band = _cut_band(detector.mesh, origin, normal)
+            reused_rays = thickness.carry_over_cut(
+                previous_digest, detector.mesh, detector.mesh_hash, origin, normal
+            )
+            data = detector.analyze(metrics=[m for m in METRICS if m != 'sharp_points'])
+            fields = analysis_fields(dict(data, sharp_points=None))
+            sharp_points = _cut_sharp_points(analysis, detector.mesh, origin, normal, band)
+            fields['sharp_points'] = sharp_points if sharp_points is not None else detector.get_sharp_points()
+        else:
+            mode = 'full'
+            fields = analysis_fields(detector.analyze())
+
+    # Önceki sürümün sonucu geri alma için saklanır
+    remember_snapshot(analysis)
+    for name, value in fields.items():
+        setattr(analysis, name, value)
+    analysis.mesh_hash = digest
+    analysis.metrics = dict(timer.as_dict(), mode=mode)
+    if mode == 'cut':
+        analysis.metrics['reused_rays'] = reused_rays
+    remember_snapshot(analysis)
+    analysis.save()
+    return analysis
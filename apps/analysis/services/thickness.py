@@ -0,0 +1,209 @@
+"""
+Duvar Kalınlığı Analiz Servisi
+Vertex'lerden içe atılan ışınlarla kalınlık alanı, istatistikleri ve renk haritası
+"""
+from functools import cached_property
+
+import numpy as np
+import trimesh
+from django.core.cache import cache
+from scipy.spatial import cKDTree
+
+from apps.core.services import raycast
+from apps.core.services.mesh_cache import mesh_cache
+
+# Tek analizde atılan en fazla ışın; fazlası için vertex örneklenir
+MAX_RAYS = 50_000
+
+# Renk haritasında kırmızı (bu kalınlık ve altı) ve yeşil (bu kalınlık ve üstü) uçları (mm)
+THIN_WALL = 0.8
+THICK_WALL = 3.0
+
+# Işına çarpmayan (açık mesh, dışarı kaçan) vertex rengi
+MISSING_COLOR = (128, 128, 128)
+
+
+def _key(mesh_hash: str, max_rays: int) -> str:
+    return f'thickness:{mesh_hash}:{max_rays}'
+
+
+def _sample(count: int, max_rays: int) -> np.ndarray:
+    """Işın atılacak vertex'ler (sabit tohumlu örnek, artan sırada)"""
+    if count > max_rays:
+        return np.sort(np.random.default_rng(0).choice(count, max_rays, replace=False))
+    return np.arange(count)
+
+
+def _fill(vertices: np.ndarray, sample: np.ndarray, distance: np.ndarray) -> dict:
+    """Örnek ölçümlerinden vertex alanı (kalanlar en yakın örneğin değerini alır)"""
+    if len(sample) < len(vertices):
+        _, nearest = cKDTree(vertices[sample]).query(vertices)
+        field = distance[nearest]
+    else:
+        field = distance
+    return {'field': field.astype(np.float32), 'samples': distance}
+
+
+def carry_over_rotation(previous_hash: str, mesh_hash: str, max_rays: int = MAX_RAYS) -> bool:
+    """
+    Önceki mesh'in ölçümünü döndürülmüş mesh'e taşı
+
+    Katı dönüşüm vertex sırasını ve uzaklıkları korur; örnek ve alan
+    aynen geçerlidir.
+
+    Returns:
+        Ölçüm taşındı mı? (önceki ölçüm önbellekte yoksa False)
+    """
+    measured = cache.get(_key(previous_hash, max_rays))
+    if measured is None:
+        return False
+    cache.set(_key(mesh_hash, max_rays), measured, timeout=None)
+    return True
+
+
+def carry_over_cut(previous_hash: str, mesh: trimesh.Trimesh, mesh_hash: str,
+                   origin, normal, max_rays: int = MAX_RAYS):
+    """
+    Tek kesme sonrası kalınlık alanı (yalnızca etkilenen ışınlar yeniden atılır)
+
+    Vertex'i, normali ve çarpma noktası kalan yarı uzayda (origin,
+    normal yönü) olan ışın değişmez: ışın parçası tümüyle kalan tarafta
+    olduğundan kapağa veya silinen yüzlere değmez. Bu ışınların önceki
+    ölçümü konumla eşlenerek kullanılır; normali değişen (komşu yüzü
+    kesilen) vertex'ler, önceki örnekte olmayan vertex'ler ve çarpmayan
+    ışınlar yeniden atılır. Sonuç yeni mesh özetiyle önbelleğe yazılır.
+
+    Returns:
+        Önceki ölçümden kullanılan ışın sayısı veya önceki mesh ya da
+        ölçümü önbellekte yoksa None
+    """
+    measured = cache.get(_key(previous_hash, max_rays))
+    previous = mesh_cache.get(previous_hash)
+    if measured is None or previous is None:
+        return None
+
+    origin = np.asarray(origin, dtype=np.float64)
+    normal = np.asarray(normal, dtype=np.float64)
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    normals = np.asarray(mesh.vertex_normals, dtype=np.float64)
+    sample = _sample(len(vertices), max_rays)
+
+    old_vertices = np.asarray(previous.vertices, dtype=np.float64)
+    old_sample = _sample(len(old_vertices), max_rays)
+    old_distance = measured['samples']
+    old_normals = np.asarray(previous.vertex_normals, dtype=np.float64)[old_sample]
+
+    # Yeni örnek vertex'lerini önceki örnekteki aynı konumlu vertex'lerle eşle
+    tolerance = 1e-9 * max(float(np.ptp(vertices)), 1.0)
+    gap, match = cKDTree(old_vertices[old_sample]).query(vertices[sample])
+    distance = old_distance[match]
+    hits = vertices[sample] - normals[sample] * np.nan_to_num(distance)[:, None]
+    reuse = (
+        (gap <= tolerance)
+        & np.isfinite(distance)
+        & (np.einsum('ij,ij->i', old_normals[match], normals[sample]) > 1.0 - 1e-9)
+        & ((vertices[sample] - origin) @ normal > tolerance)
+        & ((hits - origin) @ normal > tolerance)
+    )
+
+    distance = np.where(reuse, distance, np.nan)
+    cast = ~reuse
+    if cast.any():
+        recast, _ = raycast.first_hit(mesh, vertices[sample[cast]], -normals[sample[cast]], inside_only=True)
+        recast[~np.isfinite(recast)] = np.nan
+        distance[cast] = recast
+
+    cache.set(_key(mesh_hash, max_rays), _fill(vertices, sample, distance), timeout=None)
+    return int(reuse.sum())
+
+
+class ThicknessEngine:
+    """
+    Vertex normalinin tersine atılan ışının karşı duvara uzaklığı.
+
+    Tüm ışınlar tek grupta ızgara hızlandırmalı izleyiciyle atılır
+    (raycast.first_hit). Büyük mesh'lerde sabit tohumlu bir vertex
+    örneği ölçülür ve kalan vertex'ler en yakın ölçülen vertex'in
+    değerini alır. Alan mesh özetiyle önbelleğe alınır; analiz ve
+    görüntüleyici renk haritası aynı hesabı paylaşır.
+    """
+
+    def __init__(self, mesh: trimesh.Trimesh, mesh_hash: str = None, max_rays: int = MAX_RAYS):
+        """
+        Args:
+            mesh: Ölçülecek mesh
+            mesh_hash: Mesh içerik özeti (None ise önbellek kullanılmaz)
+            max_rays: Atılacak en fazla ışın
+        """
+        self.mesh = mesh
+        self.mesh_hash = mesh_hash
+        self.max_rays = max_rays
+
+    def _cast(self) -> dict:
+        vertices = np.asarray(self.mesh.vertices, dtype=np.float64)
+        normals = np.asarray(self.mesh.vertex_normals, dtype=np.float64)
+        sample = _sample(len(vertices), self.max_rays)
+
+        distance, _ = raycast.first_hit(self.mesh, vertices[sample], -normals[sample], inside_only=True)
+        distance[~np.isfinite(distance)] = np.nan
+        return _fill(vertices, sample, distance)
+
+    @cached_property
+    def _measured(self) -> dict:
+        if self.mesh_hash is None:
+            return self._cast()
+        key = _key(self.mesh_hash, self.max_rays)
+        measured = cache.get(key)
+        if measured is None:
+            measured = self._cast()
+            cache.set(key, measured, timeout=None)
+        return measured
+
+    def field(self) -> np.ndarray:
+        """Vertex başına kalınlık (V,); ölçülemeyen vertex'ler NaN"""
+        return self._measured['field']
+
+    def stats(self) -> dict:
+        """
+        Ölçülen ışınların özeti
+
+        Returns:
+            {'min', 'p1', 'p5', 'p50', 'mean', 'max', 'rays', 'hit_ratio', 'thin_ratio'}
+            (mm; ışın hiç çarpmadıysa değerler None)
+        """
+        samples = self._measured['samples']
+        hits = samples[np.isfinite(samples)]
+        result = {
+            'rays': int(len(samples)),
+            'hit_ratio': round(float(len(hits) / len(samples)), 4) if len(samples) else 0.0,
+        }
+        if not len(hits):
+            return dict(result, min=None, p1=None, p5=None, p50=None, mean=None, max=None, thin_ratio=None)
+
+        p1, p5, p50 = np.percentile(hits, [1, 5, 50])
+        return dict(
+            result,
+            min=float(hits.min()),
+            p1=float(p1),
+            p5=float(p5),
+            p50=float(p50),
+            mean=float(hits.mean()),
+            max=float(hits.max()),
+            thin_ratio=round(float((hits < THIN_WALL).mean()), 4),
+        )
+
+    @staticmethod
+    def colors(field: np.ndarray, thin: float = THIN_WALL, thick: float = THICK_WALL) -> np.ndarray:
+        """
+        Kalınlık alanını kırmızı (ince) → sarı → yeşil (kalın) renklere çevir
+
+        Returns:
+            uint8 (V, 3) RGB
+        """
+        field = np.asarray(field, dtype=np.float64)
+        t = np.clip((np.nan_to_num(field, nan=thick) - thin) / max(thick - thin, 1e-9), 0.0, 1.0)
+        red = np.where(t < 0.5, 1.0, 2.0 * (1.0 - t))
+        green = np.where(t < 0.5, 2.0 * t, 1.0)
+        rgb = np.column_stack([red, green, np.zeros_like(t)]) * 255.0
+        rgb[np.isnan(field)] = MISSING_COLOR
+        return np.rint(rgb).astype(np.uint8)
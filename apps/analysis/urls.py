@@ -4,8 +4,10 @@ from . import views
 app_name = 'analysis'
 
 urlpatterns = [
+    path('bulk/', views.bulk_analyze_models, name='bulk_analyze'),
     path('<uuid:model_id>/', views.analyze_model, name='analyze_model'),
     path('<uuid:model_id>/results/', views.analysis_results, name='analysis_results'),
+    path('<uuid:model_id>/profile/', views.section_profile, name='section_profile'),
 ]
 
 
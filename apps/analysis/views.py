@@ -1,8 +1,16 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
-from apps.models.models import Model3D, ModelAnalysis
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+from apps.models.models import Model3D, ModelAnalysis, Project
+from apps.core.services.mesh_cache import mesh_cache
+from apps.core.services.profiling import PhaseTimer, profiled
+from apps.processing.jobs import enqueue_job
+from .services.cross_section import CrossSectionEngine
 from .services.feature_detector import FeatureDetector
-import time
+from .services.incremental import analysis_fields, is_current, save_analysis
+import json
 
 
 def analyze_model(request, model_id):
@@ -10,36 +18,27 @@ def analyze_model(request, model_id):
     model = get_object_or_404(Model3D, id=model_id)
     
     try:
-        # Mevcut analizi kontrol et
-        if hasattr(model, 'analysis'):
+        # Mevcut analiz güncel mesh'e aitse yeniden hesaplama
+        analysis = ModelAnalysis.objects.filter(model=model).first()
+        if analysis is not None and is_current(analysis):
             messages.info(request, 'Model zaten analiz edilmiş. Sonuçları görüntülüyorsunuz.')
             return redirect('analysis:analysis_results', model_id=model.id)
         
         # Analiz başlat
-        start_time = time.time()
-        detector = FeatureDetector(model.original_file.path)
-        analysis_data = detector.analyze()
+        timer = PhaseTimer()
+        path = model.current_file.path
+        with profiled(f'analysis-{model.id}'):
+            with timer.phase('load'):
+                detector = FeatureDetector(path)
+            timer.record_mesh('input', detector.mesh)
+            with timer.phase('compute'):
+                analysis_data = detector.analyze()
         
-        # Analiz kaydı oluştur
-        analysis = ModelAnalysis.objects.create(
-            model=model,
-            vertices_count=analysis_data['vertices_count'],
-            faces_count=analysis_data['faces_count'],
-            is_watertight=analysis_data['is_watertight'],
-            volume=analysis_data.get('volume'),
-            surface_area=analysis_data.get('surface_area'),
-            bounding_box_min=analysis_data['bounding_box']['min'],
-            bounding_box_max=analysis_data['bounding_box']['max'],
-            top_points=analysis_data['top_points'],
-            bottom_points=analysis_data['bottom_points'],
-            sharp_points=analysis_data['sharp_points'],
-            widest_area=analysis_data['widest_area'],
-            narrowest_area=analysis_data['narrowest_area'],
-            topology_status=analysis_data['topology_status']
-        )
+        # Analiz kaydı oluştur (model değiştiyse mevcut kaydı güncelle)
+        metrics = timer.as_dict()
+        save_analysis(model, analysis_fields(analysis_data), mesh_cache.key_for(path), metrics)
         
-        execution_time = time.time() - start_time
-        messages.success(request, f'Model başarıyla analiz edildi ({execution_time:.2f} saniye)')
+        messages.success(request, f'Model başarıyla analiz edildi ({metrics["total"]:.2f} saniye)')
         return redirect('analysis:analysis_results', model_id=model.id)
         
     except Exception as e:
@@ -56,7 +55,90 @@ def analysis_results(request, model_id):
         return redirect('analysis:analyze_model', model_id=model.id)
     
     analysis = model.analysis
+    if not is_current(analysis):
+        messages.info(request, 'Model analizden sonra değişti; analiz güncelleniyor.')
+        return redirect('analysis:analyze_model', model_id=model.id)
+    
     return render(request, 'analysis/analysis_results.html', {
         'model': model,
         'analysis': analysis
     })
+
+
+def section_profile(request, model_id):
+    """
+    Ana eksen boyunca kesit alanı/çevresi eğrisi (JSON)
+    
+    ?levels=N ile çözünürlük seçilir; profil mesh özetiyle önbelleğe
+    alındığı için farklı çözünürlükler yeniden kesim yapmaz.
+    """
+    model = get_object_or_404(Model3D, id=model_id)
+    
+    try:
+        levels = int(request.GET.get('levels', 64))
+    except ValueError:
+        return JsonResponse({'error': 'Geçersiz seviye sayısı'}, status=400)
+    if not 2 <= levels <= 1024:
+        return JsonResponse({'error': 'Seviye sayısı 2-1024 arasında olmalı'}, status=400)
+    
+    try:
+        path = model.current_file.path
+        engine = CrossSectionEngine(mesh_cache.load(path), mesh_hash=mesh_cache.key_for(path))
+        widest, narrowest, profile = engine.extremes(levels)
+    except Exception as e:
+        return JsonResponse({'error': f'Kesit profili çıkarılamadı: {str(e)}'}, status=400)
+    
+    return JsonResponse({
+        'axis': profile['axis'].tolist(),
+        'origin': profile['origin'].tolist(),
+        'heights': profile['heights'].tolist(),
+        'area': profile['area'].tolist(),
+        'perimeter': profile['perimeter'].tolist(),
+        'widest': CrossSectionEngine.describe(profile, widest),
+        'narrowest': CrossSectionEngine.describe(profile, narrowest),
+    })
+
+
+@require_POST
+def bulk_analyze_models(request):
+    """
+    Analiz edilmemiş modeller için toplu analiz görevi kuyruğa ekle (API endpoint)
+    
+    Gövde: {"project_id": ..., "model_ids": [...], "include_stale": false}
+    Alanların hiçbiri verilmezse tüm modeller taranır. Görev worker'da
+    services/bulk.py ile çalışır (python manage.py run_processing_worker):
+    eskimişlik denetimi orada yapılır, sonuçlar tek bulk_create ile
+    yazılır ve verim özeti görev durumunun result alanında döner.
+    """
+    try:
+        data = json.loads(request.body or '{}')
+        include_stale = bool(data.get('include_stale', False))
+        queryset = Model3D.objects.all()
+        if data.get('project_id'):
+            project = get_object_or_404(Project, id=data['project_id'])
+            queryset = queryset.filter(project=project)
+        if data.get('model_ids'):
+            queryset = queryset.filter(id__in=data['model_ids'])
+        if not include_stale:
+            queryset = queryset.filter(analysis__isnull=True)
+        model_ids = [str(pk) for pk in queryset.values_list('id', flat=True)]
+        job = enqueue_job(None, 'analysis', {
+            'model_ids': model_ids,
+            'include_stale': include_stale,
+        }) if model_ids else None
+    except Http404:
+        raise
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+    
+    if job is None:
+        return JsonResponse({'success': True, 'models': 0})
+    return JsonResponse({
+        'success': True,
+        'models': len(model_ids),
+        'job_id': str(job.id),
+        'status_url': reverse('processing:job_status', kwargs={'job_id': job.id}),
+    }, status=202)
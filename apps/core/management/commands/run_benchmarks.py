@@ -0,0 +1,390 @@
+"""
+Performans benchmark paketi
+
+Sentetik kulak kalıbı mesh'leri (10k, 100k, 500k, 2M face) üzerinde tüm
+ModelProcessor işlemlerini, FeatureDetector metotlarını ve servis
+motorlarını (eğrilik, yumuşatma, seyreltme, boolean, dosya formatı)
+çalıştırır; süre ve bellek tepe değerini ölçer, ölçeklenmesi
+doğrusaldan kötü olan işlemleri işaretler. Motor ölçümleri kalite
+değerlerini (yüzey sapması, dosya boyutu, kapalılık) 'details'
+altında raporlar. JSON çıktısı regresyon takibi içindir. 2M face
+kademesi (özellikle ovalize_model) birkaç GB bellek gerektirir.
+
+Kullanım:
+    python manage.py run_benchmarks
+    python manage.py run_benchmarks --tiers 10000 100000 --output bench.json
+    python manage.py run_benchmarks --only smooth_model analyze --baseline bench.json
+    python manage.py run_benchmarks --only quadric_decimate cluster_decimate --tiers 500000
+"""
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import trimesh
+from django.core.management.base import BaseCommand, CommandError
+from scipy.spatial import cKDTree
+
+from apps.analysis.services.curvature import CurvatureEngine
+from apps.analysis.services.feature_detector import FeatureDetector, MeshPass
+from apps.core.services import csg, mesh_format
+from apps.core.services.decimation import cluster_decimate, quadric_decimate
+from apps.core.services.smoothing import ALGORITHMS, smooth_vertices
+from apps.core.services.synthetic import SIZE_TIERS, build_ear_mold
+from apps.processing.services import OVALIZATION_REGIONS, ModelProcessor
+
+
+def _punch_holes(mesh, spacing=997):
+    """Dağınık tekil face'leri sil (üçgen delikli açık mesh, delik doldurma için)"""
+    keep = np.ones(len(mesh.faces), dtype=bool)
+    keep[::spacing] = False
+    return mesh.submesh([np.flatnonzero(keep)], append=True, repair=False)
+
+
+# (ad, parametreler, hazırlık) — hazırlık mesh'i işlemden önce değiştirir
+PROCESSING_CASES = [
+    ('rotate_model', {'x_angle': 30, 'y_angle': 15, 'z_angle': 0}, None),
+    ('cut_model', {'plane': 'xy', 'position': 60, 'direction': 'below'}, None),
+    ('smooth_model', {'iterations': 5, 'algorithm': 'laplacian', 'intensity': 5}, None),
+    ('fill_holes', {}, _punch_holes),
+    ('ovalize_model', {'intensity': 3}, None),
+    ('drill_hole', {'diameter': 2.0, 'position': 'center', 'hole_type': 'through'}, None),
+]
+
+ANALYSIS_CASES = [
+    'get_bounding_box', 'get_top_points', 'get_bottom_points', 'get_sharp_points',
+    'get_widest_area', 'get_narrowest_area', 'check_topology', 'get_wall_thickness', 'analyze',
+]
+
+# Bu süreden kısa ölçümler ölçeklenme üssü için gürültülü sayılır
+MIN_SCALING_SECONDS = 0.005
+
+# Seyreltme sapma ölçümünde her yönde örneklenen vertex ve aday üçgen sayısı
+DEVIATION_SAMPLES = 5000
+DEVIATION_CANDIDATES = 16
+
+
+def surface_distance(mesh, points):
+    """Noktaların mesh yüzeyine uzaklığı (ağırlık merkezi en yakın aday üçgenlere tam mesafe)"""
+    _, candidates = cKDTree(mesh.triangles_center).query(points, k=DEVIATION_CANDIDATES)
+    repeated = np.repeat(points, DEVIATION_CANDIDATES, axis=0)
+    closest = trimesh.triangles.closest_point(mesh.triangles[candidates.ravel()], repeated)
+    return np.linalg.norm(closest - repeated, axis=1).reshape(-1, DEVIATION_CANDIDATES).min(axis=1)
+
+
+def deviation(source, result):
+    """Çift yönlü yüzey sapması ve hacim değişimi"""
+    rng = np.random.default_rng(0)
+    distances = []
+    for mesh, other in ((source, result), (result, source)):
+        count = min(DEVIATION_SAMPLES, len(mesh.vertices))
+        points = np.asarray(mesh.vertices)[rng.choice(len(mesh.vertices), count, replace=False)]
+        distances.append(surface_distance(other, points))
+    distances = np.concatenate(distances)
+    return {
+        'rms_mm': round(float(np.sqrt(np.mean(distances ** 2))), 5),
+        'max_mm': round(float(distances.max()), 5),
+        'volume_change': round(float(result.volume / source.volume - 1.0), 5),
+        'watertight': bool(result.is_watertight),
+    }
+
+
+def vent(mesh, diameter=0.9):
+    """Kalıbın üst yarısından x ekseni boyunca geçen havalandırma silindiri"""
+    center = mesh.bounds.mean(axis=0)
+    center[2] = mesh.bounds[0][2] + 0.7 * (mesh.bounds[1][2] - mesh.bounds[0][2])
+    cutter = trimesh.creation.cylinder(radius=diameter / 2.0, height=mesh.extents.max() * 2, sections=32)
+    cutter.apply_transform(trimesh.transformations.rotation_matrix(np.pi / 2, [0, 1, 0]))
+    cutter.apply_translation(center)
+    return cutter
+
+
+def timed(func):
+    """(süre, sonuç)"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run_curvature(mesh):
+    """Sivri nokta eğriliği (soğuk komşuluk/normal verisiyle)"""
+    mesh._cache.clear()
+
+    def curvature():
+        engine = CurvatureEngine(mesh)
+        return engine.top_k(engine.normal_variance(), 20)
+
+    seconds, _ = timed(curvature)
+    return seconds, True, len(mesh.faces)
+
+
+def run_smoothing(mesh, algorithm, preserve_edges=False):
+    """Yumuşatma motoru (vertex konumları; mesh değişmez)"""
+    seconds, _ = timed(lambda: smooth_vertices(mesh, algorithm, 10, preserve_edges=preserve_edges))
+    return seconds, True, len(mesh.faces)
+
+
+def run_decimation(mesh, func):
+    """Seyreltme; details: kaynak yüzeye sapma (süreye dahil değil)"""
+    seconds, result = timed(lambda: func(mesh))
+    return seconds, True, len(result.faces), deviation(mesh, result)
+
+
+def run_subtract(mesh, local):
+    """Havalandırma kanalı farkı (bölgesel veya tüm mesh)"""
+    cutter = vent(mesh)
+    source = mesh.copy()
+    if local:
+        seconds, result = timed(lambda: csg.local_subtract(source, [cutter]))
+    else:
+        seconds, result = timed(lambda: trimesh.boolean.difference([source, cutter]))
+    if result is None:
+        return seconds, False, 0
+    return seconds, True, len(result.faces), {'watertight': bool(result.is_watertight),
+                                              'volume': round(float(result.volume), 3)}
+
+
+def run_mesh_format(mesh, path, name):
+    """Kompakt .nwm yazma/okuma; details: STL'e göre dosya boyutu"""
+    nwm_path = os.path.splitext(path)[0] + f'.{mesh_format.EXTENSION}'
+    if name == 'nwm_write':
+        def write():
+            with open(nwm_path, 'wb') as f:
+                mesh_format.write_mesh(mesh, f)
+        seconds, _ = timed(write)
+    else:
+        if not os.path.exists(nwm_path):
+            with open(nwm_path, 'wb') as f:
+                mesh_format.write_mesh(mesh, f)
+        seconds, _ = timed(lambda: mesh_format.load_mesh(nwm_path))
+    details = {
+        'stl_mb': round(os.path.getsize(path) / 1e6, 2),
+        'nwm_mb': round(os.path.getsize(nwm_path) / 1e6, 2),
+    }
+    return seconds, True, len(mesh.faces), details
+
+
+def run_export(path):
+    """İşlem sonucunun kaydedilecek tampona (.nwm) export'u"""
+    processor = ModelProcessor(path)
+    seconds, exported = timed(lambda: processor.export_file(file_type=mesh_format.EXTENSION))
+    return seconds, True, len(processor.mesh.faces), {'mb': round(exported.size / 1e6, 2)}
+
+
+# (ad, çalıştırıcı(mesh, dosya yolu)) — çalıştırıcı (süre, başarı, sonuç face[, details]) döner
+ENGINE_CASES = [
+    ('curvature', lambda mesh, path: run_curvature(mesh)),
+] + [
+    (f'smooth_{algorithm}{suffix}', lambda mesh, path, a=algorithm, p=preserve: run_smoothing(mesh, a, p))
+    for algorithm in ALGORITHMS
+    for suffix, preserve in (('', False), ('_edges', True))
+] + [
+    (f'ovalize_{region}',
+     lambda mesh, path, r=region: run_processing(path, 'ovalize_model', {'intensity': 3, 'region': r}, None))
+    for region in OVALIZATION_REGIONS if region != 'all'
+] + [
+    ('quadric_decimate', lambda mesh, path: run_decimation(
+        mesh, lambda m: quadric_decimate(m, target_faces=len(m.faces) // 5))),
+    ('quadric_tolerance', lambda mesh, path: run_decimation(
+        mesh, lambda m: quadric_decimate(m, max_error=0.01))),
+    ('cluster_decimate', lambda mesh, path: run_decimation(
+        mesh, lambda m: cluster_decimate(m, len(m.faces) // 5))),
+    ('local_subtract', lambda mesh, path: run_subtract(mesh, local=True)),
+    ('boolean_difference', lambda mesh, path: run_subtract(mesh, local=False)),
+    ('nwm_write', lambda mesh, path: run_mesh_format(mesh, path, 'nwm_write')),
+    ('nwm_load', lambda mesh, path: run_mesh_format(mesh, path, 'nwm_load')),
+    ('export_file', lambda mesh, path: run_export(path)),
+]
+
+
+def run_processing(path, name, parameters, prepare):
+    """İşlemi yeni bir ModelProcessor üzerinde çalıştır; (süre, başarı, sonuç face)"""
+    processor = ModelProcessor(path)
+    if prepare is not None:
+        processor.mesh = prepare(processor.mesh)
+    start = time.perf_counter()
+    success = getattr(processor, name)(**parameters)
+    elapsed = time.perf_counter() - start
+    return elapsed, bool(success), len(processor.mesh.faces)
+
+
+def run_analysis(mesh, name):
+    """Metodu soğuk (ara sonuçsuz) bir FeatureDetector üzerinde çalıştır"""
+    mesh._cache.clear()
+    detector = FeatureDetector.__new__(FeatureDetector)
+    detector.mesh = mesh
+    detector.shared = MeshPass(mesh)
+    start = time.perf_counter()
+    getattr(detector, name)()
+    return time.perf_counter() - start, True, len(mesh.faces)
+
+
+def measure(func, repeat, memory):
+    """En iyi süre ve (istenirse) ayrı bir turda tracemalloc tepe değeri"""
+    best = None
+    for _ in range(repeat):
+        outcome = func()
+        if best is None or outcome[0] < best[0]:
+            best = outcome
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return best, peak_mb
+
+
+def scaling(results, threshold):
+    """İşlem başına log-log eğimi (1.0 = doğrusal)"""
+    by_name = {}
+    for row in results:
+        if row['success'] and row['seconds'] >= MIN_SCALING_SECONDS:
+            by_name.setdefault(row['name'], []).append((row['faces'], row['seconds']))
+
+    report = {}
+    for name, points in by_name.items():
+        if len(points) < 2:
+            continue
+        faces, seconds = np.log(np.array(points, dtype=np.float64)).T
+        exponent = float(np.polyfit(faces, seconds, 1)[0])
+        report[name] = {'exponent': round(exponent, 3), 'superlinear': exponent > threshold}
+    return report
+
+
+def regressions(results, baseline, tolerance):
+    """Temel ölçüme göre tolerance oranından fazla yavaşlayan işlemler"""
+    previous = {(row['name'], row['tier']): row['seconds'] for row in baseline.get('results', [])}
+    slower = []
+    for row in results:
+        before = previous.get((row['name'], row['tier']))
+        if before and row['seconds'] >= MIN_SCALING_SECONDS and row['seconds'] > before * (1.0 + tolerance):
+            slower.append({'name': row['name'], 'tier': row['tier'],
+                           'before': before, 'after': row['seconds'],
+                           'ratio': round(row['seconds'] / before, 2)})
+    return slower
+
+
+class Command(BaseCommand):
+    help = 'İşlem ve analiz yollarını sentetik kulak kalıplarıyla ölçer (JSON çıktı)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tiers', nargs='+', type=int, default=list(SIZE_TIERS),
+                            help='Face sayısı kademeleri')
+        parser.add_argument('--only', nargs='+', default=None,
+                            help='Yalnızca bu işlem/metot adları')
+        parser.add_argument('--repeat', type=int, default=1,
+                            help='Ölçüm tekrarı (en iyisi alınır)')
+        parser.add_argument('--no-memory', action='store_true',
+                            help='tracemalloc bellek turunu atla')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Sentetik mesh gürültü tohumu')
+        parser.add_argument('--output', help='JSON sonuç dosyası')
+        parser.add_argument('--baseline', help='Karşılaştırılacak önceki JSON sonucu')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Regresyon sayılacak yavaşlama oranı')
+        parser.add_argument('--superlinear-threshold', type=float, default=1.2,
+                            help='Bu üssün üstündeki ölçeklenme işaretlenir')
+
+    def handle(self, *args, **options):
+        names = [case[0] for case in PROCESSING_CASES] + ANALYSIS_CASES + [case[0] for case in ENGINE_CASES]
+        only = options['only']
+        if only:
+            unknown = set(only) - set(names)
+            if unknown:
+                raise CommandError(f'Bilinmeyen işlem: {", ".join(sorted(unknown))}')
+
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        memory = not options['no_memory']
+        workdir = tempfile.mkdtemp()
+        results = []
+        try:
+            for tier in sorted(options['tiers']):
+                mesh = build_ear_mold(tier, seed=options['seed'])
+                path = os.path.join(workdir, f'ear_{tier}.stl')
+                mesh.export(path)
+                self.stdout.write(f'{len(mesh.faces):,} face')
+
+                cases = [
+                    (name, lambda n=name, p=parameters, f=prepare: run_processing(path, n, p, f))
+                    for name, parameters, prepare in PROCESSING_CASES
+                ] + [
+                    (name, lambda n=name: run_analysis(mesh, n))
+                    for name in ANALYSIS_CASES
+                ] + [
+                    (name, lambda f=func: f(mesh, path))
+                    for name, func in ENGINE_CASES
+                ]
+                for name, func in cases:
+                    if only and name not in only:
+                        continue
+                    details = None
+                    try:
+                        outcome, peak_mb = measure(func, options['repeat'], memory)
+                        seconds, success, faces_after = outcome[:3]
+                        if len(outcome) > 3:
+                            details = outcome[3]
+                        error = ''
+                    except Exception as e:
+                        seconds, success, faces_after, peak_mb, error = 0.0, False, 0, None, str(e)
+
+                    row = {
+                        'name': name,
+                        'tier': tier,
+                        'faces': len(mesh.faces),
+                        'seconds': round(seconds, 6),
+                        'peak_mb': round(peak_mb, 1) if peak_mb is not None else None,
+                        'faces_after': faces_after,
+                        'success': success,
+                    }
+                    if details:
+                        row['details'] = details
+                    if error:
+                        row['error'] = error
+                    results.append(row)
+
+                    memory_text = f'{peak_mb:8.1f} MB' if peak_mb is not None else ''
+                    status = '' if success else f'  BAŞARISIZ {error}'
+                    extra = ''.join(f'  {key}={value}' for key, value in (details or {}).items())
+                    self.stdout.write(f'  {name:<22} {seconds:9.3f} s {memory_text}{extra}{status}')
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        scaling_report = scaling(results, options['superlinear_threshold'])
+        flagged = [name for name, item in scaling_report.items() if item['superlinear']]
+        for name, item in scaling_report.items():
+            marker = '  << doğrusaldan kötü' if item['superlinear'] else ''
+            self.stdout.write(f'{name:<22} ölçeklenme üssü {item["exponent"]:.2f}{marker}')
+
+        report = {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'trimesh': trimesh.__version__,
+                'machine': platform.machine(),
+            },
+            'results': results,
+            'scaling': scaling_report,
+            'superlinear': flagged,
+        }
+        if baseline is not None:
+            report['regressions'] = regressions(results, baseline, options['tolerance'])
+            for item in report['regressions']:
+                self.stdout.write(f'REGRESYON {item["name"]} @ {item["tier"]:,}: '
+                                  f'{item["before"]:.3f} s -> {item["after"]:.3f} s ({item["ratio"]}x)')
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f'Sonuçlar yazıldı: {options["output"]}')
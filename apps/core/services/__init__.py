@@ -0,0 +1 @@
+# Core services
@@ -0,0 +1,389 @@
+"""
+CSG (Boolean) Servisi
+Kesici katıları tek seferde birleştirip kabuktan tek bir fark işlemiyle çıkarır
+"""
+import numpy as np
+import trimesh
+from scipy.spatial import cKDTree
+from trimesh.path.polygons import edges_to_polygons
+
+# Yerel bölge mesh'in bu oranından büyükse tüm mesh üzerinde çalışılır
+LOCAL_MAX_FRACTION = 0.5
+
+
+def bounds_overlap(a, b, margin: float = 0.0) -> bool:
+    """İki eksen hizalı kutu (2x3 bounds) kesişiyor mu?"""
+    a = np.asarray(a)
+    b = np.asarray(b)
+    return bool(np.all(a[0] - margin <= b[1]) and np.all(b[0] - margin <= a[1]))
+
+
+def split_faces(vertices, faces, axis, value):
+    """
+    Face'leri eksen hizalı bir düzlemle böl
+
+    Düzlemi kesen üçgenler üç üçgene ayrılır; kesişim noktaları kenar
+    başına bir kez hesaplanır, böylece komşu üçgenler aynı vertex'i
+    paylaşır ve iki taraf birebir dikişlenir.
+
+    Args:
+        vertices: (V, 3) vertex dizisi
+        faces: (F, 3) bölünecek face'ler
+        axis: Düzlem normali ekseni (0, 1, 2)
+        value: Düzlemin eksen üzerindeki konumu
+
+    Returns:
+        (yeni vertex dizisi, altta kalan face'ler, üstte kalan face'ler)
+    """
+    above = vertices[faces, axis] >= value
+    count = above.sum(axis=1)
+    below_faces = faces[count == 0]
+    above_faces = faces[count == 3]
+
+    crossing = (count == 1) | (count == 2)
+    triangles = faces[crossing]
+    sides = above[crossing]
+    if not len(triangles):
+        return vertices, below_faces, above_faces
+
+    # Tek başına kalan köşe ilk sıraya gelecek şekilde döndür (sarım korunur)
+    lone_above = sides.sum(axis=1) == 1
+    lone = np.where(lone_above, np.argmax(sides, axis=1), np.argmin(sides, axis=1))
+    order = (lone[:, None] + np.arange(3)) % 3
+    a, b, c = np.take_along_axis(triangles, order, axis=1).T
+
+    # Kesilen kenarlar: kanonik (küçük, büyük) sırada tekil hesap
+    edges = np.sort(np.column_stack([a, b, a, c]).reshape(-1, 2), axis=1)
+    unique, inverse = np.unique(edges, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    start, end = vertices[unique[:, 0]], vertices[unique[:, 1]]
+    t = (value - start[:, axis]) / (end[:, axis] - start[:, axis])
+    points = start + (end - start) * t[:, None]
+    points[:, axis] = value
+
+    # Düzlem üzerindeki uç noktalar yeni vertex yerine kendileri kullanılır
+    index = len(vertices) + np.arange(len(unique))
+    index = np.where(t == 0, unique[:, 0], np.where(t == 1, unique[:, 1], index))
+    vertices = np.vstack([vertices, points])
+    ab, ac = index[inverse].reshape(-1, 2).T
+
+    lone_side = np.column_stack([a, ab, ac])
+    other_side = np.vstack([np.column_stack([ab, b, c]), np.column_stack([ab, c, ac])])
+    other_above = np.concatenate([~lone_above, ~lone_above])
+
+    below_faces = np.vstack([below_faces, lone_side[~lone_above], other_side[~other_above]])
+    above_faces = np.vstack([above_faces, lone_side[lone_above], other_side[other_above]])
+    return vertices, _drop_degenerate(below_faces), _drop_degenerate(above_faces)
+
+
+def _drop_degenerate(faces):
+    keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+    return faces[keep]
+
+
+def _boundary_edges(faces):
+    """Yalnızca tek face'e ait (açık sınır) yönlü kenarlar"""
+    edges = trimesh.geometry.faces_to_edges(faces)
+    ordered = np.sort(edges, axis=1)
+    keys = ordered[:, 0] * (int(faces.max()) + 1) + ordered[:, 1]
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    return edges[counts[inverse] == 1]
+
+
+def _edge_keys(edges):
+    return {(int(a), int(b)) for a, b in edges}
+
+
+def _slab(mesh_bounds, cutter_bounds, face_bounds):
+    """
+    Kesicileri içine alan en ince eksen hizalı dilim
+
+    Returns:
+        (eksen, alt sınır, üst sınır) veya yerel işlem kazançsızsa None
+    """
+    extent = mesh_bounds[1] - mesh_bounds[0]
+    best = None
+    for axis in range(3):
+        if extent[axis] <= 0:
+            continue
+        margin = max(0.25 * (cutter_bounds[1][axis] - cutter_bounds[0][axis]), 1e-3 * extent.max())
+        low = cutter_bounds[0][axis] - margin
+        high = cutter_bounds[1][axis] + margin
+        inside = (face_bounds[1][:, axis] >= low) & (face_bounds[0][:, axis] <= high)
+        fraction = inside.mean()
+        if best is None or fraction < best[0]:
+            best = (fraction, axis, low, high)
+    if best is None or best[0] > LOCAL_MAX_FRACTION:
+        return None
+    return best[1:]
+
+
+def _caps(vertices, faces, axis, planes):
+    """
+    Dilimin açık sınırlarını düzlemler üzerinde üçgenleyerek kapat
+
+    Returns:
+        (F, 3) kapak face'leri (vertex indeksleri sınır vertex'leridir)
+    """
+    boundary = _boundary_edges(faces)
+    others = [i for i in range(3) if i != axis]
+
+    caps = []
+    for value, outward in planes:
+        on_plane = boundary[(vertices[boundary, axis] == value).all(axis=1)]
+        if not len(on_plane):
+            continue
+        used = np.unique(on_plane)
+        local = np.searchsorted(used, on_plane)
+        flat = vertices[used][:, others]
+        lookup = cKDTree(flat)
+
+        for polygon in edges_to_polygons(local, flat):
+            points, triangles = trimesh.creation.triangulate_polygon(polygon, engine='earcut')
+            distance, nearest = lookup.query(points)
+            if distance.max() > 1e-9 * max(np.abs(flat).max(), 1.0):
+                raise ValueError('Kapak üçgenlemesi sınır vertex\'leriyle eşleşmedi')
+            cap = used[nearest][triangles]
+            normals = np.cross(vertices[cap[:, 1]] - vertices[cap[:, 0]],
+                               vertices[cap[:, 2]] - vertices[cap[:, 0]])
+            flip = normals[:, axis] * outward < 0
+            cap[flip] = cap[flip][:, ::-1]
+            caps.append(cap)
+    return np.vstack(caps) if caps else np.zeros((0, 3), dtype=np.int64)
+
+
+def local_subtract(mesh: trimesh.Trimesh, cutters):
+    """
+    Boolean farkı yalnızca kesicilerin çevresindeki dilimde uygula
+
+    Kesicileri içine alan en ince eksen hizalı dilim face sınırlarından
+    (vektörel AABB testi) seçilir ve düzlemlerle birebir bölünür. Dilim
+    kapaklanarak kapalı bir hacme çevrilir, boolean yalnızca bu küçük
+    hacimde çalışır; sonuçtan kapaklar atılıp kalan mesh'e aynı sınır
+    vertex'leri üzerinden dikişlenir.
+
+    Returns:
+        Yeni mesh veya yerel işlem uygun/başarılı değilse None
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    triangles = vertices[faces]
+    face_bounds = (triangles.min(axis=1), triangles.max(axis=1))
+    cutter_bounds = np.array([
+        np.min([cutter.bounds[0] for cutter in cutters], axis=0),
+        np.max([cutter.bounds[1] for cutter in cutters], axis=0),
+    ])
+
+    slab = _slab(mesh.bounds, cutter_bounds, face_bounds)
+    if slab is None:
+        return None
+    axis, low, high = slab
+
+    touching = (face_bounds[1][:, axis] >= low) & (face_bounds[0][:, axis] <= high)
+    kept = [faces[~touching]]
+    inside = faces[touching]
+
+    # Dilimin iki yanı: düzlemin dışında kalan parçalar doğrudan korunur
+    planes = []
+    if low > mesh.bounds[0][axis]:
+        vertices, below, inside = split_faces(vertices, inside, axis, low)
+        kept.append(below)
+        planes.append((low, -1.0))
+    if high < mesh.bounds[1][axis]:
+        vertices, inside, above = split_faces(vertices, inside, axis, high)
+        kept.append(above)
+        planes.append((high, 1.0))
+
+    caps = _caps(vertices, inside, axis, planes)
+    patch_faces = np.vstack([inside, caps])
+    used, remapped = np.unique(patch_faces, return_inverse=True)
+    patch = trimesh.Trimesh(vertices=vertices[used], faces=remapped.reshape(-1, 3), process=False)
+
+    result = trimesh.boolean.difference([patch] + list(cutters))
+    result_vertices = np.asarray(result.vertices, dtype=np.float64)
+    result_faces = np.asarray(result.faces, dtype=np.int64)
+
+    # Boolean motoru float32 çalışır: dilimden gelen vertex'ler yuvarlama
+    # toleransıyla özgün indekslerine geri eşlenir, yeniler sona eklenir
+    tolerance = 8 * np.finfo(np.float32).eps * max(np.abs(patch.vertices).max(), 1.0)
+    distance, nearest = cKDTree(patch.vertices).query(result_vertices)
+    # Eşleme birebir olmalı: aynı vertex'e düşen yeni kesişim noktası
+    # (toleranstan yakın) yeni vertex olarak kalır, yalnızca en yakını eşlenir
+    candidates = np.flatnonzero(distance <= tolerance)
+    candidates = candidates[np.argsort(distance[candidates], kind='stable')]
+    _, first = np.unique(nearest[candidates], return_index=True)
+    matched = candidates[first]
+    mapping = len(vertices) + np.arange(len(result_vertices))
+    mapping[matched] = used[nearest[matched]]
+    result_faces = mapping[result_faces]
+
+    # Kapak face'lerini at: tüm köşeleri kapak (düzlem sınırı) vertex'i
+    if len(caps):
+        result_faces = result_faces[~np.isin(result_faces, np.unique(caps)).all(axis=1)]
+
+    # Dikiş kontrolü: sonucun açık sınırı dilimin sınırıyla birebir (aynı
+    # yönde) örtüşmeli; kalan mesh dokunulmadığı için bu yeterlidir
+    if _edge_keys(_boundary_edges(result_faces)) != _edge_keys(_boundary_edges(inside)):
+        return None
+
+    merged = trimesh.Trimesh(
+        vertices=np.vstack([vertices, result_vertices]),
+        faces=np.vstack(kept + [result_faces]),
+        process=False
+    )
+    merged.remove_unreferenced_vertices()
+    return merged
+
+
+def subtract(mesh: trimesh.Trimesh, cutters, local: bool = True) -> tuple:
+    """
+    Kesicileri mesh'ten tek boolean işlemiyle çıkar
+
+    Mesh'in AABB'sine değmeyen kesiciler atlanır; kalanlar birleştirilip
+    tek fark işlemi yapılır (manifold motoru kesicileri kendi içinde
+    birleştirir, kabuk yalnızca bir kez dönüştürülür). Hiçbir kesici
+    değmiyorsa boolean çalışmaz. local=True ise işlem önce yalnızca
+    kesicilerin çevresindeki dilimde denenir (local_subtract); uygun
+    değilse tüm mesh'e düşülür.
+
+    Args:
+        mesh: Kabuk (kapalı hacim)
+        cutters: Kesici mesh'ler (kapalı hacimler)
+        local: Bölgesel boolean dene
+
+    Returns:
+        (yeni mesh, kullanılan kesici sayısı)
+    """
+    active = [cutter for cutter in cutters if bounds_overlap(mesh.bounds, cutter.bounds)]
+    if not active:
+        return mesh, 0
+
+    if local:
+        try:
+            result = local_subtract(mesh, active)
+        except Exception as e:
+            print(f"Bölgesel boolean başarısız, tüm mesh kullanılıyor: {e}")
+            result = None
+        if result is not None:
+            return result, len(active)
+
+    return trimesh.boolean.difference([mesh] + active), len(active)
+
+
+def sweep_tube(points, radius: float, sections: int = 24) -> trimesh.Trimesh:
+    """
+    Yol boyunca dairesel kesitli, uçları kapalı tek parça tüp
+
+    Kesit çerçeveleri dönme-minimize (double reflection) yöntemiyle
+    taşınır, böylece kıvrımlarda tüp burulmaz. Tüm halkalar ve face'ler
+    tek seferde kurulur; uzun kanallarda parça parça birleştirme yoktur.
+
+    Args:
+        points: (N, 3) yol noktaları
+        radius: Tüp yarıçapı
+        sections: Kesit segment sayısı
+
+    Returns:
+        Kapalı tüp mesh'i
+    """
+    points = np.asarray(points, dtype=np.float64)
+    tangents = np.gradient(points, axis=0)
+    tangents /= np.linalg.norm(tangents, axis=1)[:, None]
+
+    # Başlangıç normali: teğete en dik koordinat ekseninden
+    seed = np.eye(3)[np.argmin(np.abs(tangents[0]))]
+    normal = np.cross(tangents[0], seed)
+    normals = [normal / np.linalg.norm(normal)]
+    for i in range(len(points) - 1):
+        step = points[i + 1] - points[i]
+        c1 = step @ step
+        if c1 <= 0:
+            normals.append(normals[-1])
+            continue
+        reflected = normals[-1] - (2.0 / c1) * (step @ normals[-1]) * step
+        tangent = tangents[i] - (2.0 / c1) * (step @ tangents[i]) * step
+        second = tangents[i + 1] - tangent
+        c2 = second @ second
+        if c2 > 1e-18:
+            reflected = reflected - (2.0 / c2) * (second @ reflected) * second
+        normals.append(reflected / np.linalg.norm(reflected))
+    normals = np.array(normals)
+    binormals = np.cross(tangents, normals)
+
+    theta = np.linspace(0, 2 * np.pi, sections, endpoint=False)
+    rings = (
+        points[:, None, :]
+        + radius * np.cos(theta)[None, :, None] * normals[:, None, :]
+        + radius * np.sin(theta)[None, :, None] * binormals[:, None, :]
+    )
+    count = len(points)
+    vertices = np.vstack([rings.reshape(-1, 3), points[[0, -1]]])
+    start, end = count * sections, count * sections + 1
+
+    i, j = np.meshgrid(np.arange(count - 1), np.arange(sections), indexing='ij')
+    a = i * sections + j
+    b = (i + 1) * sections + j
+    c = (i + 1) * sections + (j + 1) % sections
+    d = i * sections + (j + 1) % sections
+    k = np.arange(sections)
+    last = (count - 1) * sections
+    faces = np.vstack([
+        np.column_stack([a.ravel(), b.ravel(), c.ravel()]),
+        np.column_stack([a.ravel(), c.ravel(), d.ravel()]),
+        np.column_stack([np.full(sections, start), k, (k + 1) % sections]),
+        np.column_stack([np.full(sections, end), last + (k + 1) % sections, last + k]),
+    ])
+
+    tube = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    if tube.volume < 0:
+        tube.invert()
+    return tube
+
+
+def keep_clearance(mesh: trimesh.Trimesh, points, clearance: float, iterations: int = 8):
+    """
+    Yol noktalarını kabuktan en az clearance uzakta tut
+
+    Hızlı ofset kontrolü: mesafe vertex KD-ağacıyla ölçülür ve yüzey
+    mesafesine yaklaştırmak için yarım ortalama kenar boyu düşülür.
+    Uçlardan iki clearance yol uzunluğuna kadar olan çıkış bölgesinde
+    mesafeyi sağlamayan noktalar atılır; aradaki yakın noktalar en
+    yakın yüzey noktasından uzağa itilir ve yol hafifçe yumuşatılır.
+    Birkaç turda çözülmezse yer yoktur.
+
+    Args:
+        mesh: Kabuk
+        points: (N, 3) yol noktaları
+        clearance: Gereken en küçük mesafe (yarıçap + duvar kalınlığı)
+        iterations: İtme turu
+
+    Returns:
+        (kırpılmış ve düzeltilmiş noktalar, en küçük mesafe); hiçbir nokta
+        sığmıyorsa boş dizi ve 0
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces)
+    slack = 0.5 * np.linalg.norm(vertices[faces[:, 0]] - vertices[faces[:, 1]], axis=1).mean()
+    tree = cKDTree(vertices)
+
+    points = np.array(points, dtype=np.float64)
+    lengths = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+    exit_zone = (lengths < 2.0 * clearance) | (lengths > lengths[-1] - 2.0 * clearance)
+    keep = np.flatnonzero((tree.query(points)[0] - slack >= clearance) | ~exit_zone)
+    if not len(keep):
+        return points[:0], 0.0
+    points = points[keep[0]:keep[-1] + 1]
+
+    for _ in range(iterations + 1):
+        distance, nearest = tree.query(points)
+        distance = distance - slack
+        deficit = clearance - distance
+        short = deficit > 0
+        if not short.any():
+            break
+        away = points[short] - vertices[nearest[short]]
+        away /= np.maximum(np.linalg.norm(away, axis=1), 1e-12)[:, None]
+        points[short] += away * deficit[short, None]
+        if len(points) > 2:
+            points[1:-1] = (points[:-2] + 2.0 * points[1:-1] + points[2:]) / 4.0
+    return points, float(distance.min())
@@ -0,0 +1,407 @@
+"""
+Mesh Seyreltme Servisi
+Önizleme ve yüz sayısı bütçesi için hedef face sayısına veya hata toleransına indirgeme
+"""
+import numpy as np
+import trimesh
+
+try:
+    import fast_simplification  # noqa: F401  trimesh'in quadric seyreltme motoru
+except ImportError:  # requirements.txt'te; kurulu değilse vertex kümeleme / numpy QEM kullanılır
+    fast_simplification = None
+
+METHODS = ('quadric', 'cluster')
+
+# Kuadrik katsayıları: simetrik 4x4 matrisin üst üçgeni
+# (q00, q01, q02, q03, q11, q12, q13, q22, q23, q33)
+QUADRIC_ROWS, QUADRIC_COLS = np.triu_indices(4)
+
+# Daraltma turu üst sınırı (her tur bağımsız kenar kümesini birlikte daraltır)
+MAX_COLLAPSE_ROUNDS = 200
+
+# Tur başına yalnızca maliyeti bu dilimin altındaki kenarlar daraltılır
+CHEAP_QUANTILE = 0.5
+
+# Tur başına bağımsız kenar seçimi tekrarı (her tekrar kalan kenarlardan seçer)
+SELECTION_PASSES = 4
+
+# Daraltma sonrası komşu face normali bu kosinüsün altına dönerse daraltma reddedilir
+MIN_NORMAL_COSINE = 0.2
+
+# Kenar anahtarı: (küçük << 32) | büyük
+KEY_SHIFT = np.int64(32)
+
+
+def cluster_decimate(mesh: trimesh.Trimesh, target_faces: int) -> trimesh.Trimesh:
+    """
+    Izgara tabanlı vertex kümeleme ile seyreltme
+
+    Aynı hücreye düşen vertex'ler ortalamalarında birleşir, dejenere
+    ve tekrar eden face'ler atılır. Tamamen vektörizedir; hücre boyu
+    hedef face sayısına göre yüzey alanından tahmin edilir.
+
+    Args:
+        mesh: Kaynak mesh
+        target_faces: Hedef face sayısı (yaklaşık)
+
+    Returns:
+        Seyreltilmiş yeni mesh
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces)
+    origin = vertices.min(axis=0)
+
+    # Düzenli üçgenlemede vertex sayısı ~ face / 2
+    cell = np.sqrt(2.0 * mesh.area / max(int(target_faces), 4))
+    result = mesh
+    for _ in range(4):
+        # Hücre koordinatlarını tek bir int64 anahtara paketle (eksen başına 21 bit)
+        cells = np.floor((vertices - origin) / cell).astype(np.int64)
+        keys = (cells[:, 0] << 42) | (cells[:, 1] << 21) | cells[:, 2]
+        _, cluster, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        cluster = cluster.ravel()
+
+        # Küme merkezleri
+        new_vertices = np.column_stack([
+            np.bincount(cluster, weights=vertices[:, axis], minlength=len(counts))
+            for axis in range(3)
+        ]) / counts[:, None]
+
+        new_faces = cluster[faces]
+        valid = ((new_faces[:, 0] != new_faces[:, 1]) &
+                 (new_faces[:, 1] != new_faces[:, 2]) &
+                 (new_faces[:, 0] != new_faces[:, 2]))
+        new_faces = new_faces[valid]
+        sorted_faces = np.sort(new_faces, axis=1)
+        n = len(counts)
+        if n < 2_000_000:
+            # n³ int64 sınırının altında: tek boyutlu anahtarla hızlı unique
+            face_keys = (sorted_faces[:, 0] * n + sorted_faces[:, 1]) * n + sorted_faces[:, 2]
+            _, unique_index = np.unique(face_keys, return_index=True)
+        else:
+            _, unique_index = np.unique(sorted_faces, axis=0, return_index=True)
+        new_faces = new_faces[np.sort(unique_index)]
+
+        result = trimesh.Trimesh(vertices=new_vertices, faces=new_faces, process=False)
+        result.remove_unreferenced_vertices()
+
+        # Hedefin çok üstünde kaldıysa hücreyi büyütüp tekrar dene
+        if len(result.faces) <= target_faces * 1.25:
+            break
+        cell *= np.sqrt(len(result.faces) / target_faces)
+
+    return result
+
+
+def decimate(mesh: trimesh.Trimesh, target_faces: int) -> trimesh.Trimesh:
+    """
+    Mesh'i hedef face sayısına indir
+
+    fast_simplification kuruluysa trimesh'in quadric hata metriği
+    seyreltmesi, değilse vertex kümeleme kullanılır.
+
+    Args:
+        mesh: Kaynak mesh
+        target_faces: Hedef face sayısı
+
+    Returns:
+        Seyreltilmiş yeni mesh (hedef kaynaktan büyükse kopya)
+    """
+    target_faces = int(target_faces)
+    if target_faces >= len(mesh.faces):
+        return mesh.copy()
+
+    if fast_simplification is not None:
+        return _simplify_quadric(mesh, target_faces)
+    return cluster_decimate(mesh, target_faces)
+
+
+def _simplify_quadric(mesh, target_faces):
+    """
+    fast_simplification ile quadric seyreltme
+
+    Kütüphane yazılabilir float64/int64 C-sıralı diziler ister; önbellekten
+    gelen mesh'lerin dizileri float32 ve salt okunur olabilir (kopyalanır).
+    """
+    source = trimesh.Trimesh(
+        vertices=np.array(mesh.vertices, dtype=np.float64, order='C'),
+        faces=np.array(mesh.faces, dtype=np.int64, order='C'),
+        process=False
+    )
+    return source.simplify_quadric_decimation(face_count=target_faces)
+
+
+def _plane_quadrics(vertices, faces):
+    """Vertex başına alan ağırlıklı düzlem kuadrikleri (V, 10)"""
+    triangles = vertices[faces]
+    cross = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    double_area = np.linalg.norm(cross, axis=1)
+    normals = cross / np.maximum(double_area, 1e-300)[:, None]
+    planes = np.column_stack([normals, -np.einsum('ij,ij->i', normals, triangles[:, 0])])
+    coefficients = planes[:, QUADRIC_ROWS] * planes[:, QUADRIC_COLS] * (double_area / 2.0)[:, None]
+
+    corners = faces.ravel()
+    return np.column_stack([
+        np.bincount(corners, weights=np.repeat(coefficients[:, k], 3), minlength=len(vertices))
+        for k in range(len(QUADRIC_ROWS))
+    ])
+
+
+def _quadric_error(q, points):
+    """pᵀ Q p (noktalar homojen koordinatta w = 1)"""
+    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+    return (
+        q[:, 0] * x * x + q[:, 4] * y * y + q[:, 7] * z * z
+        + 2.0 * (q[:, 1] * x * y + q[:, 2] * x * z + q[:, 5] * y * z)
+        + 2.0 * (q[:, 3] * x + q[:, 6] * y + q[:, 8] * z)
+        + q[:, 9]
+    )
+
+
+def _collapse_targets(q, start, end):
+    """
+    Kenar başına en düşük hatalı daraltma noktası ve hatası
+
+    Kuadriğin minimum noktası (3x3 sistem iyi koşulluysa ve kenara
+    yakınsa), iki uç ve orta nokta arasından en iyisi seçilir. Sistem
+    Cramer kuralıyla tüm kenarlar için birlikte çözülür.
+
+    Returns:
+        (nokta (E, 3), maliyet (E,), ortalama kare kök sapma mm (E,))
+    """
+    a00, a01, a02, a11, a12, a22 = q[:, 0], q[:, 1], q[:, 2], q[:, 4], q[:, 5], q[:, 7]
+    b0, b1, b2 = -q[:, 3], -q[:, 6], -q[:, 8]
+    c00 = a11 * a22 - a12 * a12
+    c01 = a02 * a12 - a01 * a22
+    c02 = a01 * a12 - a02 * a11
+    det = a00 * c00 + a01 * c01 + a02 * c02
+    trace = a00 + a11 + a22
+    solvable = np.abs(det) > 1e-9 * np.maximum(trace / 3.0, 1e-300) ** 3
+    inverse = np.divide(1.0, det, out=np.zeros_like(det), where=solvable)
+    optimal = np.column_stack([
+        c00 * b0 + c01 * b1 + c02 * b2,
+        c01 * b0 + (a00 * a22 - a02 * a02) * b1 + (a01 * a02 - a00 * a12) * b2,
+        c02 * b0 + (a01 * a02 - a00 * a12) * b1 + (a00 * a11 - a01 * a01) * b2,
+    ]) * inverse[:, None]
+
+    middle = (start + end) / 2.0
+    solvable &= np.linalg.norm(optimal - middle, axis=1) <= np.linalg.norm(end - start, axis=1)
+
+    points = np.stack([optimal, start, end, middle], axis=1)
+    errors = np.column_stack([_quadric_error(q, points[:, k]) for k in range(4)])
+    errors[~solvable, 0] = np.inf
+    best = np.argmin(errors, axis=1)
+    rows = np.arange(len(best))
+    # Ağırlık toplamı (iz) ile bölünen hata ortalama kare mesafedir (mm²)
+    cost = np.maximum(errors[rows, best], 0.0)
+    return points[rows, best], cost, np.sqrt(cost / np.maximum(trace, 1e-300))
+
+
+def _unique_keys(keys):
+    """Sıralı tekrarsız anahtarlar (np.unique'in karma yolundan hızlı)"""
+    keys = np.sort(keys, axis=None)
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    return keys[first]
+
+
+def _contains(ordered, keys):
+    if not len(ordered):
+        return np.zeros(np.shape(keys), dtype=bool)
+    return ordered[np.minimum(np.searchsorted(ordered, keys), len(ordered) - 1)] == keys
+
+
+def _valid_collapses(vertices, faces, edge_u, edge_v, positions, unique_keys):
+    """
+    Bağ koşulu (ortak komşu sayısı 2) ve normal dönmesi denetimi
+
+    Bağ koşulu non-manifold kenar oluşmasını, normal denetimi
+    daraltmadan sonra komşu face'lerin ters dönmesini önler. Seçilen
+    kenarların face komşulukları ayrık olduğundan her face en fazla bir
+    daraltmaya aittir; yalnızca bu face'ler işlenir.
+    """
+    owner_of = np.full(len(vertices), -1, dtype=np.int64)
+    owner_of[edge_u] = owner_of[edge_v] = np.arange(len(edge_u))
+    corner_owner = owner_of[faces]
+    touched = np.flatnonzero((corner_owner >= 0).any(axis=1))
+    triangle = faces[touched]
+    owner = corner_owner[touched].max(axis=1)
+    moved = corner_owner[touched] == owner[:, None]
+    valid = np.ones(len(edge_u), dtype=bool)
+
+    # u'ya değen face'lerin diğer köşeleri u'nun komşularıdır (her biri iki
+    # face'te); v'ye de komşu olanlar ortak komşudur: tam 2 komşu = 4 kayıt
+    u, v = edge_u[owner], edge_v[owner]
+    around_u = (triangle == u[:, None]).any(axis=1)
+    neighbours = triangle[around_u]
+    record = np.repeat(np.flatnonzero(around_u), 3)
+    neighbours = neighbours.ravel()
+    other = (neighbours != u[record]) & (neighbours != v[record])
+    low, high = np.minimum(neighbours, v[record]), np.maximum(neighbours, v[record])
+    shared = other & _contains(unique_keys, (low << KEY_SHIFT) | high)
+    valid &= np.bincount(owner[record[shared]], minlength=len(edge_u)) == 4
+
+    # Kenarın iki ucunu birden içeren face'ler silinir; diğerleri dönmemeli
+    kept = moved.sum(axis=1) == 1
+    owner, triangle, moved = owner[kept], triangle[kept], moved[kept]
+    before = vertices[triangle]
+    after = np.where(moved[:, :, None], positions[owner][:, None, :], before)
+    normal_before = np.cross(before[:, 1] - before[:, 0], before[:, 2] - before[:, 0])
+    normal_after = np.cross(after[:, 1] - after[:, 0], after[:, 2] - after[:, 0])
+    norms = np.linalg.norm(normal_before, axis=1) * np.linalg.norm(normal_after, axis=1)
+    cosine = np.einsum('ij,ij->i', normal_before, normal_after) / np.maximum(norms, 1e-300)
+    valid[owner[(cosine < MIN_NORMAL_COSINE) | (norms <= 0)]] = False
+    return valid
+
+
+def _edge_keys(faces):
+    """Face kenarlarının tekrarsız, sıralı anahtarları"""
+    following = np.roll(faces, -1, axis=1)
+    return (np.minimum(faces, following) << KEY_SHIFT) | np.maximum(faces, following)
+
+
+def _independent(edge_u, edge_v, cost, faces, vertex_count, rng):
+    """
+    Birlikte daraltılabilecek ucuz kenarlar (face komşulukları ayrık)
+
+    Maliyeti en düşük CHEAP_QUANTILE dilimindeki kenarlara rastgele
+    öncelik verilir (çoklu seçim); kenar, iki ucunun face komşuluğundaki
+    en öncelikli kenarsa seçilir. Düzgün maliyet alanlarında da tur
+    başına çok sayıda kenar seçilir. Seçilenlerin komşuluğuna değen
+    kenarlar elenip seçim tekrarlanır.
+
+    Returns:
+        Seçilen kenar indeksleri (maliyet sırasıyla)
+    """
+    cheap = np.flatnonzero(cost <= np.quantile(cost, CHEAP_QUANTILE))
+    edge_u, edge_v = edge_u[cheap], edge_v[cheap]
+    rank = rng.permutation(len(cheap))
+    available = np.ones(len(cheap), dtype=bool)
+    chosen = []
+    for _ in range(SELECTION_PASSES):
+        live = np.flatnonzero(available)
+        if not len(live):
+            break
+        sentinel = len(cheap)
+        vertex_rank = np.full(vertex_count, sentinel, dtype=np.int64)
+        np.minimum.at(vertex_rank, edge_u[live], rank[live])
+        np.minimum.at(vertex_rank, edge_v[live], rank[live])
+        face_rank = vertex_rank[faces].min(axis=1)
+        ring_rank = np.full(vertex_count, sentinel, dtype=np.int64)
+        np.minimum.at(ring_rank, faces.ravel(), np.repeat(face_rank, 3))
+        picked = live[(ring_rank[edge_u[live]] == rank[live]) & (ring_rank[edge_v[live]] == rank[live])]
+        chosen.append(picked)
+
+        # Seçilen kenarların face komşuluğundaki vertex'lere değen kenarlar elenir
+        ends = np.zeros(vertex_count, dtype=bool)
+        ends[edge_u[picked]] = ends[edge_v[picked]] = True
+        claimed = np.zeros(vertex_count, dtype=bool)
+        claimed[faces[ends[faces].any(axis=1)].ravel()] = True
+        available &= ~claimed[edge_u] & ~claimed[edge_v]
+
+    chosen = cheap[np.concatenate(chosen)]
+    return chosen[np.argsort(cost[chosen], kind='stable')]
+
+
+def quadric_decimate(mesh: trimesh.Trimesh, target_faces: int = None, max_error: float = None) -> trimesh.Trimesh:
+    """
+    Kuadrik hata metriğiyle (QEM) kenar daraltarak seyrelt
+
+    Her turda birbirinin face komşuluğuna değmeyen en ucuz kenarlar
+    birlikte daraltılır; kenar maliyetleri yalnızca değişen vertex'lere
+    değen kenarlar için yeniden hesaplanır. Detaylı (eğrisel) bölgeler
+    korunur, düz bölgeler seyrekleşir. Açık sınır ve non-manifold kenar
+    vertex'leri sabit kalır.
+
+    Args:
+        mesh: Kaynak mesh (değiştirilmez)
+        target_faces: Hedef face sayısı (None ise yalnızca hata sınırı)
+        max_error: Daraltma başına izin verilen ortalama kare kök
+            yüzey sapması (mm; None ise sınırsız)
+
+    Returns:
+        Seyreltilmiş yeni mesh
+    """
+    if target_faces is None and max_error is None:
+        raise ValueError('Hedef face sayısı veya hata toleransı gerekli')
+    target = int(target_faces) if target_faces is not None else 0
+    if fast_simplification is not None and max_error is None:
+        return _simplify_quadric(mesh, target)
+
+    vertices = np.array(mesh.vertices, dtype=np.float64)
+    faces = np.array(mesh.faces, dtype=np.int64)
+    quadrics = _plane_quadrics(vertices, faces)
+    low_mask = (np.int64(1) << KEY_SHIFT) - 1
+
+    # Tam iki face'e ait olmayan kenarların (açık sınır, non-manifold) vertex'leri sabit
+    keys = np.sort(_edge_keys(faces), axis=None)
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    irregular = keys[starts][np.diff(np.append(starts, len(keys))) != 2]
+    locked = np.zeros(len(vertices), dtype=bool)
+    locked[irregular >> KEY_SHIFT] = True
+    locked[irregular & low_mask] = True
+
+    # Önceki turun kenar maliyetleri (değişmeyen kenarlar yeniden hesaplanmaz)
+    known_keys = np.empty(0, dtype=np.int64)
+    known_positions, known_cost, known_error = np.empty((0, 3)), np.empty(0), np.empty(0)
+    changed = np.ones(len(vertices), dtype=bool)
+    blocked = np.empty(0, dtype=np.int64)
+    collapsed = False
+    rng = np.random.default_rng(0)
+    for _ in range(MAX_COLLAPSE_ROUNDS):
+        excess = len(faces) - target
+        if target and excess <= 0:
+            break
+
+        all_keys = _unique_keys(_edge_keys(faces))
+        edge_u, edge_v = all_keys >> KEY_SHIFT, all_keys & low_mask
+        candidate = ~locked[edge_u] & ~locked[edge_v]
+        keys, edge_u, edge_v = all_keys[candidate], edge_u[candidate], edge_v[candidate]
+
+        positions = np.empty((len(keys), 3))
+        cost, error = np.empty(len(keys)), np.empty(len(keys))
+        stale = changed[edge_u] | changed[edge_v] | ~_contains(known_keys, keys)
+        fresh = ~stale
+        source = np.searchsorted(known_keys, keys[fresh])
+        positions[fresh], cost[fresh], error[fresh] = known_positions[source], known_cost[source], known_error[source]
+        positions[stale], cost[stale], error[stale] = _collapse_targets(
+            quadrics[edge_u[stale]] + quadrics[edge_v[stale]], vertices[edge_u[stale]], vertices[edge_v[stale]]
+        )
+        known_keys, known_positions, known_cost, known_error = keys, positions, cost, error
+
+        usable = ~_contains(blocked, keys)
+        if max_error is not None:
+            usable &= error <= max_error
+        index = np.flatnonzero(usable)
+        if not len(index):
+            if len(blocked) and collapsed:
+                # Reddedilen kenarlar komşuluk değiştikten sonra yeniden denenir
+                blocked, collapsed = np.empty(0, dtype=np.int64), False
+                continue
+            break
+
+        chosen = index[_independent(edge_u[index], edge_v[index], cost[index], faces, len(vertices), rng)]
+        if target:
+            # İç kenar daraltması iki face siler
+            chosen = chosen[:(excess + 1) // 2]
+
+        valid = _valid_collapses(vertices, faces, edge_u[chosen], edge_v[chosen], positions[chosen], all_keys)
+        blocked = _unique_keys(np.concatenate([blocked, keys[chosen[~valid]]]))
+        chosen = chosen[valid]
+        changed = np.zeros(len(vertices), dtype=bool)
+        if not len(chosen):
+            continue
+
+        u, v = edge_u[chosen], edge_v[chosen]
+        collapsed = True
+        changed[u] = True
+        vertices[u] = positions[chosen]
+        quadrics[u] += quadrics[v]
+        remap = np.arange(len(vertices))
+        remap[v] = u
+        faces = remap[faces]
+        faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])]
+
+    result = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    result.remove_unreferenced_vertices()
+    return result
@@ -0,0 +1,119 @@
+"""
+Bölgesel Deformasyon Motoru
+Uzamsal indeksle seçilen bölgeye yumuşak düşüşlü (falloff) yer değiştirme uygular
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import trimesh
+from scipy.spatial import cKDTree
+
+# Süreçte tutulan en fazla indeks sayısı (aynı mesh'te art arda önizlemeler)
+INDEX_CACHE_SIZE = 4
+
+
+class RegionIndex:
+    """
+    Bölge seçimi için mesh indeksi.
+
+    Vertex KD-ağacı yarıçap sorgusunu, vertex → face CSR eşlemesi
+    seçilen vertex'lere değen face'leri tüm face dizisini taramadan
+    verir; ikisi de bir kez kurulur.
+    """
+
+    def __init__(self, mesh: trimesh.Trimesh):
+        faces = np.asarray(mesh.faces, dtype=np.int64).ravel()
+        self.tree = cKDTree(np.asarray(mesh.vertices, dtype=np.float64))
+        self.vertex_faces = np.argsort(faces, kind='stable') // 3
+        counts = np.bincount(faces, minlength=len(mesh.vertices))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.face_count = len(mesh.faces)
+
+    def faces_of(self, vertices: np.ndarray) -> np.ndarray:
+        """Vertex'lere değen face indeksleri (tekrarsız)"""
+        start = self.offsets[vertices]
+        counts = self.offsets[vertices + 1] - start
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        touched = np.zeros(self.face_count, dtype=bool)
+        touched[self.vertex_faces[np.repeat(start, counts) + local]] = True
+        return np.flatnonzero(touched)
+
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+def region_index(mesh: trimesh.Trimesh, mesh_hash: str = None) -> RegionIndex:
+    """
+    Mesh'in bölge indeksi; mesh_hash verilirse süreç içinde yeniden kullanılır
+
+    Aynı mesh üzerindeki etkileşimli önizlemeler indeksi her istekte
+    yeniden kurmaz.
+    """
+    if mesh_hash is None:
+        return RegionIndex(mesh)
+    with _lock:
+        index = _indexes.get(mesh_hash)
+        if index is not None:
+            _indexes.move_to_end(mesh_hash)
+            return index
+    index = RegionIndex(mesh)
+    with _lock:
+        _indexes[mesh_hash] = index
+        while len(_indexes) > INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
+
+
+def falloff(distance: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Düşüş çekirdeği (1 - (d/r)²)³
+
+    Merkezde 1, yarıçapta türeviyle birlikte 0 olur; bölge sınırında
+    kırışıklık oluşmaz.
+    """
+    t = np.clip(np.asarray(distance, dtype=np.float64) / radius, 0.0, 1.0)
+    return (1.0 - t * t) ** 3
+
+
+def bulge(mesh: trimesh.Trimesh, center, radius: float, amount: float, mesh_hash: str = None):
+    """
+    Merkez çevresindeki vertex'leri normalleri boyunca it
+
+    Yalnızca yarıçap içindeki vertex'ler ve onlara değen face'ler
+    işlenir; normaller bu face'lerden alan ağırlıklı hesaplanır.
+
+    Args:
+        mesh: Kaynak mesh (değiştirilmez)
+        center: Bölge merkezi (3,)
+        radius: Etki yarıçapı (mm)
+        amount: Merkezdeki yer değiştirme (mm; negatif içe çeker)
+        mesh_hash: Mesh içerik özeti (indeks önbelleği için)
+
+    Returns:
+        (vertex indeksleri (K,), yeni konumlar (K, 3))
+    """
+    index = region_index(mesh, mesh_hash)
+    center = np.asarray(center, dtype=np.float64)
+    selected = np.sort(np.asarray(index.tree.query_ball_point(center, radius), dtype=np.int64))
+    if not len(selected):
+        return selected, np.empty((0, 3))
+
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    triangles = np.asarray(mesh.faces, dtype=np.int64)[index.faces_of(selected)]
+    corners = vertices[triangles]
+    # Çapraz çarpım uzunluğu 2 × alan: alan ağırlıklı normal toplamı
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+    position = np.searchsorted(selected, triangles)
+    inside = selected[np.minimum(position, len(selected) - 1)] == triangles
+    owner = position[inside]
+    contribution = np.repeat(face_normals, 3, axis=0)[inside.ravel()]
+    normals = np.column_stack([
+        np.bincount(owner, weights=contribution[:, axis], minlength=len(selected)) for axis in range(3)
+    ])
+    normals /= np.maximum(np.linalg.norm(normals, axis=1), 1e-12)[:, None]
+
+    weight = falloff(np.linalg.norm(vertices[selected] - center, axis=1), radius)
+    return selected, vertices[selected] + (float(amount) * weight)[:, None] * normals
@@ -0,0 +1,206 @@
+"""
+Delik Doldurma Motoru
+Açık sınır döngülerini bulur, üçgenler, yamayı inceltir ve çevresine uyumlu biçimde düzgünleştirir
+"""
+from collections import defaultdict
+
+import mapbox_earcut
+import numpy as np
+import shapely
+import trimesh
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+from apps.core.services.remesh import edge_keys, flip_edges, refine
+
+METHODS = ('fair', 'flat')
+
+
+def boundary_loops(faces: np.ndarray):
+    """
+    Açık sınır döngüleri
+
+    Yalnızca tek face'e ait kenarlar tek bir sıralı sayımla bulunur;
+    döngüler yalnızca sınır kenarları üzerinde yürünür.
+
+    Returns:
+        Vertex indeks dizileri listesi; her döngü mesh'teki face
+        kenarlarının yönünde (a → b) sıralıdır
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    edges = trimesh.geometry.faces_to_edges(faces)
+    keys = edge_keys(edges[:, 0], edges[:, 1])
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    edges = edges[counts[inverse] == 1]
+
+    # Sınırdaki vertex'lerden çıkan kenarlar (sıkışık vertex'te birden fazla)
+    outgoing = defaultdict(list)
+    for index, source in enumerate(edges[:, 0].tolist()):
+        outgoing[source].append(index)
+
+    used = np.zeros(len(edges), dtype=bool)
+    targets = edges[:, 1].tolist()
+    loops = []
+    for start in range(len(edges)):
+        if used[start]:
+            continue
+        loop, edge = [], start
+        while True:
+            used[edge] = True
+            loop.append(int(edges[edge, 0]))
+            following = [e for e in outgoing[targets[edge]] if not used[e]]
+            if not following:
+                break
+            edge = following[0]
+        # Kapanmayan (kırık) sınırlar doldurulmaz
+        if targets[edge] == loop[0] and len(loop) >= 3:
+            loops.append(np.array(loop, dtype=np.int64))
+    return loops
+
+
+def _triangulate(vertices, loop):
+    """
+    Döngüyü kapatan üçgenler
+
+    Döngü en uygun düzleme izdüşürülür; izdüşüm basit bir çokgense
+    ear-clipping (earcut), değilse ağırlık merkezinden yelpaze kullanılır.
+
+    Returns:
+        (face'ler — döngü indeksleri, yelpaze merkezi veya None)
+    """
+    # Yama sınırı mesh kenarlarının ters yönünde dolaşır
+    ring = loop[::-1]
+    points = vertices[ring]
+    if len(ring) == 3:
+        return ring[None, :], None
+
+    center = points.mean(axis=0)
+    _, _, axes = np.linalg.svd(points - center, full_matrices=False)
+    flat = (points - center) @ axes[:2].T
+
+    polygon = shapely.Polygon(flat)
+    if polygon.is_valid and polygon.area > 0:
+        triangles = mapbox_earcut.triangulate_float64(flat, np.array([len(flat)], dtype=np.uint32))
+        triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        if len(triangles) == len(ring) - 2:
+            # Üçgenleri çokgenin dolaşım yönüne çevir
+            a, b, c = (flat[triangles[:, i]] for i in range(3))
+            signed = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+            orientation = 1.0 if shapely.is_ccw(polygon.exterior) else -1.0
+            flip = signed * orientation < 0
+            triangles[flip] = triangles[flip][:, ::-1]
+            return ring[triangles], None
+
+    count = len(ring)
+    fan = np.column_stack([
+        np.full(count, -1), ring, np.roll(ring, -1),
+    ])
+    return fan, center
+
+
+def _fair(vertices, patch_faces, ring_faces, free):
+    """
+    Yama iç vertex'lerini çevreye teğet sürekli biçimde yerleştir
+
+    Yerel komşulukta (yama + döngü vertex'lerine değen face'ler) düzgün
+    ağırlıklı Laplace operatörüyle bi-Laplace (L²x = 0) sistemi çözülür;
+    döngü ve onun bir halka komşuları sabittir. Maliyet yalnızca delik
+    çevresinin boyutuna bağlıdır.
+    """
+    local_faces = np.vstack([patch_faces, ring_faces])
+    local, inverse = np.unique(local_faces, return_inverse=True)
+    local_faces = inverse.reshape(-1, 3)
+    count = len(local)
+
+    edges = np.unique(np.sort(trimesh.geometry.faces_to_edges(local_faces), axis=1), axis=0)
+    adjacency = sparse.coo_matrix(
+        (np.ones(2 * len(edges)), (edges.ravel(order='F'), edges[:, ::-1].ravel(order='F'))),
+        shape=(count, count),
+    ).tocsr()
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    laplacian = (sparse.diags(1.0 / np.maximum(degree, 1.0)) @ adjacency - sparse.identity(count)).tocsr()
+
+    is_free = np.isin(local, free)
+    system = (laplacian @ laplacian).tocsr()
+    a = system[is_free][:, is_free].tocsc()
+    b = -system[is_free][:, ~is_free] @ vertices[local[~is_free]]
+
+    solved = spsolve(a, b)
+    if not np.all(np.isfinite(solved)):
+        # Bi-Laplace tekilse (ör. tek iç vertex) harmonik çözüm
+        a = laplacian[is_free][:, is_free].tocsc()
+        b = -laplacian[is_free][:, ~is_free] @ vertices[local[~is_free]]
+        solved = spsolve(a, b)
+    if np.all(np.isfinite(solved)):
+        vertices[local[is_free]] = np.asarray(solved).reshape(-1, 3)
+    return vertices
+
+
+class HoleFiller:
+    """
+    Açık sınırları kapatan yama üretici.
+
+    Sınır kenarları tüm mesh üzerinde tek vektörel sayımla bulunur;
+    üçgenleme, inceltme ve düzgünleştirme yalnızca delik çevresinde
+    çalışır. Mevcut vertex ve face'ler değişmez, yamalar sona eklenir.
+    """
+
+    def __init__(self, mesh: trimesh.Trimesh):
+        """
+        Args:
+            mesh: Doldurulacak mesh (değiştirilmez)
+        """
+        self.mesh = mesh
+        self.loops = boundary_loops(mesh.faces)
+
+    def fill(self, max_hole_size: float = 0, method: str = 'fair'):
+        """
+        Delikleri doldur
+
+        Args:
+            max_hole_size: Bu çaptan (mm, sınır kutusu köşegeni) büyük
+                delikler atlanır; 0 ise hepsi doldurulur
+            method: 'fair' (çevreye uyumlu kavisli yama) veya 'flat'
+                (üçgenlenmiş düz yama)
+
+        Returns:
+            (yeni mesh, {'holes', 'filled', 'faces_added'})
+        """
+        if method not in METHODS:
+            raise ValueError(f'Desteklenmeyen doldurma yöntemi: {method}')
+
+        vertices = np.array(self.mesh.vertices, dtype=np.float64)
+        faces = np.asarray(self.mesh.faces, dtype=np.int64)
+        original = len(vertices)
+
+        patches, targets, boundary = [], [], []
+        for loop in self.loops:
+            points = vertices[loop]
+            if max_hole_size > 0 and np.linalg.norm(points.max(axis=0) - points.min(axis=0)) > max_hole_size:
+                continue
+            triangles, center = _triangulate(vertices, loop)
+            if center is not None:
+                triangles = np.where(triangles < 0, len(vertices), triangles)
+                vertices = np.vstack([vertices, center])
+            patches.append(triangles)
+            edge = np.linalg.norm(points - np.roll(points, -1, axis=0), axis=1).mean()
+            targets.append(np.full(len(triangles), edge))
+            boundary.append(loop)
+
+        report = {'holes': len(self.loops), 'filled': len(patches), 'faces_added': 0}
+        if not patches:
+            return self.mesh.copy(), report
+
+        # Yama kenarı, deliğin ortalama sınır kenarının SPLIT_RATIO katından uzunsa bölünür
+        loop_keys = np.unique(np.concatenate([edge_keys(loop, np.roll(loop, -1)) for loop in boundary]))
+        patch_faces = flip_edges(vertices, np.vstack(patches), loop_keys)
+        vertices, patch_faces = refine(vertices, patch_faces, np.concatenate(targets), loop_keys)
+
+        if method == 'fair' and len(vertices) > original:
+            loop_vertices = np.unique(np.concatenate(boundary))
+            ring_faces = faces[np.isin(faces, loop_vertices).any(axis=1)]
+            vertices = _fair(vertices, patch_faces, ring_faces, np.arange(original, len(vertices)))
+
+        report['faces_added'] = int(len(patch_faces))
+        filled = trimesh.Trimesh(vertices=vertices, faces=np.vstack([faces, patch_faces]), process=False)
+        return filled, report
@@ -0,0 +1,187 @@
+"""
+Paylaşımlı Mesh Önbelleği
+Diskteki mesh dosyalarını bir kez ayrıştırıp süreç içinde LRU olarak tutar
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import trimesh
+from django.conf import settings
+
+from . import mesh_format
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def read_mesh(file_path: str) -> trimesh.Trimesh:
+    """Mesh dosyasını diskten oku, Scene ise ilk geometry'yi al"""
+    if mesh_format.is_compact(file_path):
+        return mesh_format.load_mesh(file_path)
+    mesh = trimesh.load(file_path)
+    if isinstance(mesh, trimesh.Scene):
+        mesh = list(mesh.geometry.values())[0]
+    return mesh
+
+
+def file_digest(file_path: str) -> str:
+    """Dosya içeriğinin BLAKE2b özeti"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _frozen(array, dtype) -> np.ndarray:
+    """Önbellekte paylaşılacak salt okunur kopya"""
+    frozen = np.array(array, dtype=dtype)
+    frozen.flags.writeable = False
+    return frozen
+
+
+class MeshCache:
+    """
+    İçerik özetine göre anahtarlanan, bayt bütçeli LRU mesh önbelleği
+
+    Önbellek yalnızca salt okunur vertex/face dizilerini tutar. Her
+    istekte bu dizileri paylaşan yeni bir Trimesh döner; trimesh
+    işlemleri dizileri yerinde değiştirmek yerine yenisini atadığı için
+    her örnek ilk değişiklikte kendi kopyasına geçer (copy-on-write).
+    """
+
+    def __init__(self, max_bytes: int = None):
+        """
+        Args:
+            max_bytes: Bellek bütçesi (None ise MESH_CACHE_MAX_BYTES ayarı)
+        """
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._digests = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return getattr(settings, 'MESH_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+
+    def key_for(self, file_path: str) -> str:
+        """
+        Dosyanın önbellek anahtarı (içerik özeti)
+
+        Özet, dosyanın mtime ve boyutuyla birlikte saklanır; dosya
+        değişmediği sürece yeniden okunmaz.
+        """
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            known = self._digests.get(file_path)
+        if known is not None and known[0] == signature:
+            return known[1]
+
+        digest = file_digest(file_path)
+        with self._lock:
+            self._digests[file_path] = (signature, digest)
+        return digest
+
+    def load(self, file_path: str) -> trimesh.Trimesh:
+        """
+        Mesh'i önbellekten al, yoksa diskten okuyup önbelleğe ekle
+
+        Returns:
+            Önbellek dizilerini paylaşan yeni Trimesh örneği
+        """
+        key = self.key_for(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is None:
+            entry = self._store(key, read_mesh(file_path))
+            with self._lock:
+                self.misses += 1
+        return self._instance(entry)
+
+    def put(self, file_path: str, mesh: trimesh.Trimesh):
+        """
+        Diske yeni yazılmış bir dosyanın mesh'ini önbelleğe ekle
+
+        İşlem sonrası kaydedilen model bir sonraki adımda yeniden
+        ayrıştırılmaz.
+        """
+        self._store(self.key_for(file_path), mesh)
+
+    def get(self, key: str):
+        """
+        Anahtarla önbellekteki mesh (yoksa None)
+
+        Diskte dosyası olmayan mesh'ler (ör. yeniden kurulan sürümler)
+        dosya özeti yerine çağıranın verdiği anahtarla saklanır.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._instance(entry)
+
+    def remember(self, key: str, mesh: trimesh.Trimesh):
+        """Mesh'i verilen anahtarla önbelleğe ekle"""
+        self._store(key, mesh)
+
+    def clear(self):
+        """Önbelleği boşalt"""
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """Önbellek istatistikleri"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def _store(self, key: str, mesh: trimesh.Trimesh):
+        entry = (_frozen(mesh.vertices, np.float64), _frozen(mesh.faces, np.int64))
+        size = entry[0].nbytes + entry[1].nbytes
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entry_bytes(self._entries.pop(key))
+            if size <= self.max_bytes:
+                self._entries[key] = entry
+                self.current_bytes += size
+                # Bütçe aşılırsa en eski kayıtları çıkar
+                while self.current_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.current_bytes -= self._entry_bytes(evicted)
+        return entry
+
+    @staticmethod
+    def _entry_bytes(entry) -> int:
+        return entry[0].nbytes + entry[1].nbytes
+
+    @staticmethod
+    def _instance(entry) -> trimesh.Trimesh:
+        vertices, faces = entry
+        return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+# Süreç genelinde paylaşılan önbellek
+mesh_cache = MeshCache()
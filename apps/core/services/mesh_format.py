@@ -0,0 +1,92 @@
+"""
+Kompakt İkili Mesh Formatı (.nwm)
+Ara işlem çıktıları için indeksli, memmap ile okunabilen mesh dosyası
+
+Dosya düzeni (little-endian):
+    0   8s   sihirli değer b'NWMESH\\x00\\x00'
+    8   u4   format sürümü
+    12  u4   ayrılmış (0)
+    16  u8   vertex sayısı (V)
+    24  u8   face sayısı (F)
+    32  ...  64 bayta kadar sıfır dolgu
+    64  f4   vertex dizisi (V x 3)
+    ..  u4   face dizisi (F x 3)
+"""
+import struct
+import tempfile
+
+import numpy as np
+import trimesh
+from django.core.files import File
+
+EXTENSION = 'nwm'
+MAGIC = b'NWMESH\x00\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQ')
+HEADER_SIZE = 64
+
+VERTEX_DTYPE = np.dtype('<f4')
+FACE_DTYPE = np.dtype('<u4')
+
+
+def is_compact(file_path: str) -> bool:
+    """Dosya uzantısı kompakt formata mı ait?"""
+    return str(file_path).lower().endswith('.' + EXTENSION)
+
+
+def write_mesh(mesh: trimesh.Trimesh, file_obj):
+    """
+    Mesh'i kompakt formatta bir dosya nesnesine yaz
+
+    Args:
+        mesh: Yazılacak trimesh nesnesi
+        file_obj: Yazılabilir ikili dosya nesnesi
+    """
+    vertices = np.ascontiguousarray(mesh.vertices, dtype=VERTEX_DTYPE)
+    faces = np.ascontiguousarray(mesh.faces, dtype=FACE_DTYPE)
+
+    header = HEADER.pack(MAGIC, VERSION, 0, len(vertices), len(faces))
+    file_obj.write(header.ljust(HEADER_SIZE, b'\x00'))
+    file_obj.write(vertices.tobytes())
+    file_obj.write(faces.tobytes())
+
+
+def export_file(mesh: trimesh.Trimesh, max_memory_size: int) -> File:
+    """
+    Mesh'i kompakt formatta tampona yaz
+
+    Returns:
+        Başa sarılmış django File nesnesi
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=max_memory_size)
+    write_mesh(mesh, buffer)
+    buffer.seek(0)
+    return File(buffer)
+
+
+def read_arrays(file_path: str):
+    """
+    Vertex ve face dizilerini kopyalamadan memmap olarak aç
+
+    Returns:
+        (vertices, faces) salt okunur np.memmap dizileri
+    """
+    with open(file_path, 'rb') as f:
+        magic, version, _, vertex_count, face_count = HEADER.unpack(f.read(HEADER.size))
+
+    if magic != MAGIC:
+        raise ValueError(f'Geçersiz mesh dosyası: {file_path}')
+    if version != VERSION:
+        raise ValueError(f'Desteklenmeyen mesh formatı sürümü: {version}')
+
+    vertices = np.memmap(file_path, dtype=VERTEX_DTYPE, mode='r',
+                         offset=HEADER_SIZE, shape=(vertex_count, 3))
+    faces = np.memmap(file_path, dtype=FACE_DTYPE, mode='r',
+                      offset=HEADER_SIZE + vertices.nbytes, shape=(face_count, 3))
+    return vertices, faces
+
+
+def load_mesh(file_path: str) -> trimesh.Trimesh:
+    """Kompakt mesh dosyasını trimesh nesnesi olarak yükle"""
+    vertices, faces = read_arrays(file_path)
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
@@ -0,0 +1,170 @@
+"""
+Profilleme Servisi
+İşlem ve analiz sıcak yolları için aşama süreleri, bellek tepe değeri ve opsiyonel profil dökümü
+"""
+import cProfile
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+
+try:
+    import pyinstrument
+except ImportError:  # opsiyonel; yoksa cProfile kullanılır
+    pyinstrument = None
+
+try:
+    import resource
+except ImportError:  # yalnızca Unix; Windows'ta RSS tepe değeri raporlanmaz
+    resource = None
+
+
+def _peak_rss_mb():
+    """Sürecin şimdiye kadarki en yüksek RSS değeri (MB; ölçülemiyorsa None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def mesh_size(mesh):
+    return {'vertices': int(len(mesh.vertices)), 'faces': int(len(mesh.faces))}
+
+
+class PhaseTimer:
+    """
+    Aşama başına süre ve bellek ölçen yardımcı
+
+    Aynı isimli aşamalar toplanır. PROFILING_TRACEMALLOC açıksa Python
+    ayırmalarının tepe değeri de ölçülür (ek yükü vardır; eşzamanlı
+    istekler aynı tepe değeri paylaşır); RSS tepe değeri her zaman
+    kaydedilir.
+
+    Kullanım:
+        timer = PhaseTimer()
+        with timer.phase('load'):
+            ...
+        step.metrics = timer.as_dict()
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.meshes = {}
+        self.trace = getattr(settings, 'PROFILING_TRACEMALLOC', False)
+        if self.trace:
+            # İzleme süreç boyunca açık kalır; tepe değer her ölçümde sıfırlanır
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record_mesh(self, label, mesh):
+        """Mesh boyutunu kaydet ('before', 'after' gibi)"""
+        self.meshes[label] = mesh_size(mesh)
+
+    def as_dict(self, phases=None, meshes=None):
+        """
+        JSONField'a yazılacak ölçümler
+
+        Args:
+            phases: Aşama alt kümesi/üzerine yazma (birden çok kayda bölünen ölçümler için)
+            meshes: Mesh boyutları (None ise record_mesh ile kaydedilenler)
+        """
+        phases = self.phases if phases is None else phases
+        meshes = self.meshes if meshes is None else meshes
+        data = {
+            'phases': {name: round(seconds, 6) for name, seconds in phases.items()},
+            'total': round(sum(phases.values()), 6),
+        }
+        peak_rss = _peak_rss_mb()
+        data['peak_rss_mb'] = round(peak_rss, 1) if peak_rss is not None else None
+        if meshes:
+            data['mesh'] = dict(meshes)
+        if self.trace and tracemalloc.is_tracing():
+            data['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        return data
+
+
+@contextmanager
+def profiled(name):
+    """
+    PROFILING_DUMP_DIR ayarlıysa bloğu profille ve dosyaya dök
+
+    pyinstrument kuruluysa ve PROFILING_BACKEND = 'pyinstrument' ise
+    HTML rapor, aksi halde cProfile .prof dosyası yazılır (snakeviz,
+    pstats ile açılabilir). Ayar boşsa ek yük yoktur.
+    """
+    directory = getattr(settings, 'PROFILING_DUMP_DIR', None)
+    if not directory:
+        yield
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, f'{name}-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}')
+
+    if pyinstrument is not None and getattr(settings, 'PROFILING_BACKEND', 'cprofile') == 'pyinstrument':
+        profiler = pyinstrument.Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(stem + '.html', 'w') as f:
+                f.write(profiler.output_html())
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(stem + '.prof')
+
+
+def summarize(metrics_list):
+    """
+    Ölçüm listesini aşama başına istatistiklere çevir
+
+    Returns:
+        {'count', 'phases': {ad: {'mean', 'p50', 'p95', 'max'}}, 'total': {...}, 'peak_rss_mb'}
+    """
+    metrics_list = [metrics for metrics in metrics_list if metrics]
+
+    def stats(values):
+        values = np.asarray(values, dtype=np.float64)
+        return {
+            'mean': round(float(values.mean()), 6),
+            'p50': round(float(np.percentile(values, 50)), 6),
+            'p95': round(float(np.percentile(values, 95)), 6),
+            'max': round(float(values.max()), 6),
+        }
+
+    phases = {}
+    for metrics in metrics_list:
+        for name, seconds in metrics.get('phases', {}).items():
+            phases.setdefault(name, []).append(seconds)
+
+    summary = {
+        'count': len(metrics_list),
+        'phases': {name: stats(values) for name, values in phases.items()},
+    }
+    totals = [metrics['total'] for metrics in metrics_list if 'total' in metrics]
+    if totals:
+        summary['total'] = stats(totals)
+    rss = [metrics['peak_rss_mb'] for metrics in metrics_list if metrics.get('peak_rss_mb') is not None]
+    if rss:
+        summary['peak_rss_mb'] = max(rss)
+    return summary
@@ -0,0 +1,174 @@
+"""
+Yerel Yeniden Örgüleme Servisi
+Seçili face'leri kenar boyuna göre uyumlu biçimde böler ve Delaunay kenar çevirmesiyle düzeltir
+"""
+import numpy as np
+
+# Kenar, hedef boyun bu katından uzunsa bölünür
+SPLIT_RATIO = 1.5
+
+# İnceltme turu üst sınırı (her tur face sayısını en fazla 4 katına çıkarır)
+MAX_REFINE_ITERATIONS = 10
+
+# Tek kenar çevirme (Delaunay) geçişi sayısı üst sınırı
+MAX_FLIP_PASSES = 8
+
+# Kenar anahtarı: (küçük << 32) | büyük
+KEY_SHIFT = np.int64(32)
+
+
+def edge_keys(a, b):
+    """Yönsüz kenar anahtarları (tek int64)"""
+    low, high = np.minimum(a, b).astype(np.int64), np.maximum(a, b).astype(np.int64)
+    return (low << KEY_SHIFT) | high
+
+
+def _contains(ordered, keys):
+    """Sıralı anahtar dizisinde üyelik (searchsorted ile)"""
+    if not len(ordered):
+        return np.zeros(np.shape(keys), dtype=bool)
+    return ordered[np.minimum(np.searchsorted(ordered, keys), len(ordered) - 1)] == keys
+
+
+def _angle(origin, a, b):
+    u, v = a - origin, b - origin
+    cosine = np.einsum('ij,ij->i', u, v) / np.maximum(np.linalg.norm(u, axis=1) * np.linalg.norm(v, axis=1), 1e-20)
+    return np.arccos(np.clip(cosine, -1.0, 1.0))
+
+
+def flip_edges(vertices, faces, fixed_keys=None):
+    """
+    İç kenarları Delaunay ölçütüyle çevir
+
+    Karşı açıları toplamı π'yi aşan iç kenar dörtgenin diğer
+    köşegeniyle değiştirilir. Her geçişte birbirine değmeyen kenarlar
+    (her face en fazla bir çevirmede) birlikte çevrilir. Face sırası
+    değişmez.
+
+    Args:
+        vertices: (V, 3) konumlar
+        faces: (F, 3) çevrilecek face'ler
+        fixed_keys: Sıralı kenar anahtarları; bu kenarlar çevrilmez ve
+            yeni köşegen olarak üretilmez (ör. face kümesi dışındaki mesh
+            kenarları, keskin kenarlar)
+    """
+    fixed_keys = np.empty(0, dtype=np.int64) if fixed_keys is None else fixed_keys
+    # Yalnızca önceki geçişte aday olan face'lerin kenarları yeniden
+    # değerlendirilir; çevirme açıları yalnızca değişen face'lerde değiştirir
+    dirty = np.ones(len(faces), dtype=bool)
+    for _ in range(MAX_FLIP_PASSES):
+        keys = edge_keys(faces, np.roll(faces, -1, axis=1)).ravel()
+        order = np.argsort(keys)
+        ordered = keys[order]
+        paired = np.flatnonzero(ordered[:-1] == ordered[1:])
+        face_a, edge_a = np.divmod(order[paired], 3)
+        face_b, edge_b = np.divmod(order[paired + 1], 3)
+        pending = dirty[face_a] | dirty[face_b]
+        paired, face_a, edge_a, face_b, edge_b = (
+            part[pending] for part in (paired, face_a, edge_a, face_b, edge_b)
+        )
+
+        a = faces[face_a, edge_a]
+        b = faces[face_a, (edge_a + 1) % 3]
+        c = faces[face_a, (edge_a + 2) % 3]
+        d = faces[face_b, (edge_b + 2) % 3]
+        opposite = _angle(vertices[c], vertices[a], vertices[b]) + _angle(vertices[d], vertices[a], vertices[b])
+
+        # Yeni köşegen zaten varsa çevirme non-manifold kenar üretir
+        candidate = (opposite > np.pi + 1e-9) & (c != d)
+        diagonal = edge_keys(c, d)
+        candidate[candidate] &= ~(
+            _contains(ordered, diagonal[candidate]) | _contains(fixed_keys, diagonal[candidate])
+            | _contains(fixed_keys, ordered[paired[candidate]])
+        )
+        if not candidate.any():
+            break
+
+        # En çok iyileşen kenar, iki face'inin de en iyisiyse seçilir
+        index = np.flatnonzero(candidate)
+        rank = np.empty(len(index), dtype=np.int64)
+        rank[np.argsort(-opposite[index], kind='stable')] = np.arange(len(index))
+        best = np.full(len(faces), len(index), dtype=np.int64)
+        np.minimum.at(best, face_a[index], rank)
+        np.minimum.at(best, face_b[index], rank)
+        chosen = index[(best[face_a[index]] == rank) & (best[face_b[index]] == rank)]
+        _, unique = np.unique(edge_keys(c[chosen], d[chosen]), return_index=True)
+        chosen = chosen[unique]
+
+        dirty = np.zeros(len(faces), dtype=bool)
+        dirty[face_a[index]] = dirty[face_b[index]] = True
+        faces = faces.copy()
+        faces[face_a[chosen]] = np.column_stack([a[chosen], d[chosen], c[chosen]])
+        faces[face_b[chosen]] = np.column_stack([d[chosen], b[chosen], c[chosen]])
+    return faces
+
+
+def refine(vertices, faces, targets, fixed_keys, iterations: int = MAX_REFINE_ITERATIONS):
+    """
+    Face'leri hedef kenar boyuna kadar böl (kırmızı-yeşil)
+
+    Uzun kenarların ortasına vertex eklenir; face başına bölünen kenar
+    sayısına göre 2, 3 veya 4 üçgen üretilir, böylece komşu face'ler
+    uyumlu kalır. Sabit kenarlar (face kümesini mesh'in geri kalanına
+    bağlayan kenarlar) bölünmez ve çevrilmez; her turdan sonra kenar
+    çevirme ince üçgenleri düzeltir.
+
+    Args:
+        vertices: (V, 3) konumlar
+        faces: (F, 3) bölünecek face'ler
+        targets: (F,) face başına hedef kenar boyu
+        fixed_keys: Sıralı, tekrarsız sabit kenar anahtarları
+        iterations: En fazla bölme turu
+
+    Returns:
+        (vertices — yeniler sona eklenmiş, yeni face'ler)
+    """
+    for _ in range(int(iterations)):
+        first = faces
+        second = np.roll(faces, -1, axis=1)
+        keys = edge_keys(first, second)
+        length = np.linalg.norm(vertices[first] - vertices[second], axis=2)
+        split = (length > SPLIT_RATIO * targets[:, None]) & ~_contains(fixed_keys, keys)
+        if not split.any():
+            break
+
+        # Bir kenar bölünüyorsa iki yanındaki face için de bölünür
+        unique = np.unique(keys[split])
+        split = _contains(unique, keys)
+        position = np.searchsorted(unique, keys[split])
+        middle = np.full(faces.shape, -1, dtype=np.int64)
+        middle[split] = len(vertices) + position
+
+        _, first_index = np.unique(position, return_index=True)
+        ends_a, ends_b = first[split][first_index], second[split][first_index]
+        vertices = np.vstack([vertices, (vertices[ends_a] + vertices[ends_b]) / 2.0])
+
+        count = split.sum(axis=1)
+        created, created_targets = [faces[count == 0]], [targets[count == 0]]
+
+        # Kuralı sabit yazabilmek için face'leri döndür: tek bölünmede bölünen
+        # kenar 0., iki bölünmede bölünmeyen kenar 2. olur
+        rotation = np.where(count == 1, np.argmax(split, axis=1), (np.argmin(split, axis=1) + 1) % 3)
+        order = (rotation[:, None] + np.arange(3)) % 3
+        v = np.take_along_axis(faces, order, axis=1)
+        m = np.take_along_axis(middle, order, axis=1)
+
+        for case, rule in (
+            (1, [(0, 3, 2), (3, 1, 2)]),
+            (2, [(3, 1, 4), (0, 3, 4), (0, 4, 2)]),
+            (3, [(0, 3, 5), (3, 1, 4), (5, 4, 2), (3, 4, 5)]),
+        ):
+            selected = count == case
+            if not selected.any():
+                continue
+            corners = np.hstack([v[selected], m[selected]])
+            for triangle in rule:
+                created.append(corners[:, triangle])
+                created_targets.append(targets[selected])
+
+        faces = np.vstack(created)
+        targets = np.concatenate(created_targets)
+
+        # Üçgen sırası değişmeden kenarları çevir: hedefler face'lerle eşli kalır
+        faces = flip_edges(vertices, faces, fixed_keys)
+    return vertices, faces
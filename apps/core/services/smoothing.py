@@ -0,0 +1,204 @@
+"""
+Mesh Yumuşatma Motoru
+Seyrek Laplace operatörü bir kez kurulur, tüm iterasyonlarda yeniden kullanılır
+"""
+import numpy as np
+import trimesh
+from scipy import sparse
+
+ALGORITHMS = ('laplacian', 'taubin', 'hc', 'cotangent')
+
+# Bu dihedral açının üstündeki kenarlar keskin kabul edilir
+FEATURE_ANGLE = np.radians(40)
+
+# Taubin geçiş bandı (k_PB = 1/λ + 1/μ); 0.1 yaygın kullanılan değer
+TAUBIN_PASS_BAND = 0.1
+
+
+class SmoothingEngine:
+    """
+    Vertex komşuluğunu seyrek bir operatöre çevirip yumuşatma
+    iterasyonlarını tek bir seyrek matris-vektör çarpımına indiren sınıf.
+
+    Her iterasyon O(V + E) karmaşıklığındadır; operatör kurulumu
+    yalnızca bir kez yapılır.
+    """
+
+    def __init__(self, mesh: trimesh.Trimesh, weighting: str = 'uniform', mask: np.ndarray = None):
+        """
+        Args:
+            mesh: Yumuşatılacak trimesh nesnesi (değiştirilmez)
+            weighting: 'uniform' veya 'cotangent' kenar ağırlıkları
+            mask: Hareket edebilecek vertex'ler (None ise hepsi)
+        """
+        self.mesh = mesh
+        self.vertex_count = len(mesh.vertices)
+
+        if weighting == 'cotangent':
+            rows, cols, weights = self._cotangent_weights(mesh)
+        else:
+            edges = mesh.edges_unique
+            rows, cols = edges[:, 0], edges[:, 1]
+            weights = np.ones(len(edges))
+
+        n = self.vertex_count
+        adjacency = sparse.coo_matrix(
+            (np.concatenate([weights, weights]),
+             (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+            shape=(n, n)
+        ).tocsr()
+
+        # Satır normalize komşu ortalaması: (L v)_i = Σ w_ij v_j / Σ w_ij
+        row_sum = np.asarray(adjacency.sum(axis=1)).ravel()
+        isolated = row_sum == 0
+        inverse = np.divide(1.0, row_sum, out=np.zeros(n), where=~isolated)
+        self.average = sparse.diags(inverse) @ adjacency
+
+        # Komşusu olmayan veya kilitli vertex'ler yerinde kalır
+        self.movable = ~isolated if mask is None else (np.asarray(mask, dtype=bool) & ~isolated)
+
+    @staticmethod
+    def _cotangent_weights(mesh):
+        """Her köşenin karşı kenarına cot(açı)/2 ağırlığı"""
+        faces = mesh.faces
+        triangles = mesh.vertices[faces]
+        rows, cols, weights = [], [], []
+        for corner in range(3):
+            a = (corner + 1) % 3
+            b = (corner + 2) % 3
+            u = triangles[:, a] - triangles[:, corner]
+            v = triangles[:, b] - triangles[:, corner]
+            cross = np.linalg.norm(np.cross(u, v), axis=1)
+            cot = np.einsum('ij,ij->i', u, v) / np.maximum(cross, 1e-12)
+            rows.append(faces[:, a])
+            cols.append(faces[:, b])
+            weights.append(cot / 2.0)
+
+        # Geniş açılı üçgenlerdeki negatif ağırlıklar iterasyonu kararsız yapar
+        weights = np.maximum(np.concatenate(weights), 1e-6)
+        return np.concatenate(rows), np.concatenate(cols), weights
+
+    @staticmethod
+    def feature_mask(mesh: trimesh.Trimesh, angle: float = FEATURE_ANGLE) -> np.ndarray:
+        """
+        Keskin kenarlara değmeyen vertex'ler
+
+        Args:
+            mesh: Kaynak mesh
+            angle: Keskin kenar için dihedral açı eşiği (radyan)
+
+        Returns:
+            Vertex başına bool dizi, True = yumuşatılabilir
+        """
+        sharp = mesh.face_adjacency_edges[mesh.face_adjacency_angles > angle]
+        mask = np.ones(len(mesh.vertices), dtype=bool)
+        mask[sharp.ravel()] = False
+        return mask
+
+    def _operator(self, factor: float):
+        """v ← v + factor (L v − v) adımını tek seyrek matrise çevir"""
+        scale = np.where(self.movable, factor, 0.0)
+        identity = sparse.diags(1.0 - scale)
+        return (identity + sparse.diags(scale) @ self.average).tocsr()
+
+    def laplacian(self, iterations: int, lamb: float = 0.5) -> np.ndarray:
+        """
+        Klasik (açık zaman adımlı) Laplace yumuşatma
+
+        Returns:
+            Yeni vertex konumları (V, 3)
+        """
+        operator = self._operator(lamb)
+        vertices = np.array(self.mesh.vertices, dtype=np.float64)
+        for _ in range(int(iterations)):
+            vertices = operator @ vertices
+        return vertices
+
+    def taubin(self, iterations: int, lamb: float = 0.5, mu: float = None) -> np.ndarray:
+        """
+        Taubin λ|μ yumuşatma (hacim kaybı olmadan)
+
+        Args:
+            mu: Negatif geri şişirme katsayısı (None ise geçiş bandından)
+        """
+        if mu is None:
+            mu = -lamb / (1.0 - TAUBIN_PASS_BAND * lamb)
+        shrink = self._operator(lamb)
+        inflate = self._operator(mu)
+        vertices = np.array(self.mesh.vertices, dtype=np.float64)
+        for _ in range(int(iterations)):
+            vertices = inflate @ (shrink @ vertices)
+        return vertices
+
+    def hc(self, iterations: int, alpha: float = 0.0, beta: float = 0.5) -> np.ndarray:
+        """
+        HC (Vollmer ve ark.) yumuşatma: Laplace adımının sapmasını geri iter
+
+        Args:
+            alpha: Orijinal konuma çekme ağırlığı
+            beta: Düzeltme ağırlığı
+        """
+        original = np.array(self.mesh.vertices, dtype=np.float64)
+        vertices = original.copy()
+        movable = self.movable[:, None]
+        for _ in range(int(iterations)):
+            averaged = self.average @ vertices
+            difference = averaged - (alpha * original + (1.0 - alpha) * vertices)
+            corrected = averaged - (beta * difference + (1.0 - beta) * (self.average @ difference))
+            vertices = np.where(movable, corrected, vertices)
+        return vertices
+
+
+def smooth_vertices(mesh: trimesh.Trimesh, algorithm: str = 'laplacian', iterations: int = 10,
+                    intensity: int = 5, preserve_edges: bool = False, mask: np.ndarray = None) -> np.ndarray:
+    """
+    Seçilen algoritmayla yumuşatılmış vertex konumlarını hesapla
+
+    Args:
+        mesh: Kaynak mesh (değiştirilmez)
+        algorithm: ALGORITHMS içinden biri
+        iterations: İterasyon sayısı
+        intensity: 1-10 arası yoğunluk (adım katsayısına çevrilir)
+        preserve_edges: Keskin kenar vertex'lerini sabit tut
+        mask: Yalnızca bu vertex'ler hareket eder (None ise hepsi); bölgesel
+            yumuşatmada hacim düzeltmesi yapılmaz, bölge dışı yerinde kalır
+
+    Returns:
+        Yeni vertex konumları (V, 3)
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f'Desteklenmeyen yumuşatma algoritması: {algorithm}')
+
+    movable = mask
+    if preserve_edges:
+        features = SmoothingEngine.feature_mask(mesh)
+        movable = features if mask is None else (np.asarray(mask, dtype=bool) & features)
+    weighting = 'cotangent' if algorithm == 'cotangent' else 'uniform'
+    engine = SmoothingEngine(mesh, weighting=weighting, mask=movable)
+    lamb = float(np.clip(intensity, 1, 10)) / 10.0
+
+    if algorithm == 'taubin':
+        return engine.taubin(iterations, lamb=lamb)
+    if algorithm == 'hc':
+        return engine.hc(iterations, alpha=(1.0 - lamb) / 2.0)
+
+    vertices = engine.laplacian(iterations, lamb=lamb)
+    if mask is None and mesh.is_watertight:
+        # Laplace büzüşmesini kütle merkezi etrafında ölçekleyerek geri al;
+        # operatör afin olduğu için her iterasyonda ölçeklemeyle aynı sonucu verir
+        volume, center = _volume_center(np.asarray(mesh.vertices), mesh.faces)
+        new_volume, _ = _volume_center(vertices, mesh.faces)
+        if volume > 0 and new_volume > 0:
+            vertices = (vertices - center) * (volume / new_volume) ** (1.0 / 3.0) + center
+    return vertices
+
+
+def _volume_center(vertices, faces):
+    """Kapalı yüzeyin hacmi ve kütle merkezi (orijin tetrahedronları ile)"""
+    a, b, c = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+    det = np.einsum('ij,ij->i', a, np.cross(b, c))
+    total = det.sum()
+    if total == 0:
+        return 0.0, np.zeros(3)
+    center = (det[:, None] * (a + b + c)).sum(axis=0) / (4.0 * total)
+    return total / 6.0, center
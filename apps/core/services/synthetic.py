@@ -0,0 +1,124 @@
+"""
+Sentetik Test Mesh'leri
+Benchmark'lar için çevrimdışı, tekrarlanabilir kulak kalıbı benzeri ve torus mesh'ler
+"""
+import numpy as np
+import trimesh
+
+# Benchmark boyut kademeleri (face sayısı)
+SIZE_TIERS = (10_000, 100_000, 500_000, 2_000_000)
+
+
+def build_torus(vertex_count, seed=0):
+    """Yaklaşık vertex_count vertex'li, hafif gürültülü kapalı torus"""
+    segments = max(8, int(np.sqrt(vertex_count / 2)))
+    rings = max(8, vertex_count // segments)
+
+    u = np.linspace(0, 2 * np.pi, rings, endpoint=False)
+    v = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    uu, vv = np.meshgrid(u, v, indexing='ij')
+    rng = np.random.default_rng(seed)
+    r = 5.0 + rng.normal(0, 0.02, uu.shape)
+    vertices = np.column_stack([
+        ((20.0 + r * np.cos(vv)) * np.cos(uu)).ravel(),
+        ((20.0 + r * np.cos(vv)) * np.sin(uu)).ravel(),
+        (r * np.sin(vv)).ravel(),
+    ])
+
+    i, j = np.meshgrid(np.arange(rings), np.arange(segments), indexing='ij')
+    a = i * segments + j
+    b = ((i + 1) % rings) * segments + j
+    c = ((i + 1) % rings) * segments + (j + 1) % segments
+    d = i * segments + (j + 1) % segments
+    faces = np.vstack([
+        np.column_stack([a.ravel(), b.ravel(), c.ravel()]),
+        np.column_stack([a.ravel(), c.ravel(), d.ravel()]),
+    ])
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+def _ear_centerline(t):
+    """Kulak kanalı merkez eğrisi (mm): konka tabanından kanal ucuna kıvrılan yay"""
+    return np.column_stack([
+        6.0 * (1.0 - np.cos(1.3 * t)),
+        2.5 * np.sin(2.2 * t),
+        26.0 * t,
+    ])
+
+
+def _ear_radius(t):
+    """Kesit yarıçapı: geniş konka, daralan kanal girişi (boğaz), hafif genişleyen kanal"""
+    return (3.4
+            + 6.5 * np.exp(-(t / 0.22) ** 2)
+            - 0.6 * np.exp(-((t - 0.45) / 0.08) ** 2)
+            + 0.3 * np.sin(3.0 * np.pi * t))
+
+
+def build_ear_mold(face_count, seed=0, noise=0.02):
+    """
+    Kulak kalıbı benzeri kapalı mesh
+
+    Kıvrık bir merkez eğrisi boyunca eliptik kesitli bir tüp süpürülür;
+    tabanda geniş konka, ortada daralan kanal girişi vardır. Uçlar tek
+    kutup vertex'iyle kapatılır, yüzey tarama gürültüsü içerir.
+
+    Args:
+        face_count: Yaklaşık face sayısı
+        seed: Gürültü tohumu (aynı tohum aynı mesh'i üretir)
+        noise: Radyal gürültü standart sapması (mm)
+
+    Returns:
+        Kapalı (watertight), tutarlı yönlü trimesh nesnesi
+    """
+    # Tüp yüzeyi rings * segments * 2 face; halka aralığı kesit çevresine yakın olsun
+    segments = max(12, int(np.sqrt(face_count / 6.0)))
+    rings = max(8, (int(face_count) - 2 * segments) // (2 * segments))
+
+    # Uçlarda sık örnekleme (kapaklar yuvarlak kalsın)
+    t = (1.0 - np.cos(np.pi * (np.arange(rings) + 1) / (rings + 1))) / 2.0
+    centers = _ear_centerline(t)
+    tangents = np.gradient(centers, t, axis=0)
+    tangents /= np.linalg.norm(tangents, axis=1)[:, None]
+
+    # Merkez eğrisi z boyunca ilerlediği için x ekseniyle çerçeve kurmak güvenli
+    normals = np.cross(tangents, [1.0, 0.0, 0.0])
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+    binormals = np.cross(tangents, normals)
+
+    # Uç kapanışı: yarıçap küresel bir zarfla sıfıra iner
+    envelope = np.sqrt(np.clip(1.0 - (2.0 * t - 1.0) ** 8, 0.0, 1.0))
+    radius = _ear_radius(t) * envelope
+
+    theta = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    rng = np.random.default_rng(seed)
+    r = radius[:, None] * (1.0 + rng.normal(0, noise, (rings, segments)) / max(radius.max(), 1e-9))
+    ring_points = (
+        centers[:, None, :]
+        + (r * 1.25 * np.cos(theta))[:, :, None] * binormals[:, None, :]
+        + (r * np.sin(theta))[:, :, None] * normals[:, None, :]
+    )
+
+    vertices = np.vstack([
+        ring_points.reshape(-1, 3),
+        _ear_centerline(np.array([0.0, 1.0])),
+    ])
+    bottom, top = rings * segments, rings * segments + 1
+
+    i, j = np.meshgrid(np.arange(rings - 1), np.arange(segments), indexing='ij')
+    a = i * segments + j
+    b = (i + 1) * segments + j
+    c = (i + 1) * segments + (j + 1) % segments
+    d = i * segments + (j + 1) % segments
+    k = np.arange(segments)
+    last = (rings - 1) * segments
+    faces = np.vstack([
+        np.column_stack([a.ravel(), d.ravel(), c.ravel()]),
+        np.column_stack([a.ravel(), c.ravel(), b.ravel()]),
+        np.column_stack([np.full(segments, bottom), (k + 1) % segments, k]),
+        np.column_stack([np.full(segments, top), last + k, last + (k + 1) % segments]),
+    ])
+
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    if mesh.volume < 0:
+        mesh.invert()
+    return mesh
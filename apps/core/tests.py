@@ -1,3 +1,130 @@
-from django.test import TestCase
+import os
+import tempfile
 
-# Create your tests here.
+import numpy as np
+import trimesh
+from django.test import SimpleTestCase
+
+from apps.core.services import mesh_format
+from apps.core.services.raycast import GridRayCaster
+
+
+def reference_distances(mesh, origins, directions):
+    """trimesh'in kendi ışın izleyicisiyle ilk kesişim mesafeleri (yoksa inf)"""
+    locations, rays, _ = mesh.ray.intersects_location(origins, directions, multiple_hits=False)
+    distances = np.full(len(origins), np.inf)
+    distances[rays] = np.linalg.norm(locations - origins[rays], axis=1)
+    return distances
+
+
+class GridRayCasterTests(SimpleTestCase):
+    """GridRayCaster sonuçları mesh.ray ile aynı olmalı"""
+
+    def assertMatchesReference(self, mesh, origins, directions, **kwargs):
+        distances, faces = GridRayCaster(mesh).first_hit(origins, directions, **kwargs)
+        expected = reference_distances(mesh, origins, directions)
+
+        np.testing.assert_array_equal(np.isfinite(distances), np.isfinite(expected))
+        hit = np.isfinite(expected)
+        np.testing.assert_allclose(distances[hit], expected[hit], atol=1e-5)
+        self.assertTrue((faces[hit] >= 0).all())
+        self.assertTrue((faces[~hit] == -1).all())
+
+    def test_icosphere_vertices_and_edges(self):
+        # Merkezden köşelere ve kenar ortalarına: ışınlar tam üçgen sınırlarından geçer
+        sphere = trimesh.creation.icosphere(subdivisions=4)
+        directions = np.vstack([sphere.vertices, sphere.vertices[sphere.edges_unique].mean(axis=1)])
+        origins = np.zeros_like(directions)
+
+        self.assertMatchesReference(sphere, origins, directions)
+        self.assertMatchesReference(sphere, origins, directions, inside_only=True)
+
+    def test_annulus_vertices_and_edges(self):
+        # Eksen üzerinden iç duvarın köşelerine ve kenar ortalarına
+        annulus = trimesh.creation.annulus(r_min=1.0, r_max=2.0, height=1.0, sections=64)
+        inner = annulus.vertices[np.linalg.norm(annulus.vertices[:, :2], axis=1) < 1.5]
+        targets = np.vstack([inner, (inner + np.roll(inner, 2, axis=0)) / 2.0])
+        origins = np.column_stack([np.zeros((len(targets), 2)), targets[:, 2] * 0.5])
+        directions = targets - origins
+
+        self.assertMatchesReference(annulus, origins, directions)
+
+    def test_misses(self):
+        sphere = trimesh.creation.icosphere(subdivisions=2)
+        origins = np.array([[0.0, 0.0, 5.0], [3.0, 0.0, 0.0]])
+        directions = np.array([[0.0, 0.0, 1.0], [0.0, 1.0, 0.0]])
+
+        distances, faces = GridRayCaster(sphere).first_hit(origins, directions)
+        self.assertTrue(np.isinf(distances).all())
+        self.assertTrue((faces == -1).all())
+
+    def test_misses_through_occupied_cells(self):
+        # Torus deliğinden ve yüzeyler arasından geçen ışınlar dolu hücrelere girer ama çarpmaz
+        torus = trimesh.creation.torus(major_radius=10.0, minor_radius=3.0)
+        rng = np.random.default_rng(0)
+        # Izgara mesh'in sınır kutusunu kaplar; başlangıçlar kutunun içinde
+        origins = rng.uniform(torus.bounds[0] * 0.95, torus.bounds[1] * 0.95, (2000, 3))
+        directions = rng.normal(size=(2000, 3))
+
+        distances, faces = GridRayCaster(torus).first_hit(origins, directions)
+        expected = reference_distances(torus, origins, directions / np.linalg.norm(directions, axis=1)[:, None])
+        miss = ~np.isfinite(distances)
+        self.assertTrue(miss.any())
+        np.testing.assert_array_equal(miss, ~np.isfinite(expected))
+        self.assertTrue((faces[miss] == -1).all())
+        self.assertTrue((faces[~miss] >= 0).all())
+
+    def test_max_distance_miss_has_no_face(self):
+        sphere = trimesh.creation.icosphere(subdivisions=3, radius=10.0)
+        origins = np.zeros((3, 3))
+        directions = np.eye(3)
+
+        distances, faces = GridRayCaster(sphere).first_hit(origins, directions, max_distance=5.0)
+        self.assertTrue(np.isinf(distances).all())
+        self.assertTrue((faces == -1).all())
+
+
+class MeshFormatTests(SimpleTestCase):
+    """Kompakt .nwm dosyası mesh'i kayıpsız (float32) geri vermeli"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=f'.{mesh_format.EXTENSION}')
+        os.close(handle)
+        self.addCleanup(os.unlink, self.path)
+        self.mesh = trimesh.creation.annulus(r_min=1.0, r_max=2.0, height=1.0, sections=32)
+
+    def write(self, mesh):
+        with open(self.path, 'wb') as f:
+            mesh_format.write_mesh(mesh, f)
+
+    def test_round_trip(self):
+        self.write(self.mesh)
+        loaded = mesh_format.load_mesh(self.path)
+
+        np.testing.assert_array_equal(loaded.vertices, self.mesh.vertices.astype(np.float32))
+        np.testing.assert_array_equal(loaded.faces, self.mesh.faces)
+        self.assertTrue(loaded.is_watertight)
+        self.assertAlmostEqual(loaded.volume, self.mesh.volume, places=4)
+
+    def test_export_file_round_trip(self):
+        exported = mesh_format.export_file(self.mesh, max_memory_size=1024)
+        with open(self.path, 'wb') as f:
+            f.write(exported.read())
+
+        vertices, faces = mesh_format.read_arrays(self.path)
+        self.assertEqual(vertices.shape, (len(self.mesh.vertices), 3))
+        np.testing.assert_array_equal(faces, self.mesh.faces)
+
+    def test_empty_mesh(self):
+        self.write(trimesh.Trimesh())
+        vertices, faces = mesh_format.read_arrays(self.path)
+        self.assertEqual((len(vertices), len(faces)), (0, 0))
+
+    def test_rejects_foreign_file(self):
+        self.mesh.export(self.path, file_type='stl')
+        with self.assertRaises(ValueError):
+            mesh_format.read_arrays(self.path)
+
+    def test_is_compact(self):
+        self.assertTrue(mesh_format.is_compact('model.NWM'))
+        self.assertFalse(mesh_format.is_compact('model.stl'))
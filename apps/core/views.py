@@ -1,5 +1,9 @@
+from django.http import JsonResponse
 from django.shortcuts import render
 
+from apps.models.models import ModelAnalysis, ProcessingStep
+from .services.profiling import summarize
+
 
 def index(request):
     """Ana sayfa"""
@@ -9,3 +13,31 @@ def index(request):
 def about(request):
     """Hakkında sayfası"""
     return render(request, 'core/about.html')
+
+
+def metrics(request):
+    """
+    İşlem ve analiz aşama süreleri özeti (API endpoint)
+    
+    Son ?limit=N (varsayılan 200) kayıt üzerinden işlem tipi başına
+    yükleme/işlem/export/storage sürelerinin ortalama, p50, p95 ve
+    en yüksek değerlerini döndürür.
+    """
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 200)), 5000))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Geçersiz limit'}, status=400)
+    
+    steps = ProcessingStep.objects.exclude(metrics={}).order_by('-created_at')
+    processing = {}
+    for step_type, _ in ProcessingStep.STEP_TYPES:
+        recent = steps.filter(step_type=step_type).values_list('metrics', flat=True)[:limit]
+        summary = summarize(recent)
+        if summary['count']:
+            processing[step_type] = summary
+    
+    analyses = ModelAnalysis.objects.exclude(metrics={}).order_by('-updated_at')
+    return JsonResponse({
+        'processing': processing,
+        'analysis': summarize(analyses.values_list('metrics', flat=True)[:limit]),
+    })
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Project, Model3D, ModelAnalysis, ProcessingStep, ProcessedModel
+from .models import Project, Model3D, ModelAnalysis, ProcessingStep, ProcessingJob, MeshLOD, ProcessedModel
 
 
 @admin.register(Project)
@@ -35,6 +35,20 @@ class ProcessingStepAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
 
 
+@admin.register(ProcessingJob)
+class ProcessingJobAdmin(admin.ModelAdmin):
+    list_display = ('model', 'step_type', 'status', 'progress', 'worker', 'created_at', 'finished_at')
+    list_filter = ('step_type', 'status', 'created_at')
+    search_fields = ('model__name',)
+    date_hierarchy = 'created_at'
+
+
+@admin.register(MeshLOD)
+class MeshLODAdmin(admin.ModelAdmin):
+    list_display = ('model', 'ratio', 'faces_count', 'source_digest', 'updated_at')
+    search_fields = ('model__name',)
+
+
 @admin.register(ProcessedModel)
 class ProcessedModelAdmin(admin.ModelAdmin):
     list_display = ('original_model', 'final_vertices_count', 'final_faces_count', 'quality_score', 'is_printable', 'created_at')
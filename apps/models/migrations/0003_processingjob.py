@@ -0,0 +1,38 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0002_alter_processingstep_result_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessingJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('step_type', models.CharField(choices=[('rotation', 'Döndürme'), ('cutting', 'Kesme'), ('fill_holes', 'Delik Doldurma'), ('smoothing', 'Yumuşatma'), ('ovalization', 'Ovalleştirme'), ('bulging', 'Bombeleştirme'), ('drilling', 'Delik Delme')], max_length=20, verbose_name='İşlem Tipi')),
+                ('parameters', models.JSONField(verbose_name='Parametreler')),
+                ('status', models.CharField(choices=[('queued', 'Sırada'), ('running', 'Çalışıyor'), ('completed', 'Tamamlandı'), ('failed', 'Başarısız'), ('cancelled', 'İptal Edildi')], db_index=True, default='queued', max_length=20, verbose_name='Durum')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='İlerleme (%)')),
+                ('message', models.CharField(blank=True, max_length=255, verbose_name='Durum Mesajı')),
+                ('error_message', models.TextField(blank=True, verbose_name='Hata Mesajı')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='processing_jobs', to='models.model3d')),
+                ('step', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='models.processingstep', verbose_name='Oluşan Adım')),
+            ],
+            options={
+                'verbose_name': 'İşleme Görevi',
+                'verbose_name_plural': 'İşleme Görevleri',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
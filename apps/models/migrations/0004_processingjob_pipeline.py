@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0003_processingjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='processingjob',
+            name='step_type',
+            field=models.CharField(choices=[('rotation', 'Döndürme'), ('cutting', 'Kesme'), ('fill_holes', 'Delik Doldurma'), ('smoothing', 'Yumuşatma'), ('ovalization', 'Ovalleştirme'), ('bulging', 'Bombeleştirme'), ('drilling', 'Delik Delme'), ('pipeline', 'İşlem Zinciri')], max_length=20, verbose_name='İşlem Tipi'),
+        ),
+    ]
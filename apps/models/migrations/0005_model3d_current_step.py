@@ -0,0 +1,19 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0004_processingjob_pipeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='model3d',
+            name='current_step',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='models.processingstep', verbose_name='Güncel Adım'),
+        ),
+    ]
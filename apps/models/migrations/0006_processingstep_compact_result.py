@@ -0,0 +1,20 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:32
+
+import apps.models.models
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0005_model3d_current_step'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='processingstep',
+            name='result_file',
+            field=models.FileField(blank=True, null=True, upload_to=apps.models.models.upload_to_processed, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['stl', 'ply', 'nwm'])], verbose_name='Sonuç Dosyası'),
+        ),
+    ]
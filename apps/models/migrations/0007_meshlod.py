@@ -0,0 +1,35 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:36
+
+import apps.models.models
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0006_processingstep_compact_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeshLOD',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('ratio', models.FloatField(verbose_name='Face Oranı')),
+                ('file', models.FileField(upload_to=apps.models.models.upload_to_lod, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['nwm'])], verbose_name='Önizleme Dosyası')),
+                ('faces_count', models.IntegerField(verbose_name='Face Sayısı')),
+                ('source_digest', models.CharField(max_length=64, verbose_name='Kaynak Mesh Özeti')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lods', to='models.model3d')),
+            ],
+            options={
+                'verbose_name': 'Önizleme Seviyesi',
+                'verbose_name_plural': 'Önizleme Seviyeleri',
+                'ordering': ['ratio'],
+                'unique_together': {('model', 'ratio')},
+            },
+        ),
+    ]
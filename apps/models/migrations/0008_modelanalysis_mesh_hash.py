@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0007_meshlod'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelanalysis',
+            name='mesh_hash',
+            field=models.CharField(blank=True, max_length=64, verbose_name='Mesh Özeti'),
+        ),
+        migrations.AddField(
+            model_name='modelanalysis',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-18 07:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0008_modelanalysis_mesh_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelanalysis',
+            name='metrics',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Ölçümler'),
+        ),
+        migrations.AddField(
+            model_name='processingstep',
+            name='metrics',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Ölçümler'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-18 08:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0009_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelanalysis',
+            name='min_wall_thickness',
+            field=models.FloatField(blank=True, null=True, verbose_name='En İnce Duvar (mm)'),
+        ),
+        migrations.AddField(
+            model_name='modelanalysis',
+            name='wall_thickness',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Duvar Kalınlığı'),
+        ),
+    ]
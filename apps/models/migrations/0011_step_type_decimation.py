@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-18 08:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0010_modelanalysis_wall_thickness'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='processingjob',
+            name='step_type',
+            field=models.CharField(choices=[('rotation', 'Döndürme'), ('cutting', 'Kesme'), ('fill_holes', 'Delik Doldurma'), ('smoothing', 'Yumuşatma'), ('ovalization', 'Ovalleştirme'), ('bulging', 'Bombeleştirme'), ('drilling', 'Delik Delme'), ('decimation', 'Seyreltme'), ('pipeline', 'İşlem Zinciri')], max_length=20, verbose_name='İşlem Tipi'),
+        ),
+        migrations.AlterField(
+            model_name='processingstep',
+            name='step_type',
+            field=models.CharField(choices=[('rotation', 'Döndürme'), ('cutting', 'Kesme'), ('fill_holes', 'Delik Doldurma'), ('smoothing', 'Yumuşatma'), ('ovalization', 'Ovalleştirme'), ('bulging', 'Bombeleştirme'), ('drilling', 'Delik Delme'), ('decimation', 'Seyreltme')], max_length=20, verbose_name='İşlem Tipi'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-18 08:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def link_history(apps, schema_editor):
+    """Mevcut doğrusal geçmişi zincire çevir; dosyalı adımlar keyframe kalır"""
+    ProcessingStep = apps.get_model('models', 'ProcessingStep')
+    parent_by_model = {}
+    for step in ProcessingStep.objects.order_by('created_at'):
+        step.parent_id = parent_by_model.get(step.model_id)
+        step.is_keyframe = bool(step.result_file)
+        step.save(update_fields=['parent', 'is_keyframe'])
+        parent_by_model[step.model_id] = step.id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0011_step_type_decimation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processingstep',
+            name='is_keyframe',
+            field=models.BooleanField(default=False, verbose_name='Keyframe mi?'),
+        ),
+        migrations.AddField(
+            model_name='processingstep',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='models.processingstep', verbose_name='Önceki Adım'),
+        ),
+        migrations.RunPython(link_history, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.23 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0013_processingjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelanalysis',
+            name='snapshots',
+            field=models.JSONField(blank=True, default=list, verbose_name='Önceki Sonuçlar'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='meshlod',
+            unique_together={('model', 'ratio', 'source_digest')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0016_processingjob_lod'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='processingjob',
+            name='step_type',
+            field=models.CharField(choices=[('rotation', 'Döndürme'), ('cutting', 'Kesme'), ('fill_holes', 'Delik Doldurma'), ('smoothing', 'Yumuşatma'), ('ovalization', 'Ovalleştirme'), ('bulging', 'Bombeleştirme'), ('drilling', 'Delik Delme'), ('decimation', 'Seyreltme'), ('pipeline', 'İşlem Zinciri'), ('analysis', 'Analiz'), ('lod', 'Önizleme Seviyeleri'), ('checkout', 'Sürüm Değiştirme')], max_length=20, verbose_name='İşlem Tipi'),
+        ),
+    ]
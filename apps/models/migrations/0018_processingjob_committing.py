@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0017_processingjob_checkout'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='processingjob',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Sırada'), ('running', 'Çalışıyor'), ('committing', 'Kaydediliyor'), ('completed', 'Tamamlandı'), ('failed', 'Başarısız'), ('cancelled', 'İptal Edildi')], db_index=True, default='queued', max_length=20, verbose_name='Durum'),
+        ),
+    ]
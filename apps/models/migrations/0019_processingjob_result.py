@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-18 09:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models', '0018_processingjob_committing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processingjob',
+            name='result',
+            field=models.JSONField(blank=True, null=True, verbose_name='Sonuç'),
+        ),
+        migrations.AlterField(
+            model_name='processingjob',
+            name='model',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='processing_jobs', to='models.model3d'),
+        ),
+        migrations.AlterField(
+            model_name='processingjob',
+            name='step_type',
+            field=models.CharField(choices=[('rotation', 'Döndürme'), ('cutting', 'Kesme'), ('fill_holes', 'Delik Doldurma'), ('smoothing', 'Yumuşatma'), ('ovalization', 'Ovalleştirme'), ('bulging', 'Bombeleştirme'), ('drilling', 'Delik Delme'), ('decimation', 'Seyreltme'), ('pipeline', 'İşlem Zinciri'), ('analysis', 'Toplu Analiz'), ('lod', 'Önizleme Seviyeleri'), ('checkout', 'Sürüm Değiştirme')], max_length=20, verbose_name='İşlem Tipi'),
+        ),
+    ]
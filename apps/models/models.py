@@ -54,6 +54,14 @@ class Model3D(models.Model):
     file_size = models.BigIntegerField(verbose_name='Dosya Boyutu (bytes)')
     uploaded_at = models.DateTimeField(auto_now_add=True)
     is_processed = models.BooleanField(default=False, verbose_name='İşlendi mi?')
+    current_step = models.ForeignKey(
+        'ProcessingStep',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name='Güncel Adım'
+    )
     
     class Meta:
         verbose_name = '3D Model'
@@ -63,6 +71,19 @@ class Model3D(models.Model):
     def __str__(self):
         return self.name
     
+    @property
+    def current_file(self):
+        """
+        Modelin güncel hali: son işlem adımının sonuç dosyası, yoksa orijinal dosya
+        
+        İşlem sonuçları orijinal dosyanın üzerine kopyalanmaz; bu yüzden
+        orijinal tarama her zaman korunur. Güncel adım geri alma/yineleme
+        ile değiştirilmeden önce dosyası kurulur (processing.versions).
+        """
+        if self.current_step_id and self.current_step.result_file:
+            return self.current_step.result_file
+        return self.original_file
+    
     def save(self, *args, **kwargs):
         if self.original_file:
             # Dosya formatını otomatik belirle
@@ -107,7 +128,19 @@ class ModelAnalysis(models.Model):
     # Topology
     topology_status = models.CharField(max_length=20, choices=TOPOLOGY_CHOICES, verbose_name='Topoloji Durumu')
     
+    # Duvar kalınlığı (içe atılan ışınlar): özet ve hızlı sorgu için en ince değer
+    wall_thickness = models.JSONField(default=dict, blank=True, verbose_name='Duvar Kalınlığı')
+    min_wall_thickness = models.FloatField(null=True, blank=True, verbose_name='En İnce Duvar (mm)')
+    
+    # Analizin ait olduğu mesh içeriği; model değişince sonuçlar bayatlar
+    mesh_hash = models.CharField(max_length=64, blank=True, verbose_name='Mesh Özeti')
+    metrics = models.JSONField(default=dict, blank=True, verbose_name='Ölçümler')
+    # Son sürümlerin sonuçları [{'mesh_hash', 'fields', 'metrics'}]; geri
+    # alma/yinelemede yeniden hesaplamadan geri yüklenir
+    snapshots = models.JSONField(default=list, blank=True, verbose_name='Önceki Sonuçlar')
+    
     analyzed_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = 'Model Analizi'
@@ -134,21 +167,36 @@ class ProcessingStep(models.Model):
         ('ovalization', 'Ovalleştirme'),
         ('bulging', 'Bombeleştirme'),
         ('drilling', 'Delik Delme'),
+        ('decimation', 'Seyreltme'),
     ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     model = models.ForeignKey(Model3D, on_delete=models.CASCADE, related_name='processing_steps')
+    # Adımın uygulandığı sürüm; None ise orijinal tarama
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        related_name='children',
+        null=True,
+        blank=True,
+        verbose_name='Önceki Adım'
+    )
     step_type = models.CharField(max_length=20, choices=STEP_TYPES, verbose_name='İşlem Tipi')
     parameters = models.JSONField(verbose_name='Parametreler')
     result_file = models.FileField(
         upload_to=upload_to_processed,
-        validators=[FileExtensionValidator(allowed_extensions=['stl', 'ply'])],
+        validators=[FileExtensionValidator(allowed_extensions=['stl', 'ply', 'nwm'])],
         verbose_name='Sonuç Dosyası',
         null=True,
         blank=True
     )
+    # Keyframe dosyaları budanmaz; aradaki sürümler en yakın keyframe'den
+    # parametreler yeniden oynatılarak kurulabilir
+    is_keyframe = models.BooleanField(default=False, verbose_name='Keyframe mi?')
     created_at = models.DateTimeField(auto_now_add=True)
     execution_time = models.FloatField(verbose_name='Çalışma Süresi (saniye)')
+    # Aşama süreleri, bellek tepe değeri, mesh boyutları (core.services.profiling)
+    metrics = models.JSONField(default=dict, blank=True, verbose_name='Ölçümler')
     success = models.BooleanField(default=True, verbose_name='Başarılı mı?')
     error_message = models.TextField(blank=True, verbose_name='Hata Mesajı')
     
@@ -161,6 +209,102 @@ class ProcessingStep(models.Model):
         return f"{self.get_step_type_display()} - {self.model.name}"
 
 
+class ProcessingJob(models.Model):
+    """Arka planda çalışan işleme görevi (veritabanı kuyruğu)"""
+    STATUS_CHOICES = [
+        ('queued', 'Sırada'),
+        ('running', 'Çalışıyor'),
+        # Sonuç kaydediliyor; bu aşamada iptal kabul edilmez
+        ('committing', 'Kaydediliyor'),
+        ('completed', 'Tamamlandı'),
+        ('failed', 'Başarısız'),
+        ('cancelled', 'İptal Edildi'),
+    ]
+    # Worker'da çalışan ve henüz bitmemiş görevler
+    ACTIVE_STATUSES = ['queued', 'running', 'committing']
+    
+    JOB_TYPES = ProcessingStep.STEP_TYPES + [
+        ('pipeline', 'İşlem Zinciri'),
+        # İşlem adımı üretmezler; modelin güncel hali üzerinde çalışırlar
+        ('analysis', 'Toplu Analiz'),
+        ('lod', 'Önizleme Seviyeleri'),
+        ('checkout', 'Sürüm Değiştirme'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Birden çok modeli işleyen görevlerde (toplu analiz) boş
+    model = models.ForeignKey(
+        Model3D, on_delete=models.CASCADE, related_name='processing_jobs', null=True, blank=True
+    )
+    step_type = models.CharField(max_length=20, choices=JOB_TYPES, verbose_name='İşlem Tipi')
+    parameters = models.JSONField(verbose_name='Parametreler')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', db_index=True, verbose_name='Durum')
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name='İlerleme (%)')
+    message = models.CharField(max_length=255, blank=True, verbose_name='Durum Mesajı')
+    step = models.ForeignKey(
+        ProcessingStep,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name='Oluşan Adım'
+    )
+    error_message = models.TextField(blank=True, verbose_name='Hata Mesajı')
+    # Adım üretmeyen görevlerin özeti (ör. toplu analiz verimi)
+    result = models.JSONField(null=True, blank=True, verbose_name='Sonuç')
+    worker = models.CharField(max_length=100, blank=True, verbose_name='Worker')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Worker her ilerleme yazımında günceller; eskiyen görev çökmüş sayılır
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'İşleme Görevi'
+        verbose_name_plural = 'İşleme Görevleri'
+        ordering = ['created_at']
+    
+    def __str__(self):
+        target = self.model.name if self.model_id else f"{len(self.parameters.get('model_ids', []))} model"
+        return f"{self.get_step_type_display()} ({self.get_status_display()}) - {target}"
+    
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed', 'cancelled')
+
+
+def upload_to_lod(instance, filename):
+    """Önizleme (LOD) dosyaları için upload path"""
+    ext = filename.split('.')[-1]
+    filename = f"lod_{instance.model_id}_{int(instance.ratio * 100)}_{uuid.uuid4()}.{ext}"
+    return os.path.join('lods', filename)
+
+
+class MeshLOD(models.Model):
+    """Modelin seyreltilmiş önizleme seviyesi"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    model = models.ForeignKey(Model3D, on_delete=models.CASCADE, related_name='lods')
+    ratio = models.FloatField(verbose_name='Face Oranı')
+    file = models.FileField(
+        upload_to=upload_to_lod,
+        validators=[FileExtensionValidator(allowed_extensions=['nwm'])],
+        verbose_name='Önizleme Dosyası'
+    )
+    faces_count = models.IntegerField(verbose_name='Face Sayısı')
+    source_digest = models.CharField(max_length=64, verbose_name='Kaynak Mesh Özeti')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Önizleme Seviyesi'
+        verbose_name_plural = 'Önizleme Seviyeleri'
+        ordering = ['ratio']
+        # Her sürümün (mesh özeti) kendi seviyeleri
+        unique_together = [('model', 'ratio', 'source_digest')]
+    
+    def __str__(self):
+        return f"%{self.ratio * 100:g} - {self.model.name}"
+
+
 def upload_to_exports(instance, filename):
     """Export dosyalar için upload path"""
     return os.path.join('exports', filename)
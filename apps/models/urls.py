@@ -7,6 +7,7 @@ urlpatterns = [
     path('', views.model_list, name='model_list'),
     path('upload/', views.model_upload, name='model_upload'),
     path('<uuid:model_id>/', views.model_detail, name='model_detail'),
+    path('<uuid:model_id>/download/', views.model_download, name='model_download'),
     path('<uuid:model_id>/delete/', views.model_delete, name='model_delete'),
 ]
 
@@ -1,6 +1,7 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, FileResponse
 from .models import Model3D, Project
 import os
 
@@ -33,11 +34,25 @@ def model_upload(request):
             model.save()
             
             messages.success(request, f'Model başarıyla yüklendi: {model.name}')
+            
+            # Görüntüleyicinin önce yükleyeceği önizleme seviyeleri worker'da
+            # üretilir; o zamana kadar tam çözünürlük gösterilir. Bütçe
+            # verilirse görev face sayısını denetler ve bütçeyi aşan taramayı
+            # önce kayıtlı bir seyreltme adımıyla bütçeye indirir
+            from apps.processing.jobs import enqueue_job
+            parameters = {}
+            if request.POST.get('normalize'):
+                parameters['face_budget'] = settings.UPLOAD_FACE_BUDGET
+                messages.info(
+                    request,
+                    f'{settings.UPLOAD_FACE_BUDGET:,} face bütçesini aşan tarama arka planda seyreltilecek.'
+                )
+            enqueue_job(model, 'lod', parameters)
             return redirect('models:model_detail', model_id=model.id)
         else:
             messages.error(request, 'Lütfen bir dosya seçin.')
     
-    return render(request, 'models/model_upload.html')
+    return render(request, 'models/model_upload.html', {'face_budget': settings.UPLOAD_FACE_BUDGET})
 
 
 def model_detail(request, model_id):
@@ -46,6 +61,20 @@ def model_detail(request, model_id):
     return render(request, 'models/model_detail.html', {'model': model})
 
 
+def model_download(request, model_id):
+    """Modelin güncel halini STL olarak indir (diğer formatlar STL'e çevrilir)"""
+    model = get_object_or_404(Model3D, id=model_id)
+    current = model.current_file
+    filename = (os.path.splitext(model.name)[0] or str(model.id)) + '.stl'
+    
+    if current.name.lower().endswith('.stl'):
+        return FileResponse(current.open('rb'), as_attachment=True, filename=filename)
+    
+    from apps.processing.services import ModelProcessor
+    stl_file = ModelProcessor(current.path).export_file(file_type='stl')
+    return FileResponse(stl_file, as_attachment=True, filename=filename)
+
+
 def model_delete(request, model_id):
     """Model silme"""
     model = get_object_or_404(Model3D, id=model_id)
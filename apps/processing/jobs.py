@@ -0,0 +1,468 @@
+"""
+Veritabanı tabanlı işleme kuyruğu
+Görev ekleme, worker tarafından sahiplenme, çalıştırma ve iptal
+"""
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.analysis.services.incremental import restore_analysis, update_analysis
+from apps.core.services import mesh_format
+from apps.core.services.mesh_cache import mesh_cache
+from apps.core.services.profiling import PhaseTimer, mesh_size, profiled
+from apps.models.models import Model3D, ProcessingJob, ProcessingStep
+from apps.visualization.services.lod import update_lods
+from .operations import get_operation
+from .versions import VersionTree, checkout_step, is_keyframe_due, prune_artifacts
+
+
+class JobCancelled(Exception):
+    """Görev çalışırken iptal edildi"""
+
+
+def enqueue_job(model, step_type, parameters):
+    """
+    Yeni işleme görevini kuyruğa ekle
+
+    Args:
+        model: İşlenecek Model3D (toplu görevlerde None)
+        step_type: ProcessingJob.JOB_TYPES içindeki görev tipi
+        parameters: Ayrıştırılmış operasyon parametreleri
+
+    Returns:
+        Oluşturulan ProcessingJob
+    """
+    if step_type not in MODEL_JOBS and step_type not in BATCH_JOBS:
+        for operation in job_operations(step_type, parameters):
+            get_operation(operation['step_type'])
+    return ProcessingJob.objects.create(
+        model=model,
+        step_type=step_type,
+        parameters=parameters,
+        message='Sırada bekliyor'
+    )
+
+
+def job_operations(step_type, parameters):
+    """Görevi sıralı [{'step_type', 'parameters'}] listesine çevir"""
+    if step_type == 'pipeline':
+        return parameters['operations']
+    return [{'step_type': step_type, 'parameters': parameters}]
+
+
+def cancel_job(job):
+    """
+    Görevi iptal et
+
+    Sıradaki görev hemen iptal edilir. Çalışan görev iptal olarak
+    işaretlenir ve worker bir sonraki aşama geçişinde sonucu atar.
+    Sonucunu kaydetmeye başlamış ('committing') görev iptal edilemez.
+
+    Returns:
+        bool: İptal işaretlendi mi?
+    """
+    updated = ProcessingJob.objects.filter(
+        pk=job.pk,
+        status__in=['queued', 'running']
+    ).update(
+        status='cancelled',
+        message='İptal edildi',
+        finished_at=timezone.now()
+    )
+    return updated == 1
+
+
+def recover_stale_jobs():
+    """
+    Çöken worker'dan kalan görevleri başarısız işaretle
+
+    Çalışan görev her ilerleme yazımında heartbeat_at'i günceller.
+    PROCESSING_JOB_STALE_SECONDS boyunca sinyal gelmeyen görev (worker
+    süreci öldürülmüş, makine yeniden başlamış) yeniden kuyruğa
+    alınmaz: aynı görev yeniden çökebilir ve sonuç kaydedilmiş olabilir.
+    Başarısız işaretlenince modelin sıradaki görevleri çalışabilir.
+
+    Returns:
+        Kurtarılan görev sayısı
+    """
+    limit = timezone.now() - timedelta(seconds=getattr(settings, 'PROCESSING_JOB_STALE_SECONDS', 1800))
+    return ProcessingJob.objects.filter(status__in=['running', 'committing']).filter(
+        Q(heartbeat_at__lt=limit) | Q(heartbeat_at__isnull=True, started_at__lt=limit)
+    ).update(
+        status='failed',
+        error_message='Worker yanıt vermedi (süre aşımı)',
+        message='Başarısız',
+        finished_at=timezone.now()
+    )
+
+
+def claim_next_job(worker_name):
+    """
+    Sıradaki ilk görevi atomik olarak sahiplen
+
+    Sahiplenme koşullu UPDATE ile yapılır; aynı görevi iki worker
+    alamaz. Bu yüzden ayrı bir broker gerekmez. Aynı modelin görevleri
+    sırayla çalışır: modelin çalışan veya daha önce sıraya girmiş bir
+    görevi varsa görev atlanır (her görev bir önceki sürüme uygulanır,
+    eşzamanlı iki görev birbirinin sonucunu geçmişten düşürürdü).
+
+    Returns:
+        ProcessingJob veya None
+    """
+    recover_stale_jobs()
+    blocked = ProcessingJob.objects.filter(model=OuterRef('model')).filter(
+        Q(status__in=['running', 'committing']) | Q(status='queued', created_at__lt=OuterRef('created_at'))
+    )
+    candidates = ProcessingJob.objects.filter(status='queued').exclude(Exists(blocked)).order_by('created_at')
+    for job_id, model_id in candidates.values_list('id', 'model_id')[:10]:
+        with transaction.atomic():
+            # Aynı modelde eşzamanlı sahiplenmeyi model satırı kilidi
+            # (PostgreSQL) ve tek UPDATE deyimi (SQLite) önler
+            list(Model3D.objects.select_for_update().filter(pk=model_id).values_list('pk'))
+            now = timezone.now()
+            claimed = ProcessingJob.objects.filter(pk=job_id, status='queued').exclude(
+                Exists(blocked)
+            ).update(
+                status='running',
+                worker=worker_name,
+                started_at=now,
+                heartbeat_at=now,
+                message='Başlatıldı'
+            )
+        if claimed:
+            return ProcessingJob.objects.select_related('model').get(pk=job_id)
+    return None
+
+
+def default_worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class JobReporter:
+    """Görev ilerlemesini veritabanına yazan ve iptali denetleyen yardımcı"""
+
+    def __init__(self, job):
+        self.job = job
+
+    def __call__(self, progress, message, cancellable=True, commit=False):
+        """
+        İlerlemeyi ve heartbeat'i yaz
+
+        Args:
+            cancellable: False ise iptal denetlenmez (sonuç kaydedildikten
+                sonraki aşamalar yarıda kesilmez)
+            commit: True ise görev kayıt aşamasına ('committing') geçer;
+                iptal bu geçişten önce kabul edildiyse JobCancelled
+        """
+        jobs = ProcessingJob.objects.filter(pk=self.job.pk)
+        fields = {'progress': progress, 'message': message, 'heartbeat_at': timezone.now()}
+        if commit:
+            jobs = jobs.filter(status='running')
+            fields['status'] = 'committing'
+        elif cancellable:
+            jobs = jobs.filter(status='running')
+        updated = jobs.update(**fields)
+        if (commit or cancellable) and not updated:
+            raise JobCancelled()
+
+
+def _silent_report(progress, message, cancellable=True, commit=False):
+    """Görev dışında (komut, test) çağrılan işler için boş ilerleme callback'i"""
+
+
+def execute_pipeline(model, operations, report=None):
+    """
+    İşlemleri tek bir bellek içi mesh üzerinde sırayla uygula
+
+    Model bir kez yüklenir, yalnızca son mesh diske yazılır. Her işlem
+    için kendi süresiyle bir ProcessingStep kaydı oluşturulur ve bir
+    öncekine (ilki modelin güncel adımına) bağlanır; sonuç dosyası son
+    adıma bağlanır. Aşama süreleri (yükleme, işlem, export,
+    storage yazımı) ve mesh boyutları adımların metrics alanına yazılır.
+
+    Args:
+        model: İşlenecek Model3D
+        operations: [{'step_type': ..., 'parameters': {...}}, ...]
+        report: report(progress, message, cancellable=True, commit=False) ilerleme callback'i;
+            sonuç kaydedildikten sonra cancellable=False ile çağrılır
+
+    Returns:
+        Oluşturulan ProcessingStep listesi (işlem sırasıyla)
+    """
+    from .services import ModelProcessor
+
+    report = report or _silent_report
+    total = len(operations)
+    timer = PhaseTimer()
+
+    report(5, 'Model yükleniyor')
+    with timer.phase('load'):
+        parent = model.current_step
+        previous_digest = mesh_cache.key_for(model.current_file.path)
+        processor = ModelProcessor(model.current_file.path)
+    compute_times = [0.0] * total
+    mesh_sizes = []
+
+    for index, item in enumerate(operations):
+        operation = get_operation(item['step_type'])
+        report(10 + int(70 * index / total), f'İşlem uygulanıyor ({index + 1}/{total})')
+
+        before = mesh_size(processor.mesh)
+        op_start = time.perf_counter()
+        with timer.phase('compute'):
+            success = operation['apply'](processor, item['parameters'])
+        compute_times[index] = time.perf_counter() - op_start
+        mesh_sizes.append({'before': before, 'after': mesh_size(processor.mesh)})
+        if not success:
+            prefix = f'{index + 1}. işlem: ' if total > 1 else ''
+            raise ValueError(prefix + operation['error'])
+
+    def step_metrics(index):
+        """Zincirin ortak aşamaları ilk (yükleme) ve son (kayıt) adıma yazılır"""
+        phases = {'compute': compute_times[index]}
+        if index == 0:
+            phases['load'] = timer.phases['load']
+        if index == total - 1:
+            phases.update({
+                name: timer.phases[name]
+                for name in ('export', 'storage', 'lod', 'analysis') if name in timer.phases
+            })
+        return timer.as_dict(phases=phases, meshes=mesh_sizes[index])
+
+    report(80, 'Sonuç hazırlanıyor')
+
+    # Ara sonuçlar kompakt formatta tek seferde storage'a yazılır;
+    # STL export yalnızca indirme/tamamlama anında yapılır
+    with timer.phase('export'):
+        content = processor.export_file(file_type=mesh_format.EXTENSION)
+
+    # Bundan sonra iptal kabul edilmez; kabul edilmiş iptal sonucu atar
+    report(85, 'Sonuç kaydediliyor', commit=True)
+
+    with transaction.atomic():
+        # Görev çalışırken sürüm değiştirildiyse (geri alma/yineleme) sonuç
+        # eski sürüme bağlanıp kullanıcının seçimini ezmemeli
+        current_id = Model3D.objects.select_for_update().filter(pk=model.pk).values_list(
+            'current_step_id', flat=True
+        ).get()
+        if current_id != (parent.id if parent is not None else None):
+            raise ValueError('Görev çalışırken güncel sürüm değişti; işlem sonucu kaydedilmedi, yeniden başlatın')
+
+        steps = []
+        for item in operations:
+            steps.append(ProcessingStep.objects.create(
+                model=model,
+                parent=steps[-1] if steps else parent,
+                step_type=item['step_type'],
+                parameters=item['parameters'],
+                execution_time=0.0,
+                success=True
+            ))
+        last_step = steps[-1]
+        prefix = get_operation(last_step.step_type)['file_prefix']
+
+        with timer.phase('storage'):
+            last_step.result_file.save(
+                f'{prefix}_{model.id}_{last_step.id}.{mesh_format.EXTENSION}',
+                content,
+                save=False
+            )
+
+        for index, step in enumerate(steps):
+            step.metrics = step_metrics(index)
+            step.execution_time = step.metrics['total']
+            if step is not last_step:
+                step.save(update_fields=['metrics', 'execution_time'])
+        tree = VersionTree(model)
+        last_step.is_keyframe = is_keyframe_due(tree, parent, steps)
+        last_step.save()
+
+        # Model güncel hali için son adımın dosyasını gösterir (kopya yok)
+        model.current_step = last_step
+        model.save(update_fields=['current_step'])
+
+    # Sonraki işlem dosyayı yeniden ayrıştırmasın
+    mesh_cache.put(last_step.result_file.path, processor.mesh)
+
+    # Eski ara sürümlerin dosyaları silinir; gerekirse keyframe'den kurulur
+    try:
+        prune_artifacts(model, last_step, VersionTree(model))
+    except Exception as e:
+        print(f"Sürüm budama hatası: {e}")
+
+    # Önizleme seviyeleri; hata olursa görüntüleyici tam çözünürlüğe düşer
+    report(90, 'Önizlemeler güncelleniyor', cancellable=False)
+    with timer.phase('lod'):
+        try:
+            update_lods(model, processor.mesh, previous_digest, processor.rigid_transform)
+        except Exception as e:
+            print(f"Önizleme güncelleme hatası: {e}")
+
+    # Mevcut analiz varsa yalnızca değişen kısmı yeniden hesaplanır
+    report(95, 'Analiz güncelleniyor', cancellable=False)
+    with timer.phase('analysis'):
+        try:
+            update_analysis(model, previous_digest, processor.rigid_transform, processor.cut_plane)
+        except Exception as e:
+            print(f"Analiz güncelleme hatası: {e}")
+
+    # Sonraki güncellemeler execution_time'a (işlem + kayıt) eklenmez
+    last_step.metrics = step_metrics(total - 1)
+    ProcessingStep.objects.filter(pk=last_step.pk).update(metrics=last_step.metrics)
+
+    return steps
+
+
+def execute_lods(model, parameters, report=None):
+    """
+    Modelin güncel hali için önizleme seviyelerini üret (yükleme sonrası)
+
+    Görev bitene kadar görüntüleyici tam çözünürlüğü gösterir.
+    parameters['face_budget'] verilmişse ve model bütçeyi aşıyorsa önce
+    kayıtlı bir seyreltme adımı uygulanır (önizlemeleri o üretir).
+
+    Returns:
+        Seyreltme yapıldıysa oluşan adımlar, yoksa None
+    """
+    report = report or _silent_report
+    budget = parameters.get('face_budget')
+    if budget:
+        report(5, 'Face sayısı denetleniyor')
+        if len(mesh_cache.load(model.current_file.path).faces) > budget:
+            operation = {
+                'step_type': 'decimation',
+                'parameters': get_operation('decimation')['parse'](
+                    {'target_faces': budget, 'max_error': 0.0, 'method': 'quadric'}
+                ),
+            }
+            return execute_pipeline(model, [operation], report=report)
+    report(10, 'Önizlemeler oluşturuluyor')
+    update_lods(model)
+
+
+def execute_checkout(model, parameters, report=None):
+    """
+    Sürüm değiştirme (geri alma/yineleme): sürümü kur, önizleme ve analizi taşı
+
+    Budanmış sürüm keyframe'den kurulur. İşaretçi taşındıktan sonraki
+    aşamalar iptal edilemez. Önizleme ve analiz hataları görevi
+    düşürmez (görüntüleyici tam çözünürlüğe düşer, analiz bayat kalır).
+    """
+    report = report or _silent_report
+    step_id = parameters.get('step_id')
+    step = ProcessingStep.objects.get(pk=step_id, model=model) if step_id else None
+
+    report(10, 'Sürüm kuruluyor')
+    checkout_step(model, step, report=report)
+
+    report(60, 'Önizlemeler güncelleniyor', cancellable=False)
+    try:
+        update_lods(model)
+    except Exception as e:
+        print(f"Önizleme güncelleme hatası: {e}")
+    report(90, 'Analiz geri yükleniyor', cancellable=False)
+    try:
+        restore_analysis(model)
+    except Exception as e:
+        print(f"Analiz geri yükleme hatası: {e}")
+
+
+def execute_bulk_analysis(parameters, report=None):
+    """
+    Modelleri toplu analiz servisiyle analiz et (toplu analiz görevi)
+
+    Eskimişlik denetimi (dosya özeti) istekte değil burada yapılır.
+    Sonuçlar tek bulk_create ile yazılır; aynı modeli içeren ikinci
+    görev güncel analizi atlar.
+
+    Returns:
+        Verim özeti (görevin result alanına yazılır)
+    """
+    from apps.analysis.services.bulk import bulk_analyze
+
+    report = report or _silent_report
+    model_ids = parameters['model_ids']
+    finished = []
+
+    def progress(entry):
+        finished.append(entry)
+        report(5 + int(85 * len(finished) / len(model_ids)), f'Analiz ediliyor ({len(finished)}/{len(model_ids)})')
+
+    report(5, 'Modeller taranıyor')
+    summary = bulk_analyze(
+        Model3D.objects.filter(id__in=model_ids),
+        processes=parameters.get('processes'),
+        include_stale=parameters.get('include_stale', False),
+        on_result=progress,
+        before_save=lambda: report(90, 'Sonuçlar kaydediliyor', commit=True),
+    )
+    # Model başına süreler yalnızca hatalar için tutulur
+    results = summary.pop('results')
+    summary['failures'] = [entry for entry in results if not entry['success']]
+    return summary
+
+
+# İşlem adımı üretmeyen, modelin güncel hali üzerinde çalışan görevler
+MODEL_JOBS = {
+    'lod': execute_lods,
+    'checkout': execute_checkout,
+}
+
+# Modele bağlı olmayan, parametrelerdeki modelleri işleyen görevler
+BATCH_JOBS = {
+    'analysis': execute_bulk_analysis,
+}
+
+
+def run_job(job):
+    """
+    Sahiplenilmiş görevi çalıştır ve sonucunu kaydet
+
+    Returns:
+        Güncellenmiş ProcessingJob
+    """
+    result = None
+    try:
+        with profiled(f'job-{job.step_type}-{job.id}'):
+            if job.step_type in BATCH_JOBS:
+                result = BATCH_JOBS[job.step_type](job.parameters, report=JobReporter(job))
+                steps = [None]
+            elif job.step_type in MODEL_JOBS:
+                steps = MODEL_JOBS[job.step_type](job.model, job.parameters, report=JobReporter(job)) or [None]
+            else:
+                steps = execute_pipeline(
+                    job.model,
+                    job_operations(job.step_type, job.parameters),
+                    report=JobReporter(job)
+                )
+    except JobCancelled:
+        job.refresh_from_db()
+        return job
+    except Exception as e:
+        ProcessingJob.objects.filter(pk=job.pk, status__in=['running', 'committing']).update(
+            status='failed',
+            error_message=str(e),
+            message='Başarısız',
+            finished_at=timezone.now()
+        )
+        job.refresh_from_db()
+        return job
+
+    # Kayıt aşamasında iptal kabul edilmez; bu arada iptal edilmiş veya
+    # yanıt vermediği için başarısız işaretlenmiş görev ezilmez
+    ProcessingJob.objects.filter(pk=job.pk, status__in=['running', 'committing']).update(
+        status='completed',
+        progress=100,
+        step=steps[-1],
+        result=result,
+        message='Tamamlandı',
+        finished_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return job
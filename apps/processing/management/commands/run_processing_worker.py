@@ -0,0 +1,87 @@
+"""
+Arka plan işleme worker'ı
+
+Kuyruk olarak yalnızca veritabanını kullanır (Redis gerekmez).
+
+Kullanım:
+    python manage.py run_processing_worker
+    python manage.py run_processing_worker --processes 4
+    python manage.py run_processing_worker --once
+"""
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from apps.processing.jobs import claim_next_job, default_worker_name, run_job
+
+
+def worker_loop(poll_interval, once=False, stdout=None):
+    """Kuyruktan görev al ve çalıştır; kuyruk boşsa bekle"""
+    worker_name = default_worker_name()
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+
+    while not stopping:
+        close_old_connections()
+        job = claim_next_job(worker_name)
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        job = run_job(job)
+        if stdout is not None:
+            stdout.write(f'[{worker_name}] {job.step_type} {job.id}: {job.status}')
+
+
+def _worker_process(poll_interval):
+    # Fork edilen süreç ebeveynin bağlantılarını paylaşmamalı
+    connections.close_all()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker_loop(poll_interval)
+
+
+class Command(BaseCommand):
+    help = 'Kuyruktaki işleme görevlerini bir süreç havuzunda çalıştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int,
+                            default=getattr(settings, 'PROCESSING_WORKER_PROCESSES', 2),
+                            help='Paralel worker süreci sayısı')
+        parser.add_argument('--poll-interval', type=float,
+                            default=getattr(settings, 'PROCESSING_WORKER_POLL_INTERVAL', 1.0),
+                            help='Kuyruk boşken bekleme süresi (saniye)')
+        parser.add_argument('--once', action='store_true',
+                            help='Kuyruktaki görevleri bitir ve çık (tek süreç)')
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval']
+
+        if options['once'] or options['processes'] <= 1:
+            self.stdout.write('Worker başlatıldı (tek süreç)')
+            worker_loop(poll_interval, once=options['once'], stdout=self.stdout)
+            return
+
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=_worker_process, args=(poll_interval,), daemon=True)
+            for _ in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f'{len(workers)} worker süreci başlatıldı')
+
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            self.stdout.write('Worker süreçleri durduruluyor...')
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
@@ -0,0 +1,272 @@
+"""
+İşleme operasyonları kaydı
+Her adım tipi için istek parametrelerinin ayrıştırılması ve ModelProcessor eşlemesi
+"""
+from apps.core.services.decimation import METHODS as DECIMATION_METHODS
+from apps.core.services.hole_filling import METHODS as FILL_METHODS
+from apps.core.services.smoothing import ALGORITHMS as SMOOTHING_ALGORITHMS
+
+from .services import DRILL_HOLE_TYPES, DRILL_POSITIONS, OVALIZATION_REGIONS
+
+
+def _parse_rotation(data):
+    return {
+        'x_angle': float(data.get('x_angle', 0)),
+        'y_angle': float(data.get('y_angle', 0)),
+        'z_angle': float(data.get('z_angle', 0)),
+    }
+
+
+def _apply_rotation(processor, params):
+    return processor.rotate_model(
+        x_angle=params['x_angle'],
+        y_angle=params['y_angle'],
+        z_angle=params['z_angle']
+    )
+
+
+def _parse_cutting(data):
+    return {
+        'cut_plane': data.get('cut_plane', 'xy'),
+        'position': float(data.get('position', 50)),
+        'direction': data.get('direction', 'above'),
+        'tilt_x': float(data.get('tilt_x', 0)),
+        'tilt_y': float(data.get('tilt_y', 0)),
+    }
+
+
+def _apply_cutting(processor, params):
+    return processor.cut_model(
+        plane=params['cut_plane'],
+        position=params['position'],
+        direction=params['direction'],
+        tilt_x=params['tilt_x'],
+        tilt_y=params['tilt_y']
+    )
+
+
+def _parse_smoothing(data):
+    algorithm = data.get('algorithm', 'laplacian')
+    if algorithm not in SMOOTHING_ALGORITHMS:
+        raise ValueError(f'Desteklenmeyen yumuşatma algoritması: {algorithm}')
+    return {
+        'algorithm': algorithm,
+        'intensity': int(data.get('intensity', 5)),
+        'iterations': int(data.get('iterations', 10)),
+        'preserve_edges': data.get('preserve_edges', True),
+    }
+
+
+def _apply_smoothing(processor, params):
+    return processor.smooth_model(
+        iterations=params['iterations'],
+        algorithm=params['algorithm'],
+        intensity=params['intensity'],
+        preserve_edges=params['preserve_edges']
+    )
+
+
+def _parse_fill_holes(data):
+    fill_method = data.get('fill_method', 'fair')
+    if fill_method not in FILL_METHODS:
+        raise ValueError(f'Desteklenmeyen doldurma yöntemi: {fill_method}')
+    return {
+        'max_hole_size': float(data.get('max_hole_size', 0)),
+        'fill_method': fill_method,
+    }
+
+
+def _apply_fill_holes(processor, params):
+    return processor.fill_holes(
+        max_hole_size=params['max_hole_size'],
+        fill_method=params['fill_method']
+    )
+
+
+def _parse_ovalization(data):
+    region = data.get('region', 'all')
+    if region not in OVALIZATION_REGIONS:
+        raise ValueError(f'Desteklenmeyen ovalleştirme bölgesi: {region}')
+    return {
+        'intensity': int(data.get('intensity', 5)),
+        'region': region,
+        'preserve_edges': data.get('preserve_edges', True),
+    }
+
+
+def _apply_ovalization(processor, params):
+    return processor.ovalize_model(
+        intensity=params['intensity'],
+        region=params['region'],
+        preserve_edges=params['preserve_edges']
+    )
+
+
+def _parse_decimation(data):
+    method = data.get('method', 'quadric')
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f'Desteklenmeyen seyreltme yöntemi: {method}')
+    target_faces = int(data.get('target_faces') or 0)
+    max_error = float(data.get('max_error') or 0)
+    if target_faces < 0 or max_error < 0:
+        raise ValueError('Hedef face sayısı ve hata toleransı negatif olamaz')
+    if target_faces < 4 and (method == 'cluster' or max_error <= 0):
+        raise ValueError('Hedef face sayısı (en az 4) veya hata toleransı gerekli')
+    return {
+        'target_faces': target_faces,
+        'max_error': max_error,
+        'method': method,
+    }
+
+
+def _apply_decimation(processor, params):
+    return processor.decimate_model(
+        target_faces=params['target_faces'],
+        max_error=params['max_error'],
+        method=params['method']
+    )
+
+
+def _parse_bulging(data):
+    radius = float(data.get('radius', 4.0))
+    if radius <= 0:
+        raise ValueError('Bombeleştirme yarıçapı pozitif olmalı')
+    return {
+        'radius': radius,
+        'amount': float(data.get('amount', 0.5)),
+    }
+
+
+def _apply_bulging(processor, params):
+    return processor.bulge_canal_tip(
+        radius=params['radius'],
+        amount=params['amount']
+    )
+
+
+def _parse_drilling(data):
+    diameter = float(data.get('diameter', 2.0))
+    depth = float(data.get('depth', 5.0))
+    count = int(data.get('count', 1))
+    position = data.get('position', 'center')
+    hole_type = data.get('hole_type', 'through')
+    if diameter <= 0:
+        raise ValueError('Delik çapı pozitif olmalı')
+    if depth <= 0:
+        raise ValueError('Delik derinliği pozitif olmalı')
+    if count < 1:
+        raise ValueError('Delik sayısı en az 1 olmalı')
+    if position not in DRILL_POSITIONS:
+        raise ValueError(f'Desteklenmeyen delik konumu: {position}')
+    if hole_type not in DRILL_HOLE_TYPES:
+        raise ValueError(f'Desteklenmeyen delik tipi: {hole_type}')
+    return {
+        'diameter': diameter,
+        'depth': depth,
+        'position': position,
+        'hole_type': hole_type,
+        'count': count,
+        'min_wall': float(data.get('min_wall', 0.8)),
+    }
+
+
+def _apply_drilling(processor, params):
+    return processor.drill_hole(
+        diameter=params['diameter'],
+        depth=params['depth'],
+        position=params['position'],
+        hole_type=params['hole_type'],
+        count=params['count'],
+        min_wall=params.get('min_wall', 0.8)
+    )
+
+
+# Adım tipi -> operasyon tanımı
+OPERATIONS = {
+    'rotation': {
+        'parse': _parse_rotation,
+        'apply': _apply_rotation,
+        'file_prefix': 'rotate',
+        'error': 'Döndürme işlemi başarısız oldu',
+    },
+    'cutting': {
+        'parse': _parse_cutting,
+        'apply': _apply_cutting,
+        'file_prefix': 'cut',
+        'error': 'Kesme işlemi başarısız oldu',
+    },
+    'fill_holes': {
+        'parse': _parse_fill_holes,
+        'apply': _apply_fill_holes,
+        'file_prefix': 'fill',
+        'error': 'Delik doldurma işlemi başarısız oldu',
+    },
+    'smoothing': {
+        'parse': _parse_smoothing,
+        'apply': _apply_smoothing,
+        'file_prefix': 'smooth',
+        'error': 'Yumuşatma işlemi başarısız oldu',
+    },
+    'ovalization': {
+        'parse': _parse_ovalization,
+        'apply': _apply_ovalization,
+        'file_prefix': 'ovalize',
+        'error': 'Ovalleştirme işlemi başarısız oldu',
+        # Bölgesel subdivision face sayısını en fazla 16 katına çıkarır
+        # (yalnızca tüm model seçiliyken ve tüm kenarlar uzunsa)
+        'face_growth': 16,
+    },
+    'decimation': {
+        'parse': _parse_decimation,
+        'apply': _apply_decimation,
+        'file_prefix': 'decimate',
+        'error': 'Seyreltme işlemi başarısız oldu',
+    },
+    'bulging': {
+        'parse': _parse_bulging,
+        'apply': _apply_bulging,
+        'file_prefix': 'bulge',
+        'error': 'Bombeleştirme işlemi başarısız oldu',
+    },
+    'drilling': {
+        'parse': _parse_drilling,
+        'apply': _apply_drilling,
+        'file_prefix': 'drill',
+        'error': 'Delik delme işlemi başarısız oldu',
+        # Boolean fark kapalı hacim ister; önizleme kümeleme ile
+        # seyreltilmiş (açık) önizleme seviyelerinde çalışamaz
+        'needs_volume': True,
+    },
+}
+
+
+def get_operation(step_type):
+    """Adım tipine ait operasyonu döndür"""
+    try:
+        return OPERATIONS[step_type]
+    except KeyError:
+        raise ValueError(f'Desteklenmeyen işlem tipi: {step_type}')
+
+
+def parse_pipeline(data):
+    """
+    İşlem zinciri isteğini ayrıştır
+
+    Args:
+        data: {'operations': [{'step_type': ..., 'parameters': {...}}, ...]}
+
+    Returns:
+        Her adımı ayrıştırılmış {'operations': [...]} sözlüğü
+    """
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        raise ValueError('En az bir işlem içeren "operations" listesi gerekli')
+
+    parsed = []
+    for item in operations:
+        step_type = item.get('step_type')
+        parsed.append({
+            'step_type': step_type,
+            'parameters': get_operation(step_type)['parse'](item.get('parameters', {})),
+        })
+    return {'operations': parsed}
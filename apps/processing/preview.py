@@ -0,0 +1,96 @@
+"""
+Kaydetmeden parametre önizlemesi
+İşlemi önbellekteki seyreltilmiş mesh üzerinde çalıştırır; adım veya dosya oluşturmaz
+"""
+import hashlib
+import json
+
+from django.conf import settings
+
+from apps.core.services.decimation import decimate, quadric_decimate
+from apps.core.services.mesh_cache import mesh_cache
+from apps.visualization.services.lod import current_lods
+from .operations import get_operation
+
+
+def preview_source(model, face_growth=1, needs_volume=False):
+    """
+    Önizlemenin çalışacağı mesh dosyasını seç
+
+    Sonuç face sayısı bütçeyi aşmayan en ince önizleme seviyesi
+    seçilir; hiçbiri sığmıyorsa en kaba seviye (run_preview ayrıca
+    seyreltir), seviye yoksa modelin güncel dosyası kullanılır.
+    Yalnızca güncel mesh'ten üretilmiş seviyeler dikkate alınır.
+    Kapalı hacim gereken işlemler (boolean) için önizleme seviyeleri
+    (vertex kümeleme, kapalı değil) kullanılmaz.
+
+    Args:
+        model: Model3D
+        face_growth: İşlemin face sayısını en fazla kaç katına çıkardığı
+        needs_volume: İşlem kapalı hacim gerektiriyor mu?
+
+    Returns:
+        Dosya yolu
+    """
+    budget = getattr(settings, 'PROCESSING_PREVIEW_MAX_FACES', 20000)
+    lods = [] if needs_volume else current_lods(model)
+    if not lods:
+        return model.current_file.path
+
+    fitting = [lod for lod in lods if lod.faces_count * face_growth <= budget]
+    chosen = fitting[-1] if fitting else lods[0]
+    return chosen.file.path
+
+
+def _volume_source(path, limit):
+    """
+    Bütçeye kuadrik seyreltmeyle (kapalı kalır) indirilmiş mesh
+
+    Kuadrik seyreltme kümelemeden yavaştır; sonuç aynı kaynak için
+    sonraki önizlemelerde yeniden kullanılsın diye önbelleğe alınır.
+    """
+    key = f'preview-volume:{mesh_cache.key_for(path)}:{limit}'
+    mesh = mesh_cache.get(key)
+    if mesh is None:
+        mesh = quadric_decimate(mesh_cache.load(path), target_faces=limit)
+        mesh_cache.remember(key, mesh)
+    return mesh
+
+
+def run_preview(path, step_type, parameters):
+    """
+    İşlemi önizleme mesh'i üzerinde uygula
+
+    Args:
+        path: preview_source ile seçilen dosya yolu
+        step_type: İşlem tipi
+        parameters: Ayrıştırılmış işlem parametreleri
+
+    Returns:
+        Sonuç mesh'i (önbellekteki kaynak değişmez)
+    """
+    from .services import ModelProcessor
+
+    operation = get_operation(step_type)
+    processor = ModelProcessor(path)
+
+    # En kaba seviye bile bütçeyi aşıyorsa (ör. subdivision) daha da seyrelt
+    growth = operation.get('face_growth', 1)
+    limit = getattr(settings, 'PROCESSING_PREVIEW_MAX_FACES', 20000) // growth
+    if len(processor.mesh.faces) > limit:
+        if operation.get('needs_volume'):
+            processor.mesh = _volume_source(path, limit)
+        else:
+            processor.mesh = decimate(processor.mesh, limit)
+
+    if not operation['apply'](processor, parameters):
+        raise ValueError(operation['error'])
+    return processor.mesh
+
+
+def preview_cache_key(path, step_type, parameters, encoding):
+    """Aynı kaynak ve parametreler için önbellek anahtarı"""
+    params = hashlib.blake2b(
+        json.dumps(parameters, sort_keys=True).encode(), digest_size=8
+    ).hexdigest()
+    return f'preview:{mesh_cache.key_for(path)}:{step_type}:{params}:{encoding}'
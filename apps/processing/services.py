@@ -5,18 +5,154 @@ Trimesh kütüphanesi kullanarak gerçek model işlemleri
 import trimesh
 import numpy as np
 import os
+from django.conf import settings
+from django.core.files import File
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+from django.core.cache import cache
 import tempfile
 
+from apps.analysis.services.cross_section import CrossSectionEngine
+from apps.core.services import csg, deformation, mesh_format, remesh
+from apps.core.services.decimation import cluster_decimate, quadric_decimate
+from apps.core.services.hole_filling import HoleFiller
+from apps.core.services.mesh_cache import mesh_cache
+from apps.core.services.smoothing import FEATURE_ANGLE, smooth_vertices
+
+# Kanal boyunca delikte merkez eğrisi seviye sayısı
+CANAL_LEVELS = 64
+
+# Ovalleştirilebilecek bölgeler
+OVALIZATION_REGIONS = ('all', 'top', 'bottom', 'sides', 'concha', 'canal')
+
+# Delik konumları ve tipleri
+DRILL_POSITIONS = ('center', 'top', 'side', 'custom', 'canal')
+DRILL_HOLE_TYPES = ('through', 'blind', 'countersink')
+
+
+def canal_centerline(mesh, mesh_hash=None):
+    """
+    Kanal merkez eğrisi, girişten (en geniş kesite yakın uç, konka) uca sıralı
+
+    Returns:
+        CrossSectionEngine.centerline() sözlüğü
+    """
+    line = CrossSectionEngine(mesh, mesh_hash=mesh_hash).centerline(CANAL_LEVELS)
+    if np.argmax(line['area']) > len(line['points']) / 2:
+        line = dict(line, points=line['points'][::-1], area=line['area'][::-1], heights=line['heights'][::-1])
+    return line
+
+
+def canal_tip(mesh, mesh_hash=None):
+    """
+    Kanal ucunun yüzeydeki tepe noktası ve dışa bakan yönü
+
+    Merkez eğrisinin son teğeti boyunca, son kesitin eşdeğer
+    yarıçapının 1.5 katı içindeki en uç vertex seçilir. mesh_hash
+    verilirse sonuç önbelleğe alınır.
+
+    Returns:
+        (nokta (3,), birim yön (3,))
+    """
+    key = f'canal-tip:{mesh_hash}'
+    if mesh_hash is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    line = canal_centerline(mesh, mesh_hash)
+    points = line['points']
+    end = points[-1]
+    direction = end - points[-2]
+    direction /= np.linalg.norm(direction)
+
+    offset = np.asarray(mesh.vertices) - end
+    along = offset @ direction
+    lateral = np.linalg.norm(offset - along[:, None] * direction, axis=1)
+    reach = 1.5 * np.sqrt(line['area'][-1] / np.pi)
+    candidates = np.flatnonzero(lateral <= reach)
+    if not len(candidates):
+        candidates = np.arange(len(along))
+    tip = (np.asarray(mesh.vertices[candidates[np.argmax(along[candidates])]], dtype=np.float64), direction)
+
+    if mesh_hash is not None:
+        cache.set(key, tip, timeout=None)
+    return tip
+
+
+def file_canal_tip(path):
+    """
+    Dosyadaki mesh'in kanal ucu (bkz. canal_tip)
+
+    Sonuç dosya özetiyle önbellekteyse mesh yüklenmez.
+    """
+    mesh_hash = mesh_cache.key_for(path)
+    cached = cache.get(f'canal-tip:{mesh_hash}')
+    if cached is not None:
+        return cached
+    return canal_tip(mesh_cache.load(path), mesh_hash)
+
+
+def ovalization_region(mesh, region='all', mesh_hash=None):
+    """
+    Ovalleştirilecek bölgenin vertex maskesi
+
+    'top' ve 'bottom' Z yüksekliğinin üst ve alt üçte biri, 'sides'
+    normali yataya yakın vertex'lerdir. 'concha' ve 'canal' kanal merkez
+    eğrisi ekseni boyunca giriş (konka) ve uç tarafın üçte biridir.
+
+    Returns:
+        Vertex başına bool dizi
+    """
+    if region not in OVALIZATION_REGIONS:
+        raise ValueError(f'Desteklenmeyen ovalleştirme bölgesi: {region}')
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    if region == 'all':
+        return np.ones(len(vertices), dtype=bool)
+    if region == 'sides':
+        return np.abs(np.asarray(mesh.vertex_normals)[:, 2]) < 0.5
+
+    if region in ('top', 'bottom'):
+        height = vertices[:, 2]
+    else:
+        points = canal_centerline(mesh, mesh_hash)['points']
+        axis = points[-1] - points[0]
+        height = (vertices - points[0]) @ (axis / np.linalg.norm(axis))
+    third = (height.max() - height.min()) / 3.0
+    if region in ('top', 'canal'):
+        return height >= height.max() - third
+    return height <= height.min() + third
+
 
 class ModelProcessor:
     """3D model işleme sınıfı"""
     
-    def __init__(self, model_path):
-        """Model yükle"""
-        self.mesh = trimesh.load(model_path)
-        self.original_mesh = self.mesh.copy()
+    def __init__(self, model_path=None, mesh=None):
+        """Model yükle (paylaşımlı mesh önbelleğinden) veya verilen mesh'i işle"""
+        if mesh is not None:
+            self.mesh = mesh
+            self.original_mesh = mesh.copy()
+        else:
+            self.mesh = mesh_cache.load(model_path)
+            self.original_mesh = mesh_cache.load(model_path)
+        # Yüklemeden bu yana uygulanan katı dönüşüm; şekli değiştiren
+        # bir işlemden sonra None olur (önizleme/analiz güncellemesi için)
+        self.rigid_transform = np.eye(4)
+        # Yüklenen mesh'e yalnızca tek bir kesme uygulandıysa kalan
+        # yarı uzay (origin, normal); aksi halde None
+        self.cut_plane = None
+    
+    def _apply_rigid_transform(self, matrix):
+        """Katı dönüşümü mesh'e uygula ve birikimli matrise ekle"""
+        self.mesh.apply_transform(matrix)
+        self.cut_plane = None
+        if self.rigid_transform is not None:
+            self.rigid_transform = matrix @ self.rigid_transform
+    
+    def _mark_modified(self):
+        """Şekli değiştiren işlem: katı dönüşüm ve kesme takibi geçersiz"""
+        self.rigid_transform = None
+        self.cut_plane = None
     
     def cut_model(self, plane='xy', position=50, direction='above', tilt_x=0, tilt_y=0):
         """
@@ -32,6 +168,9 @@ class ModelProcessor:
         Returns:
             Kesilmiş mesh
         """
+        pristine = self.rigid_transform is not None and np.allclose(self.rigid_transform, np.eye(4))
+        self._mark_modified()
+        
         # Mesh merkezini al
         bounds = self.mesh.bounds
         center = self.mesh.centroid
@@ -89,6 +228,8 @@ class ModelProcessor:
             
             if sliced is not None and len(sliced.vertices) > 0:
                 self.mesh = sliced
+                if pristine:
+                    self.cut_plane = (np.asarray(plane_origin, dtype=float), np.asarray(plane_normal, dtype=float))
                 return True
             else:
                 return False
@@ -114,179 +255,366 @@ class ModelProcessor:
         # Rotasyon matrislerini oluştur
         if x_rad != 0:
             matrix_x = trimesh.transformations.rotation_matrix(x_rad, [1, 0, 0])
-            self.mesh.apply_transform(matrix_x)
+            self._apply_rigid_transform(matrix_x)
         
         if y_rad != 0:
             matrix_y = trimesh.transformations.rotation_matrix(y_rad, [0, 1, 0])
-            self.mesh.apply_transform(matrix_y)
+            self._apply_rigid_transform(matrix_y)
         
         if z_rad != 0:
             matrix_z = trimesh.transformations.rotation_matrix(z_rad, [0, 0, 1])
-            self.mesh.apply_transform(matrix_z)
+            self._apply_rigid_transform(matrix_z)
         
         return True
     
-    def smooth_model(self, iterations=5):
+    def smooth_model(self, iterations=5, algorithm='laplacian', intensity=5, preserve_edges=False):
         """
-        Modeli yumuşat (Laplacian smoothing)
+        Modeli yumuşat (seyrek Laplace operatörü ile)
         
         Args:
             iterations: İterasyon sayısı
+            algorithm: 'laplacian', 'taubin', 'hc' veya 'cotangent'
+            intensity: Yumuşatma yoğunluğu (1-10)
+            preserve_edges: Keskin kenarları koru
         """
+        self._mark_modified()
         try:
-            # Trimesh'in smoothing fonksiyonu
-            trimesh.smoothing.filter_laplacian(self.mesh, iterations=int(iterations))
+            self.mesh.vertices = smooth_vertices(
+                self.mesh,
+                algorithm=algorithm,
+                iterations=int(iterations),
+                intensity=int(intensity),
+                preserve_edges=bool(preserve_edges)
+            )
             return True
         except Exception as e:
             print(f"Yumuşatma hatası: {e}")
             return False
     
-    def fill_holes(self):
-        """Model yüzeyindeki delikleri doldur"""
+    def fill_holes(self, max_hole_size=0, fill_method='fair'):
+        """
+        Model yüzeyindeki delikleri doldur
+        
+        Sınır döngüleri üçgenlenir, yama çevredeki kenar boyuna kadar
+        inceltilir ve ('fair' yönteminde) çevreye uyumlu kavisle
+        düzgünleştirilir; yalnızca delik çevresi işlenir.
+        
+        Args:
+            max_hole_size: Bu çaptan (mm) büyük delikler atlanır (0: hepsi)
+            fill_method: 'fair' (kavisli yama) veya 'flat' (düz yama)
+        """
+        self._mark_modified()
         try:
-            self.mesh.fill_holes()
+            self.mesh, _ = HoleFiller(self.mesh).fill(
+                max_hole_size=float(max_hole_size),
+                method=fill_method
+            )
             return True
         except Exception as e:
             print(f"Delik doldurma hatası: {e}")
             return False
     
-    def ovalize_model(self, intensity=5, preserve_edges=True):
+    def ovalize_model(self, intensity=5, region='all', preserve_edges=True):
         """
-        Modeli ovalleştir (subdivision + smoothing)
+        Modeli ovalleştir (bölgesel subdivision + smoothing)
+        
+        Yalnızca tamamı bölgede kalan face'ler kenar boyuna göre bölünür
+        (düşük yoğunlukta bir, yüksekte iki tur) ve yalnızca bölge
+        vertex'leri yumuşatılır. Bölge dışı face'ler ve bölge sınırı
+        kenarları değişmez, böylece mesh kapalı kalır.
         
         Args:
             intensity: Ovalleştirme yoğunluğu (1-10)
-            preserve_edges: Kenarları koru
+            region: OVALIZATION_REGIONS içinden biri
+            preserve_edges: Keskin kenarları bölme, çevirme ve yumuşatmada koru
         
         Returns:
             bool: Başarılı/başarısız
         """
+        self._mark_modified()
         try:
-            # Yoğunluğa göre subdivision sayısını hesapla
-            # Düşük yoğunluk = 1 subdivision, yüksek = 2 subdivision
-            subdivisions = 1 if intensity <= 5 else 2
-            
-            # Mesh'i subdivide et (daha fazla vertex ekler, daha yumuşak yapar)
-            self.mesh = self.mesh.subdivide()
+            mask = ovalization_region(self.mesh, region)
+            vertices = np.array(self.mesh.vertices, dtype=np.float64)
+            faces = np.asarray(self.mesh.faces, dtype=np.int64)
+            inside = mask[faces].all(axis=1)
+            if not inside.any():
+                return True
             
-            # İkinci subdivision gerekirse
-            if subdivisions == 2:
-                self.mesh = self.mesh.subdivide()
+            # Bölge dışı face'lerin kenarları (bölge sınırı dahil) ve keskin
+            # kenarlar bölünmez ve çevrilmez
+            outside = faces[~inside]
+            fixed = [remesh.edge_keys(outside, np.roll(outside, -1, axis=1)).ravel()]
+            if preserve_edges:
+                sharp = self.mesh.face_adjacency_edges[self.mesh.face_adjacency_angles > FEATURE_ANGLE]
+                fixed.append(remesh.edge_keys(sharp[:, 0], sharp[:, 1]))
+            fixed = np.unique(np.concatenate(fixed))
             
-            # Smoothing uygula (Laplacian)
-            smoothing_iterations = max(5, int(intensity))
-            trimesh.smoothing.filter_laplacian(
-                self.mesh, 
-                iterations=smoothing_iterations
+            # Hedef kenar boyu, bölgenin ortanca kenarının 1/2 veya 1/4'ü:
+            # tur başına yalnızca hedefin SPLIT_RATIO katından uzun kenarlar bölünür
+            rounds = 1 if intensity <= 5 else 2
+            region_faces = faces[inside]
+            lengths = np.linalg.norm(vertices[region_faces] - vertices[np.roll(region_faces, -1, axis=1)], axis=2)
+            target = float(np.median(lengths)) / 2.0 ** rounds
+            vertices, region_faces = remesh.refine(
+                vertices, region_faces, np.full(len(region_faces), target), fixed, iterations=rounds
             )
             
+            movable = np.ones(len(vertices), dtype=bool)
+            movable[:len(mask)] = mask
+            self.mesh = trimesh.Trimesh(vertices=vertices, faces=np.vstack([outside, region_faces]), process=False)
+            
+            # Laplace smoothing yalnızca bölgede; tüm modelde hacim korunur
+            self.mesh.vertices = smooth_vertices(
+                self.mesh,
+                algorithm='laplacian',
+                iterations=max(5, int(intensity)),
+                preserve_edges=bool(preserve_edges),
+                mask=None if mask.all() else movable
+            )
             return True
             
         except Exception as e:
             print(f"Ovalleştirme hatası: {e}")
             return False
     
-    def drill_hole(self, diameter=2.0, depth=5.0, position='center', hole_type='through', count=1):
+    def decimate_model(self, target_faces=0, max_error=0, method='quadric'):
+        """
+        Modeli seyrelt (face sayısı bütçesi veya yüzey hata toleransı)
+        
+        'quadric' kuadrik hata metriğiyle kenar daraltır: eğrisel
+        bölgeler korunur, mesh kapalı kalır. 'cluster' vertex kümeleme
+        ile çok daha hızlıdır ama kalitesi düşüktür ve kapalılığı
+        korumaz.
+        
+        Args:
+            target_faces: Hedef face sayısı (0: yalnızca hata toleransı)
+            max_error: Daraltma başına en fazla yüzey sapması (mm; 0: sınırsız)
+            method: 'quadric' veya 'cluster'
+        
+        Returns:
+            bool: Başarılı/başarısız
+        """
+        target_faces, max_error = int(target_faces), float(max_error)
+        if target_faces >= len(self.mesh.faces) and not max_error:
+            return True
+        self._mark_modified()
+        try:
+            if method == 'cluster':
+                self.mesh = cluster_decimate(self.mesh, target_faces)
+            else:
+                self.mesh = quadric_decimate(
+                    self.mesh,
+                    target_faces=target_faces or None,
+                    max_error=max_error or None
+                )
+            return True
+        except Exception as e:
+            print(f"Seyreltme hatası: {e}")
+            return False
+    
+    def bulge_canal_tip(self, radius=4.0, amount=0.5):
+        """
+        Kanal ucunu bombeleştir
+        
+        Tespit edilen kanal ucu çevresinde yarıçap içindeki vertex'ler
+        normalleri boyunca yumuşak düşüşle itilir; bölge dışı değişmez.
+        
+        Args:
+            radius: Etki yarıçapı (mm)
+            amount: Uçtaki yer değiştirme (mm; negatif düzleştirir)
+        
+        Returns:
+            bool: Başarılı/başarısız
+        """
+        self._mark_modified()
+        try:
+            center, _ = canal_tip(self.mesh)
+            indices, positions = deformation.bulge(self.mesh, center, float(radius), float(amount))
+            vertices = np.array(self.mesh.vertices, dtype=np.float64)
+            vertices[indices] = positions
+            self.mesh.vertices = vertices
+            return True
+        except Exception as e:
+            print(f"Bombeleştirme hatası: {e}")
+            return False
+    
+    def _drill_cutters(self, diameter, depth, position, hole_type, count):
+        """
+        Delik kesici katılarını oluştur (silindirler ve havşa konileri)
+        
+        Returns:
+            Dünya koordinatlarında kesici mesh listesi
+        """
+        bounds = self.mesh.bounds
+        center = self.mesh.centroid
+        size = bounds[1] - bounds[0]
+        vertices = self.mesh.vertices
+        radius = float(diameter) / 2.0
+        
+        # Delik ekseni ve giriş tarafı: yan delikler X, diğerleri Z boyunca
+        axis = 0 if position == 'side' else 2
+        spread = 1 if position == 'side' else 0
+        direction = np.zeros(3)
+        direction[axis] = 1.0
+        
+        # Through hole için modelin tamamını geçecek uzunlukta silindir
+        if hole_type == 'through':
+            cylinder_height = max(size) * 2  # Modelden daha uzun
+        else:
+            cylinder_height = float(depth)
+        
+        # Eksen Z'den X'e çevrilir (yan delik)
+        orient = np.eye(4)
+        if axis == 0:
+            orient = trimesh.transformations.rotation_matrix(np.pi / 2, [0, 1, 0])
+        
+        cutters = []
+        for i in range(int(count)):
+            # Çoklu delik için yan yana yerleştir
+            hole_position = center.copy()
+            hole_position[spread] += (i - (count - 1) / 2) * (diameter * 2)
+            
+            # Giriş noktası: delik ekseni çevresindeki en dıştaki yüzey noktası
+            # (yoksa bounding box yüzü)
+            entry = hole_position.copy()
+            offset = vertices - hole_position
+            offset[:, axis] = 0.0
+            near = np.einsum('ij,ij->i', offset, offset) <= radius ** 2
+            entry[axis] = vertices[near, axis].max() if near.any() else bounds[1][axis]
+            
+            if position in ('top', 'side') and hole_type == 'blind':
+                # Kör delik yüzeyden depth kadar içeri iner
+                hole_position[axis] = entry[axis] - cylinder_height / 2
+            
+            cylinder = trimesh.creation.cylinder(
+                radius=radius,
+                height=cylinder_height,
+                sections=32  # Daha yuvarlak delik için
+            )
+            cylinder.apply_transform(orient)
+            cylinder.apply_translation(hole_position)
+            cutters.append(cylinder)
+            
+            # Havşa: tabanı yüzeyde, ucu malzemeye bakan koni
+            if hole_type == 'countersink':
+                cone_radius = radius * 1.5
+                cone_height = diameter * 0.5
+                margin = cone_height * 0.25
+                cone = trimesh.creation.cone(
+                    radius=cone_radius * (cone_height + margin) / cone_height,
+                    height=cone_height + margin,
+                    sections=32
+                )
+                cone.apply_transform(trimesh.transformations.rotation_matrix(np.pi, [1, 0, 0]))
+                cone.apply_transform(orient)
+                cone.apply_translation(entry + direction * margin)
+                cutters.append(cone)
+        
+        return cutters
+    
+    def _canal_cutters(self, diameter, depth, hole_type, min_wall):
+        """
+        Kanal merkez eğrisini izleyen vent/tüp kesicisi
+        
+        Merkez eğrisi kesit ağırlık merkezlerinden çıkarılır; yol kabuktan
+        en az (yarıçap + min_wall) uzakta tutulur, tüpün sığmadığı uç
+        noktalar atlanır. Giriş en geniş kesite (konka) yakın uçtadır; yol iki
+        uçtan teğet boyunca modelin dışına uzatılır (kör delikte yalnızca
+        girişten depth kadar ilerler).
+        
+        Returns:
+            Dünya koordinatlarında kesici mesh listesi
+        """
+        radius = float(diameter) / 2.0
+        required = radius + float(min_wall)
+        line = canal_centerline(self.mesh)
+        points = line['points']
+        
+        points, clearance = csg.keep_clearance(self.mesh, points, required)
+        if len(points) < 2:
+            raise ValueError('Kanal bu çap ve duvar kalınlığı için çok dar')
+        if clearance < required:
+            raise ValueError(
+                f'En az {min_wall} mm duvar kalınlığı sağlanamadı '
+                f'(en ince {max(clearance - radius, 0.0):.2f} mm)'
+            )
+        
+        def outward(a, b):
+            vector = a - b
+            return vector / np.linalg.norm(vector)
+        
+        entry_direction = outward(points[0], points[1])
+        exit_direction = outward(points[-1], points[-2])
+        reach = float(self.mesh.extents.max())
+        
+        # Yüzey girişi: giriş doğrultusunda ana eksen boyunca modelin en dış noktası
+        axis = line['axis']
+        sign = np.sign(entry_direction @ axis) or 1.0
+        extreme = (self.mesh.vertices @ axis * sign).max()
+        entry = points[0] + entry_direction * (extreme - sign * (points[0] @ axis)) / abs(entry_direction @ axis)
+        
+        if hole_type == 'blind':
+            # Girişten itibaren yol boyunca depth kadar ilerle
+            path = np.vstack([entry + entry_direction * radius, entry, points])
+            lengths = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(path[1:], axis=0), axis=1))])
+            end = np.searchsorted(lengths, float(depth))
+            if end < len(lengths):
+                t = (float(depth) - lengths[end - 1]) / (lengths[end] - lengths[end - 1])
+                tip = path[end] + t * (path[end + 1] - path[end])
+                path = np.vstack([path[:end + 1], tip])
+        else:
+            path = np.vstack([points[0] + entry_direction * reach, points, points[-1] + exit_direction * reach])
+        
+        cutters = [csg.sweep_tube(path, radius)]
+        
+        # Havşa: tabanı giriş yüzeyinde, ucu yol boyunca içeri bakan koni
+        if hole_type == 'countersink':
+            cone_height = diameter * 0.5
+            margin = cone_height * 0.25
+            cone = trimesh.creation.cone(
+                radius=radius * 1.5 * (cone_height + margin) / cone_height,
+                height=cone_height + margin,
+                sections=32
+            )
+            cone.apply_transform(trimesh.geometry.align_vectors([0, 0, 1], -entry_direction))
+            cone.apply_translation(entry + entry_direction * margin)
+            cutters.append(cone)
+        
+        return cutters
+    
+    def drill_hole(self, diameter=2.0, depth=5.0, position='center', hole_type='through', count=1,
+                   min_wall=0.8):
         """
         Modele delik del (boolean difference ile)
         
+        Tüm kesiciler (delikler, havşalar) önce oluşturulur, tek seferde
+        birleştirilip kabuktan tek bir fark işlemiyle çıkarılır. Modele
+        değmeyen kesiciler boolean'a girmez; fark yalnızca kesicilerin
+        çevresindeki dilimde hesaplanıp kabuğa geri dikişlenir.
+        
+        position='canal' düz silindir yerine kanal merkez eğrisini izleyen
+        tek bir vent/tüp deler (count kullanılmaz).
+        
         Args:
             diameter: Delik çapı (mm)
             depth: Delik derinliği (mm)
-            position: Delik konumu ('center', 'top', 'side', 'custom')
+            position: Delik konumu ('center', 'top', 'side', 'custom', 'canal')
             hole_type: Delik tipi ('through', 'blind', 'countersink')
             count: Delik sayısı
+            min_wall: Kanal deliğinde kabuğa kalacak en az duvar kalınlığı (mm)
         
         Returns:
             bool: Başarılı/başarısız
         """
+        self._mark_modified()
         try:
-            # Model merkezini ve boyutlarını al
-            bounds = self.mesh.bounds
-            center = self.mesh.centroid
-            size = bounds[1] - bounds[0]
-            
-            # Delik pozisyonunu belirle
-            if position == 'center':
-                hole_position = center.copy()
-            elif position == 'top':
-                hole_position = center.copy()
-                hole_position[2] = bounds[1][2] - (depth / 2 if hole_type == 'blind' else 0)
-            elif position == 'side':
-                hole_position = center.copy()
-                hole_position[0] = bounds[1][0] - (depth / 2 if hole_type == 'blind' else 0)
+            if position == 'canal':
+                cutters = self._canal_cutters(diameter, depth, hole_type, min_wall)
             else:
-                hole_position = center.copy()
-            
-            # Delik sayısına göre işlem yap
-            for i in range(int(count)):
-                # Delik için silindir oluştur
-                radius = float(diameter) / 2.0
-                
-                # Through hole için modelin tamamını geçecek uzunlukta silindir
-                if hole_type == 'through':
-                    cylinder_height = max(size) * 2  # Modelden daha uzun
-                else:
-                    cylinder_height = float(depth)
-                
-                # Silindir mesh'i oluştur
-                cylinder = trimesh.creation.cylinder(
-                    radius=radius,
-                    height=cylinder_height,
-                    sections=32  # Daha yuvarlak delik için
-                )
-                
-                # Silindir pozisyonunu ayarla
-                if position == 'center' or position == 'top':
-                    # Z ekseni boyunca (yukarıdan aşağıya)
-                    cylinder_pos = hole_position.copy()
-                    if i > 0:
-                        # Çoklu delik için yan yana yerleştir
-                        offset = (i - (count - 1) / 2) * (diameter * 2)
-                        cylinder_pos[0] += offset
-                elif position == 'side':
-                    # X ekseni boyunca (yandan)
-                    cylinder_pos = hole_position.copy()
-                    # Silindiri X eksenine göre döndür
-                    rotation_matrix = trimesh.transformations.rotation_matrix(
-                        np.pi / 2,
-                        [0, 1, 0]
-                    )
-                    cylinder.apply_transform(rotation_matrix)
-                    if i > 0:
-                        offset = (i - (count - 1) / 2) * (diameter * 2)
-                        cylinder_pos[1] += offset
-                
-                # Silindiri konumlandır
-                translation = trimesh.transformations.translation_matrix(cylinder_pos)
-                cylinder.apply_transform(translation)
-                
-                # Boolean difference ile delik del
-                try:
-                    self.mesh = self.mesh.difference(cylinder)
-                except:
-                    # Boolean işlemi başarısız olursa, alternatif yöntem
-                    print(f"Boolean difference başarısız, delik {i+1} atlanıyor")
-                    continue
-                
-                # Countersink için ek koni ekle
-                if hole_type == 'countersink' and i == 0:
-                    cone_radius = radius * 1.5
-                    cone_height = diameter * 0.5
-                    cone = trimesh.creation.cone(
-                        radius=cone_radius,
-                        height=cone_height,
-                        sections=32
-                    )
-                    cone_pos = hole_position.copy()
-                    cone_pos[2] += cylinder_height / 2
-                    cone_translation = trimesh.transformations.translation_matrix(cone_pos)
-                    cone.apply_transform(cone_translation)
-                    try:
-                        self.mesh = self.mesh.difference(cone)
-                    except:
-                        print("Countersink koni eklenemedi")
-            
+                cutters = self._drill_cutters(diameter, depth, position, hole_type, count)
+            self.mesh, used = csg.subtract(self.mesh, cutters)
+            if used < len(cutters):
+                print(f"{len(cutters) - used} kesici modele değmediği için atlandı")
             return True
             
         except Exception as e:
@@ -313,6 +641,28 @@ class ModelProcessor:
         self.mesh.export(output_path)
         return output_path
     
+    def export_file(self, file_type='stl'):
+        """
+        Modeli bellek içi (büyükse diske taşan) tampona export et
+        
+        Dönen nesne doğrudan FileField.save() ile storage'a aktarılır;
+        ara geçici dosya ve ek kopya oluşmaz.
+        
+        Args:
+            file_type: Export formatı ('stl', 'ply' veya kompakt 'nwm')
+        
+        Returns:
+            Başa sarılmış django File nesnesi
+        """
+        max_size = getattr(settings, 'PROCESSING_SPOOL_MAX_BYTES', 64 * 1024 * 1024)
+        if file_type == mesh_format.EXTENSION:
+            return mesh_format.export_file(self.mesh, max_size)
+        
+        buffer = tempfile.SpooledTemporaryFile(max_size=max_size)
+        self.mesh.export(file_obj=buffer, file_type=file_type)
+        buffer.seek(0)
+        return File(buffer)
+    
     def get_stats(self):
         """Model istatistiklerini al"""
         return {
@@ -1,3 +1,410 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import trimesh
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.services import deformation
+from apps.core.services.mesh_cache import mesh_cache
+from apps.models.models import Model3D, ModelAnalysis, ProcessingJob
+from apps.processing import versions
+from apps.processing.jobs import cancel_job, claim_next_job, enqueue_job, recover_stale_jobs, run_job
+from apps.processing.operations import get_operation
+from apps.processing.services import canal_tip
+from apps.visualization.services.lod import update_lods
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+# z ekseni etrafında 90°
+QUARTER_TURN = {'x_angle': 0.0, 'y_angle': 0.0, 'z_angle': 90.0}
+
+
+def sphere_upload(name='sphere.stl'):
+    buffer = io.BytesIO()
+    trimesh.creation.icosphere(subdivisions=2, radius=10.0).export(buffer, file_type='stl')
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+def quarter_turns(mesh, count):
+    """Mesh'i z ekseni etrafında count kez 90° döndür (beklenen sonuç)"""
+    mesh = mesh.copy()
+    for _ in range(count):
+        mesh.apply_transform(trimesh.transformations.rotation_matrix(np.pi / 2, [0, 0, 1]))
+    return mesh
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ProcessingTestCase(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        mesh_cache.clear()
+        versions.version_cache.clear()
+
+    def create_model(self, name='model'):
+        return Model3D.objects.create(name=name, original_file=sphere_upload())
+
+    def run_next(self):
+        job = claim_next_job('test')
+        self.assertIsNotNone(job)
+        return run_job(job)
+
+    def rotate(self, model, times=1):
+        for _ in range(times):
+            enqueue_job(model, 'rotation', QUARTER_TURN)
+            job = self.run_next()
+            self.assertEqual(job.status, 'completed', job.error_message)
+        model.refresh_from_db()
+
+
+class JobQueueTests(ProcessingTestCase):
+
+    def test_run_job_creates_current_step(self):
+        model = self.create_model()
+        original = mesh_cache.key_for(model.original_file.path)
+
+        job = enqueue_job(model, 'rotation', QUARTER_TURN)
+        job = self.run_next()
+
+        model.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(model.current_step_id, job.step_id)
+        self.assertNotEqual(mesh_cache.key_for(model.current_file.path), original)
+
+    def test_unknown_step_type_is_rejected(self):
+        model = self.create_model()
+        with self.assertRaises(ValueError):
+            enqueue_job(model, 'teleport', {})
+        self.assertFalse(ProcessingJob.objects.exists())
+
+    def test_jobs_of_one_model_run_in_order(self):
+        first_model, other_model = self.create_model('a'), self.create_model('b')
+        first = enqueue_job(first_model, 'rotation', QUARTER_TURN)
+        second = enqueue_job(first_model, 'rotation', QUARTER_TURN)
+        other = enqueue_job(other_model, 'rotation', QUARTER_TURN)
+
+        # İlk görev çalışırken aynı modelin sıradaki görevi atlanır
+        self.assertEqual(claim_next_job('w1').pk, first.pk)
+        self.assertEqual(claim_next_job('w2').pk, other.pk)
+        self.assertIsNone(claim_next_job('w3'))
+
+        run_job(ProcessingJob.objects.get(pk=first.pk))
+        claimed = claim_next_job('w3')
+        self.assertEqual(claimed.pk, second.pk)
+        second = run_job(claimed)
+
+        # İkinci görev ilkinin sonucuna uygulanır
+        self.assertEqual(second.step.parent_id, ProcessingJob.objects.get(pk=first.pk).step_id)
+
+    def test_cancelled_job_is_not_claimed(self):
+        model = self.create_model()
+        job = enqueue_job(model, 'rotation', QUARTER_TURN)
+
+        self.assertTrue(cancel_job(job))
+        self.assertIsNone(claim_next_job('test'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'cancelled')
+        self.assertFalse(cancel_job(job))
+
+    @override_settings(PROCESSING_JOB_STALE_SECONDS=60)
+    def test_stale_running_job_is_failed_and_unblocks_model(self):
+        model = self.create_model()
+        stale = enqueue_job(model, 'rotation', QUARTER_TURN)
+        queued = enqueue_job(model, 'rotation', QUARTER_TURN)
+        claim_next_job('crashed')
+        ProcessingJob.objects.filter(pk=stale.pk).update(heartbeat_at=timezone.now() - timedelta(minutes=5))
+
+        self.assertEqual(claim_next_job('test').pk, queued.pk)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, 'failed')
+        self.assertEqual(recover_stale_jobs(), 0)
+
+    def test_committing_job_cannot_be_cancelled(self):
+        model = self.create_model()
+        job = enqueue_job(model, 'rotation', QUARTER_TURN)
+        cancelled = []
+
+        # Önizleme güncellenirken (sonuç kaydedildikten sonra) iptal istenir
+        def cancel_during_commit(*args, **kwargs):
+            cancelled.append(cancel_job(job))
+        with mock.patch('apps.processing.jobs.update_lods', cancel_during_commit):
+            job = self.run_next()
+
+        model.refresh_from_db()
+        self.assertEqual(cancelled, [False])
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(model.current_step_id, job.step_id)
+
+    @override_settings(PROCESSING_JOB_STALE_SECONDS=60)
+    def test_recovered_job_is_not_marked_completed(self):
+        model = self.create_model()
+        job = enqueue_job(model, 'rotation', QUARTER_TURN)
+
+        # Görev uzun süre sinyal vermeden kayıt aşamasında kalır
+        def stall(*args, **kwargs):
+            ProcessingJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(minutes=5))
+            self.assertEqual(recover_stale_jobs(), 1)
+        with mock.patch('apps.processing.jobs.update_analysis', stall):
+            job = self.run_next()
+
+        self.assertEqual(job.status, 'failed')
+
+    @override_settings(ANALYSIS_BULK_PROCESSES=1)
+    def test_bulk_analysis_runs_as_one_job(self):
+        models = [self.create_model('a'), self.create_model('b')]
+        url = reverse('analysis:bulk_analyze')
+
+        response = self.client.post(url, '{}', content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['models'], 2)
+        job = self.run_next()
+
+        self.assertEqual(job.status, 'completed', job.error_message)
+        self.assertEqual(job.result['analyzed'], 2)
+        self.assertIn('models_per_second', job.result)
+        self.assertEqual(ModelAnalysis.objects.filter(model__in=models).count(), 2)
+
+        # Analizi olan modeller istekte elenir; eskimişlik worker'da denetlenir
+        self.assertEqual(self.client.post(url, '{}', content_type='application/json').json()['models'], 0)
+        self.client.post(url, '{"include_stale": true}', content_type='application/json')
+        self.assertEqual(self.run_next().result['analyzed'], 0)
+
+    def test_failed_operation_marks_job_failed(self):
+        model = self.create_model()
+        enqueue_job(model, 'cutting', {
+            'cut_plane': 'xy', 'position': 150.0, 'direction': 'above', 'tilt_x': 0.0, 'tilt_y': 0.0,
+        })
+        job = self.run_next()
+
+        model.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIsNone(model.current_step)
+
+
+@override_settings(
+    VERSION_RECENT_ARTIFACTS=1,
+    VERSION_KEYFRAME_INTERVAL=100,
+    VERSION_KEYFRAME_MAX_REPLAY_SECONDS=1000.0,
+)
+class VersionTreeTests(ProcessingTestCase):
+
+    def assertMeshMatches(self, mesh, turns):
+        original = trimesh.creation.icosphere(subdivisions=2, radius=10.0)
+        np.testing.assert_allclose(
+            np.sort(mesh.vertices, axis=0), np.sort(quarter_turns(original, turns).vertices, axis=0), atol=1e-4
+        )
+
+    def drain(self):
+        """Kuyruktaki görevleri (sürüm değiştirme dahil) çalıştır"""
+        while (job := claim_next_job('test')) is not None:
+            job = run_job(job)
+            self.assertEqual(job.status, 'completed', job.error_message)
+
+    def test_undo_and_redo_walk_the_history(self):
+        model = self.create_model()
+        self.rotate(model, 3)
+        third = model.current_step
+        second = versions.VersionTree(model).version_parent(third)
+        first = versions.VersionTree(model).version_parent(second)
+
+        self.assertEqual(versions.undo(model)[0], second)
+        self.assertEqual(versions.undo(model)[0], first)
+        self.assertEqual(versions.redo(model)[0], second)
+        self.assertEqual(versions.redo(model)[0], third)
+        with self.assertRaises(ValueError):
+            versions.redo(model)
+
+        self.drain()
+        model.refresh_from_db()
+        self.assertEqual(model.current_step, third)
+
+    def test_undo_within_artifact_window_switches_immediately(self):
+        model = self.create_model()
+        self.rotate(model, 3)
+        second = versions.VersionTree(model).version_parent(model.current_step)
+
+        step, job = versions.undo(model)
+        model.refresh_from_db()
+        self.assertEqual(step, second)
+        self.assertEqual(model.current_step, second)
+        self.assertEqual(job.step_type, 'checkout')
+        self.assertEqual(job.status, 'queued')
+
+    def test_undo_to_original(self):
+        model = self.create_model()
+        self.rotate(model)
+
+        self.assertIsNone(versions.undo(model)[0])
+        model.refresh_from_db()
+        self.assertEqual(model.current_file.name, model.original_file.name)
+        with self.assertRaises(ValueError):
+            versions.undo(model)
+
+    def test_new_job_after_undo_starts_a_branch(self):
+        model = self.create_model()
+        self.rotate(model, 2)
+        abandoned = model.current_step
+        first, _ = versions.undo(model)
+        self.drain()
+
+        self.rotate(model)
+        branch = model.current_step
+        self.assertEqual(branch.parent_id, first.id)
+
+        # Yineleme dalın en yeni sürümüne gider
+        self.assertEqual(versions.undo(model)[0], first)
+        self.assertEqual(versions.redo(model)[0], branch)
+        self.assertNotEqual(branch, abandoned)
+
+    def test_pruned_versions_are_replayed_in_worker(self):
+        model = self.create_model()
+        self.rotate(model, 3)
+        tree = versions.VersionTree(model)
+        second = tree.version_parent(model.current_step)
+        first = tree.version_parent(second)
+
+        # Yalnızca son ata sürümün dosyası tutulur
+        self.assertTrue(versions.has_artifact(second))
+        self.assertFalse(versions.has_artifact(first))
+        self.assertMeshMatches(versions.checkout(model, first), 1)
+
+        versions.undo(model)
+        step, job = versions.undo(model)
+        self.assertEqual(step, first)
+
+        # İstekte kurulmaz; işaretçi görev bitene kadar taşınmaz
+        model.refresh_from_db()
+        first.refresh_from_db()
+        self.assertEqual(model.current_step, second)
+        self.assertFalse(versions.has_artifact(first))
+
+        self.drain()
+        model.refresh_from_db()
+        first.refresh_from_db()
+        self.assertEqual(model.current_step, first)
+        self.assertTrue(versions.has_artifact(first))
+        self.assertMeshMatches(mesh_cache.load(model.current_file.path), 1)
+
+    def test_prune_keeps_keyframes(self):
+        model = self.create_model()
+        self.rotate(model, 3)
+        tree = versions.VersionTree(model)
+        first = tree.version_parent(tree.version_parent(model.current_step))
+        versions.materialize(model, first, tree)
+        first.is_keyframe = True
+        first.save(update_fields=['is_keyframe'])
+
+        self.assertEqual(versions.prune_artifacts(model, model.current_step), 0)
+        first.refresh_from_db()
+        self.assertTrue(versions.has_artifact(first))
+
+    def test_job_finishing_after_undo_is_not_committed(self):
+        model = self.create_model()
+        self.rotate(model, 2)
+        enqueue_job(model, 'rotation', QUARTER_TURN)
+        job = claim_next_job('test')
+
+        # Görev çalışırken kullanıcı geri alır
+        first, _ = versions.undo(model)
+        job = run_job(job)
+
+        model.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(model.current_step, first)
+        self.assertEqual(model.processing_steps.count(), 2)
+
+
+class DrillingParametersTests(SimpleTestCase):
+
+    def parse(self, data):
+        return get_operation('drilling')['parse'](data)
+
+    def test_defaults(self):
+        params = self.parse({})
+        self.assertEqual((params['position'], params['hole_type'], params['count']), ('center', 'through', 1))
+
+    def test_invalid_values_are_rejected(self):
+        for data in (
+            {'diameter': 0},
+            {'depth': -1},
+            {'count': 0},
+            {'position': 'bottom'},
+            {'hole_type': 'tapped'},
+        ):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                self.parse(data)
+
+
+@override_settings(MESH_LOD_RATIOS=[0.5], MESH_LOD_MIN_FACES=50)
+class UploadJobTests(ProcessingTestCase):
+
+    def upload(self, **data):
+        response = self.client.post(reverse('models:model_upload'), {'name': 'tarama', 'file': sphere_upload(), **data})
+        self.assertEqual(response.status_code, 302)
+        return Model3D.objects.get(name='tarama')
+
+    def test_upload_does_not_load_mesh_in_request(self):
+        with mock.patch.object(mesh_cache, 'load', side_effect=AssertionError('istekte mesh yüklendi')):
+            model = self.upload(normalize='1')
+
+        job = ProcessingJob.objects.get(model=model)
+        self.assertEqual(job.step_type, 'lod')
+        job = self.run_next()
+        self.assertEqual(job.status, 'completed', job.error_message)
+        self.assertTrue(model.lods.exists())
+        self.assertIsNone(Model3D.objects.get(pk=model.pk).current_step)
+
+    @override_settings(UPLOAD_FACE_BUDGET=200)
+    def test_scan_over_budget_is_decimated_in_job(self):
+        model = self.upload(normalize='1')
+        job = self.run_next()
+
+        model.refresh_from_db()
+        self.assertEqual(job.status, 'completed', job.error_message)
+        self.assertEqual(model.current_step.step_type, 'decimation')
+        self.assertEqual(job.step_id, model.current_step_id)
+        self.assertLessEqual(len(mesh_cache.load(model.current_file.path).faces), 200)
+
+    @override_settings(UPLOAD_FACE_BUDGET=1000)
+    def test_scan_within_budget_is_kept(self):
+        model = self.upload(normalize='1')
+        self.assertEqual(self.run_next().status, 'completed')
+
+        model.refresh_from_db()
+        self.assertIsNone(model.current_step)
+
+
+@override_settings(MESH_LOD_RATIOS=[0.5], MESH_LOD_MIN_FACES=50)
+class BulgeRegionTests(ProcessingTestCase):
+
+    def test_preview_level_uses_full_resolution_tip(self):
+        model = self.create_model()
+        update_lods(model)
+        lod = model.lods.get()
+        full = mesh_cache.load(model.current_file.path)
+        coarse = mesh_cache.load(lod.file.path)
+
+        response = self.client.post(
+            reverse('processing:bulge_region', kwargs={'model_id': model.id}) + '?lod=coarse',
+            '{"radius": 6.0, "amount": 0.5}', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.content
+        count = int(np.frombuffer(data[:4], dtype='<u4')[0])
+        indices = np.frombuffer(data[4:4 + 4 * count], dtype='<u4')
+
+        # Uç tam çözünürlükte bulunur, bölge önizleme seviyesinde hesaplanır
+        expected, _ = deformation.bulge(coarse, canal_tip(full)[0], 6.0, 0.5)
+        np.testing.assert_array_equal(indices, expected)
@@ -10,10 +10,21 @@ urlpatterns = [
     path('<uuid:model_id>/smooth/', views.smooth_model, name='smooth_model'),
     path('<uuid:model_id>/fill-holes/', views.fill_holes, name='fill_holes'),
     path('<uuid:model_id>/ovalize/', views.ovalize_model, name='ovalize_model'),
+    path('<uuid:model_id>/decimate/', views.decimate_model, name='decimate_model'),
+    path('<uuid:model_id>/bulge/', views.bulge_model, name='bulge_model'),
+    path('<uuid:model_id>/bulge/region/', views.bulge_region, name='bulge_region'),
     path('<uuid:model_id>/drill/', views.drill_hole, name='drill_hole'),
     # API endpoints
     path('<uuid:model_id>/save-step/', views.save_processing_step, name='save_step'),
     path('<uuid:model_id>/complete/', views.complete_processing, name='complete'),
+    path('<uuid:model_id>/undo/', views.undo_step, name='undo'),
+    path('<uuid:model_id>/redo/', views.redo_step, name='redo'),
+    path('<uuid:model_id>/checkout/', views.checkout_version, name='checkout'),
+    path('<uuid:model_id>/pipeline/', views.run_pipeline, name='pipeline'),
+    path('<uuid:model_id>/preview/<str:step_type>/', views.preview_operation, name='preview'),
+    path('<uuid:model_id>/jobs/', views.enqueue_processing_job, name='enqueue_job'),
+    path('jobs/<uuid:job_id>/', views.job_status, name='job_status'),
+    path('jobs/<uuid:job_id>/cancel/', views.cancel_processing_job, name='cancel_job'),
 ]
 
 
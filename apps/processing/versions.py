@@ -0,0 +1,272 @@
+"""
+Sürüm geçmişi
+İşlem adımı zincirinden sürüm kurma, geri alma/yineleme ve ara dosyaların budanması
+"""
+import uuid
+
+from django.conf import settings
+
+from apps.core.services import mesh_format
+from apps.core.services.mesh_cache import MeshCache, mesh_cache
+from apps.models.models import Model3D, ProcessingJob
+from .operations import get_operation
+
+# Dosyası olmayan (budanmış veya ara) sürümlerin bellek içi önbelleği;
+# adım kimliğine göre anahtarlanır, sürümler değişmediği için bayatlamaz
+version_cache = MeshCache(getattr(settings, 'VERSION_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+
+def _cache_key(model, step):
+    return f'version:{model.id}:{step.id if step is not None else "original"}'
+
+
+def has_artifact(step) -> bool:
+    """Adımın sonuç dosyası storage'da var mı?"""
+    return bool(step.result_file) and step.result_file.storage.exists(step.result_file.name)
+
+
+class VersionTree:
+    """
+    Modelin adım ağacı (tek sorguyla)
+
+    Sürüm, kullanıcının geri dönebileceği adımdır: bir görevin son
+    adımı veya sonuç dosyası olan adım. İşlem zincirinin (pipeline)
+    ara adımları sürüm değildir; geri alma zinciri tek seferde atlar.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        # Meta.ordering: en yeni adım önce
+        self.steps = list(model.processing_steps.all())
+        self.by_id = {step.id: step for step in self.steps}
+        heads = set(
+            ProcessingJob.objects.filter(model=model, step__isnull=False).values_list('step_id', flat=True)
+        )
+        self.version_ids = {
+            step.id for step in self.steps
+            if step.success and (step.id in heads or step.result_file)
+        }
+
+    def chain(self, step):
+        """Orijinalden adıma kadar adımlar (orijinal için boş liste)"""
+        chain = []
+        while step is not None:
+            chain.append(step)
+            step = self.by_id.get(step.parent_id)
+        chain.reverse()
+        return chain
+
+    def version_parent(self, step):
+        """Adımdan önceki sürüm (None: orijinal)"""
+        step = self.by_id.get(step.parent_id)
+        while step is not None and step.id not in self.version_ids:
+            step = self.by_id.get(step.parent_id)
+        return step
+
+    def undo_target(self, step):
+        if step is None:
+            raise ValueError('Geri alınacak işlem yok')
+        return self.version_parent(step)
+
+    def redo_target(self, step):
+        """Güncel sürümden türeyen en yeni sürüm"""
+        current_id = step.id if step is not None else None
+        for candidate in self.steps:
+            if candidate.id not in self.version_ids:
+                continue
+            parent = self.version_parent(candidate)
+            if (parent.id if parent is not None else None) == current_id:
+                return candidate
+        raise ValueError('Yinelenecek işlem yok')
+
+    def steps_since_keyframe(self, step):
+        """Adımdan geriye en yakın keyframe'e (veya orijinale) kadar adımlar"""
+        since = []
+        while step is not None and not step.is_keyframe:
+            since.append(step)
+            step = self.by_id.get(step.parent_id)
+        return since
+
+
+def checkout(model, step, tree=None):
+    """
+    Sürümün mesh'ini kur
+
+    Sırasıyla sürüm önbelleğine, adımın kendi dosyasına ve zincirde
+    geriye doğru en yakın önbellekteki veya dosyalı ataya bakılır;
+    oradan sonraki adımların kayıtlı parametreleri yeniden oynatılır.
+    Kurulan mesh sürüm önbelleğine eklenir.
+
+    Args:
+        model: Model3D
+        step: ProcessingStep (None ise orijinal tarama)
+        tree: Hazır VersionTree (yoksa kurulur)
+
+    Returns:
+        trimesh.Trimesh
+    """
+    from .services import ModelProcessor
+
+    if step is None:
+        return mesh_cache.load(model.original_file.path)
+    chain = (tree or VersionTree(model)).chain(step)
+
+    base, start = None, 0
+    for index in range(len(chain) - 1, -1, -1):
+        base = version_cache.get(_cache_key(model, chain[index]))
+        if base is None and has_artifact(chain[index]):
+            base = mesh_cache.load(chain[index].result_file.path)
+        if base is not None:
+            start = index + 1
+            break
+    if base is None:
+        base = mesh_cache.load(model.original_file.path)
+    if start == len(chain):
+        return base
+
+    processor = ModelProcessor(mesh=base)
+    for item in chain[start:]:
+        operation = get_operation(item.step_type)
+        if not operation['apply'](processor, item.parameters):
+            raise ValueError(f'Sürüm yeniden kurulamadı: {operation["error"]}')
+    version_cache.remember(_cache_key(model, step), processor.mesh)
+    return processor.mesh
+
+
+def materialize(model, step, tree=None):
+    """Dosyası olmayan sürümü kurup sonuç dosyası olarak kaydet"""
+    mesh = checkout(model, step, tree)
+    max_size = getattr(settings, 'PROCESSING_SPOOL_MAX_BYTES', 64 * 1024 * 1024)
+    prefix = get_operation(step.step_type)['file_prefix']
+    step.result_file.save(
+        f'{prefix}_{model.id}_{step.id}.{mesh_format.EXTENSION}',
+        mesh_format.export_file(mesh, max_size),
+        save=False
+    )
+    step.save(update_fields=['result_file'])
+    mesh_cache.put(step.result_file.path, mesh)
+
+
+def pending_checkout(model):
+    """Modelin sıradaki veya çalışan en yeni sürüm değiştirme görevi (yoksa None)"""
+    return ProcessingJob.objects.filter(
+        model=model, step_type='checkout', status__in=ProcessingJob.ACTIVE_STATUSES
+    ).order_by('-created_at').first()
+
+
+def requested_step(model, tree):
+    """
+    Kullanıcının son seçtiği sürüm
+
+    Bekleyen sürüm değiştirme görevi varsa onun hedefi, yoksa modelin
+    güncel adımı; art arda geri almalar henüz kurulmamış sürümden devam eder.
+    """
+    job = pending_checkout(model)
+    if job is None:
+        return model.current_step
+    step_id = job.parameters.get('step_id')
+    return tree.by_id.get(uuid.UUID(step_id)) if step_id else None
+
+
+def set_current(model, step, tree=None):
+    """
+    Modelin güncel sürümünü değiştir
+
+    Web isteğinde hiçbir şey hesaplanmaz. Dosyası olan sürümde (son
+    VERSION_RECENT_ARTIFACTS ata, keyframe'ler, dallanma uçları)
+    işaretçi hemen taşınır. Önizleme seviyeleri ve analiz 'checkout'
+    görevinde sürümle birlikte taşınır; görev bitene kadar
+    görüntüleyici tam çözünürlüğü gösterir. Budanmış sürüm görevde
+    keyframe'den kurulur ve işaretçi ancak o zaman taşınır. Önceki bir
+    sürüm değiştirme görevi beklerken işaretçi de görevle taşınır
+    (görevler sırayla çalıştığından son istek kazanır).
+
+    Returns:
+        Kuyruğa eklenen 'checkout' ProcessingJob'u
+    """
+    from .jobs import enqueue_job
+
+    if pending_checkout(model) is None and (step is None or has_artifact(step)):
+        Model3D.objects.filter(pk=model.pk).update(current_step=step)
+        model.current_step = step
+    return enqueue_job(model, 'checkout', {'step_id': str(step.id) if step is not None else None})
+
+
+def checkout_step(model, step, tree=None, report=None):
+    """
+    Sürümü kur ve güncel yap ('checkout' görevi, worker'da)
+
+    Dosyası budanmış sürüm keyframe'den yeniden oynatılarak kaydedilir.
+    İşaretçi taşınmadan önce görev kayıt aşamasına geçer (report verilmişse).
+    """
+    if step is not None and not has_artifact(step):
+        materialize(model, step, tree)
+    if report is not None:
+        report(50, 'Sürüm güncel yapılıyor', commit=True)
+    Model3D.objects.filter(pk=model.pk).update(current_step=step)
+    model.current_step = step
+
+
+def undo(model):
+    """
+    Son seçilen sürümden bir önceki sürüme dön
+
+    Returns:
+        (hedef adım veya orijinal için None, 'checkout' görevi)
+    """
+    tree = VersionTree(model)
+    target = tree.undo_target(requested_step(model, tree))
+    return target, set_current(model, target, tree)
+
+
+def redo(model):
+    """
+    Geri alınan en yeni sürümü yeniden güncel yap
+
+    Returns:
+        (hedef adım, 'checkout' görevi)
+    """
+    tree = VersionTree(model)
+    target = tree.redo_target(requested_step(model, tree))
+    return target, set_current(model, target, tree)
+
+
+def is_keyframe_due(tree, parent, new_steps):
+    """
+    Yeni sürüm keyframe olarak tutulmalı mı?
+
+    Son keyframe'den (veya orijinalden) bu yana adım sayısı ya da
+    yeniden oynatma süresi sınırı aşınca sürümün dosyası kalıcı olur;
+    böylece hiçbir sürümün kurulması bu sınırdan uzun sürmez.
+    """
+    since = tree.steps_since_keyframe(parent) + list(new_steps)
+    interval = getattr(settings, 'VERSION_KEYFRAME_INTERVAL', 4)
+    max_replay = getattr(settings, 'VERSION_KEYFRAME_MAX_REPLAY_SECONDS', 20.0)
+    return len(since) >= interval or sum(step.execution_time for step in since) >= max_replay
+
+
+def prune_artifacts(model, head, tree=None):
+    """
+    Güncel sürümün eski ata sürümlerinin dosyalarını sil
+
+    Son VERSION_RECENT_ARTIFACTS ata sürüm (birkaç geri alma anında
+    yapılsın diye) ve keyframe'ler tutulur. Dallanma uçları atası
+    olmadığından etkilenmez. Budanan sürümler gerektiğinde en yakın
+    keyframe'den yeniden oynatılarak kurulur.
+
+    Returns:
+        Dosyası silinen adım sayısı
+    """
+    tree = tree or VersionTree(model)
+    keep = getattr(settings, 'VERSION_RECENT_ARTIFACTS', 2)
+    pruned = 0
+    step = tree.version_parent(head)
+    depth = 0
+    while step is not None:
+        depth += 1
+        if depth > keep and not step.is_keyframe and step.result_file:
+            step.result_file.delete(save=False)
+            step.save(update_fields=['result_file'])
+            pruned += 1
+        step = tree.version_parent(step)
+    return pruned
@@ -1,15 +1,28 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.conf import settings
 from django.contrib import messages
-from django.http import JsonResponse
+from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
 from django.views.decorators.http import require_POST
 import json
-from apps.models.models import Model3D, ProcessingStep
+import numpy as np
+from apps.core.services import deformation
+from apps.core.services.mesh_cache import mesh_cache
+from apps.models.models import Model3D, ProcessingStep, ProcessingJob, ProcessedModel
+from .jobs import enqueue_job, cancel_job
+from .operations import get_operation, parse_pipeline
+from .preview import preview_source, run_preview, preview_cache_key
+from .services import file_canal_tip
+from . import versions
 
 
 def processing_dashboard(request, model_id):
     """İşleme kontrol paneli"""
     model = get_object_or_404(Model3D, id=model_id)
     steps = model.processing_steps.all()
+    tree = versions.VersionTree(model)
     
     # İşlem istatistikleri
     stats = {
@@ -19,101 +32,131 @@ def processing_dashboard(request, model_id):
         'fill_holes_count': steps.filter(step_type='fill_holes').count(),
         'smoothing_count': steps.filter(step_type='smoothing').count(),
         'ovalization_count': steps.filter(step_type='ovalization').count(),
+        'bulging_count': steps.filter(step_type='bulging').count(),
         'drilling_count': steps.filter(step_type='drilling').count(),
+        'decimation_count': steps.filter(step_type='decimation').count(),
     }
     
+    # Güncel sürüme giden zincir; dışındaki adımlar geri alınmış dallardır
+    current_chain = {step.id for step in tree.chain(model.current_step)}
+    
     return render(request, 'processing/dashboard.html', {
         'model': model,
         'steps': steps,
-        'stats': stats
+        'stats': stats,
+        'current_chain': current_chain,
+        'version_ids': tree.version_ids,
+        'can_undo': versions.requested_step(model, tree) is not None,
+        'can_redo': _has_redo(tree, versions.requested_step(model, tree)),
     })
 
 
+def _has_redo(tree, step):
+    try:
+        tree.redo_target(step)
+    except ValueError:
+        return False
+    return True
+
+
+def _version_response(model, step, job):
+    """
+    Sürüm değişikliği yanıtı
+
+    switched False ise sürüm (budanmış) 'checkout' görevinde kurulacak;
+    istemci görevi bekler. Önizleme ve analiz her durumda görevde taşınır.
+    """
+    return JsonResponse(dict(
+        _job_payload(job),
+        current_step=str(step.id) if step is not None else None,
+        switched=model.current_step_id == (step.id if step is not None else None),
+    ), status=202)
+
+
+@require_POST
+def undo_step(request, model_id):
+    """Son işlemi geri al (API endpoint)"""
+    model = get_object_or_404(Model3D, id=model_id)
+    try:
+        step, job = versions.undo(model)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=409)
+    return _version_response(model, step, job)
+
+
+@require_POST
+def redo_step(request, model_id):
+    """Geri alınan işlemi yinele (API endpoint)"""
+    model = get_object_or_404(Model3D, id=model_id)
+    try:
+        step, job = versions.redo(model)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=409)
+    return _version_response(model, step, job)
+
+
+@require_POST
+def checkout_version(request, model_id):
+    """
+    Geçmişteki herhangi bir sürümü güncel yap (API endpoint)
+    
+    step_id boşsa orijinal taramaya dönülür. Dosyası budanmış sürüm
+    worker'da en yakın keyframe'den yeniden kurulur.
+    """
+    model = get_object_or_404(Model3D, id=model_id)
+    try:
+        step_id = json.loads(request.body or '{}').get('step_id')
+        step = get_object_or_404(ProcessingStep, id=step_id, model=model) if step_id else None
+        job = versions.set_current(model, step)
+    except (ValueError, ValidationError) as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return _version_response(model, step, job)
+
+
+def _job_payload(job):
+    """Görev durumunu JSON yanıtına dönüştür"""
+    payload = {
+        'success': job.status != 'failed',
+        'job_id': str(job.id),
+        'step_type': job.step_type,
+        'status': job.status,
+        'progress': job.progress,
+        'message': job.message,
+        'status_url': reverse('processing:job_status', kwargs={'job_id': job.id}),
+        'cancel_url': reverse('processing:cancel_job', kwargs={'job_id': job.id}),
+    }
+    if job.model_id:
+        payload['redirect_url'] = reverse('processing:processing_dashboard', kwargs={'model_id': job.model_id})
+    if job.step_id:
+        payload['step_id'] = str(job.step_id)
+    if job.result is not None:
+        payload['result'] = job.result
+    if job.status == 'failed':
+        payload['error'] = job.error_message
+    return payload
+
+
+def _enqueue_response(request, model, step_type):
+    """İstek parametrelerini ayrıştır, görevi kuyruğa ekle ve hemen yanıt dön"""
+    try:
+        data = json.loads(request.body)
+        parameters = get_operation(step_type)['parse'](data)
+        job = enqueue_job(model, step_type, parameters)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+    
+    return JsonResponse(_job_payload(job), status=202)
+
+
 def rotate_model(request, model_id):
     """Model döndürme"""
     model = get_object_or_404(Model3D, id=model_id)
     
     if request.method == 'POST':
-        try:
-            from .services import ModelProcessor
-            import time
-            import os
-            from django.core.files import File
-            
-            # Parametreleri al
-            data = json.loads(request.body)
-            x_angle = float(data.get('x_angle', 0))
-            y_angle = float(data.get('y_angle', 0))
-            z_angle = float(data.get('z_angle', 0))
-            
-            # İşleme başlama zamanı
-            start_time = time.time()
-            
-            # Model işlemcisini başlat
-            processor = ModelProcessor(model.original_file.path)
-            
-            # Döndürme işlemini uygula
-            success = processor.rotate_model(
-                x_angle=x_angle,
-                y_angle=y_angle,
-                z_angle=z_angle
-            )
-            
-            if not success:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Döndürme işlemi başarısız oldu'
-                }, status=400)
-            
-            # Döndürülmüş modeli kaydet
-            temp_path = processor.save_stl()
-            
-            # ProcessingStep oluştur
-            step = ProcessingStep.objects.create(
-                model=model,
-                step_type='rotation',
-                parameters={
-                    'x_angle': x_angle,
-                    'y_angle': y_angle,
-                    'z_angle': z_angle
-                },
-                execution_time=time.time() - start_time,
-                success=True
-            )
-            
-            # Dosyayı ProcessingStep'e kaydet
-            with open(temp_path, 'rb') as f:
-                step.result_file.save(
-                    f'rotate_{model.id}_{step.id}.stl',
-                    File(f),
-                    save=True
-                )
-            
-            # Temp dosyayı sil
-            os.unlink(temp_path)
-            
-            # Orijinal model dosyasını güncelle
-            with open(step.result_file.path, 'rb') as f:
-                model.original_file.save(
-                    model.original_file.name,
-                    File(f),
-                    save=True
-                )
-            
-            messages.success(request, f'Döndürme işlemi başarıyla tamamlandı! ({step.execution_time:.2f} saniye)')
-            
-            return JsonResponse({
-                'success': True,
-                'step_id': str(step.id),
-                'message': 'Model başarıyla döndürüldü ve kaydedildi',
-                'redirect_url': f'/processing/{model.id}/'
-            })
-            
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            }, status=500)
+        return _enqueue_response(request, model, 'rotation')
     
     return render(request, 'processing/rotate.html', {'model': model})
 
@@ -123,92 +166,7 @@ def cut_model(request, model_id):
     model = get_object_or_404(Model3D, id=model_id)
     
     if request.method == 'POST':
-        try:
-            from .services import ModelProcessor
-            import time
-            import os
-            from django.core.files import File
-            
-            # Parametreleri al
-            data = json.loads(request.body)
-            plane = data.get('cut_plane', 'xy')
-            position = float(data.get('position', 50))
-            direction = data.get('direction', 'above')
-            tilt_x = float(data.get('tilt_x', 0))
-            tilt_y = float(data.get('tilt_y', 0))
-            
-            # İşleme başlama zamanı
-            start_time = time.time()
-            
-            # Model işlemcisini başlat
-            processor = ModelProcessor(model.original_file.path)
-            
-            # Kesme işlemini uygula
-            success = processor.cut_model(
-                plane=plane,
-                position=position,
-                direction=direction,
-                tilt_x=tilt_x,
-                tilt_y=tilt_y
-            )
-            
-            if not success:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Kesme işlemi başarısız oldu'
-                }, status=400)
-            
-            # Kesilmiş modeli kaydet
-            temp_path = processor.save_stl()
-            
-            # ProcessingStep oluştur
-            step = ProcessingStep.objects.create(
-                model=model,
-                step_type='cutting',
-                parameters={
-                    'cut_plane': plane,
-                    'position': position,
-                    'direction': direction,
-                    'tilt_x': tilt_x,
-                    'tilt_y': tilt_y
-                },
-                execution_time=time.time() - start_time,
-                success=True
-            )
-            
-            # Dosyayı ProcessingStep'e kaydet
-            with open(temp_path, 'rb') as f:
-                step.result_file.save(
-                    f'cut_{model.id}_{step.id}.stl',
-                    File(f),
-                    save=True
-                )
-            
-            # Temp dosyayı sil
-            os.unlink(temp_path)
-            
-            # Orijinal model dosyasını güncelle (kesilmiş versiyonla değiştir)
-            with open(step.result_file.path, 'rb') as f:
-                model.original_file.save(
-                    model.original_file.name,
-                    File(f),
-                    save=True
-                )
-            
-            messages.success(request, f'Kesme işlemi başarıyla tamamlandı! ({step.execution_time:.2f} saniye)')
-            
-            return JsonResponse({
-                'success': True,
-                'step_id': str(step.id),
-                'message': 'Model başarıyla kesildi ve kaydedildi',
-                'redirect_url': f'/processing/{model.id}/'
-            })
-            
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            }, status=500)
+        return _enqueue_response(request, model, 'cutting')
     
     return render(request, 'processing/cut.html', {'model': model})
 
@@ -218,84 +176,7 @@ def smooth_model(request, model_id):
     model = get_object_or_404(Model3D, id=model_id)
     
     if request.method == 'POST':
-        try:
-            from .services import ModelProcessor
-            import time
-            import os
-            from django.core.files import File
-            
-            # Parametreleri al
-            data = json.loads(request.body)
-            algorithm = data.get('algorithm', 'laplacian')
-            intensity = int(data.get('intensity', 5))
-            iterations = int(data.get('iterations', 10))
-            preserve_edges = data.get('preserve_edges', True)
-            
-            # İşleme başlama zamanı
-            start_time = time.time()
-            
-            # Model işlemcisini başlat
-            processor = ModelProcessor(model.original_file.path)
-            
-            # Yumuşatma işlemini uygula
-            success = processor.smooth_model(iterations=iterations)
-            
-            if not success:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Yumuşatma işlemi başarısız oldu'
-                }, status=400)
-            
-            # Yumuşatılmış modeli kaydet
-            temp_path = processor.save_stl()
-            
-            # ProcessingStep oluştur
-            step = ProcessingStep.objects.create(
-                model=model,
-                step_type='smoothing',
-                parameters={
-                    'algorithm': algorithm,
-                    'intensity': intensity,
-                    'iterations': iterations,
-                    'preserve_edges': preserve_edges
-                },
-                execution_time=time.time() - start_time,
-                success=True
-            )
-            
-            # Dosyayı ProcessingStep'e kaydet
-            with open(temp_path, 'rb') as f:
-                step.result_file.save(
-                    f'smooth_{model.id}_{step.id}.stl',
-                    File(f),
-                    save=True
-                )
-            
-            # Temp dosyayı sil
-            os.unlink(temp_path)
-            
-            # Orijinal model dosyasını güncelle
-            with open(step.result_file.path, 'rb') as f:
-                model.original_file.save(
-                    model.original_file.name,
-                    File(f),
-                    save=True
-                )
-            
-            messages.success(request, f'Yumuşatma işlemi başarıyla tamamlandı! ({step.execution_time:.2f} saniye)')
-            
-            return JsonResponse({
-                'success': True,
-                'step_id': str(step.id),
-                'message': 'Model başarıyla yumuşatıldı ve kaydedildi',
-                'redirect_url': f'/processing/{model.id}/'
-            })
-            
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            }, status=500)
+        return _enqueue_response(request, model, 'smoothing')
     
     return render(request, 'processing/smooth.html', {'model': model})
 
@@ -303,6 +184,10 @@ def smooth_model(request, model_id):
 def fill_holes(request, model_id):
     """Delik doldurma"""
     model = get_object_or_404(Model3D, id=model_id)
+    
+    if request.method == 'POST':
+        return _enqueue_response(request, model, 'fill_holes')
+    
     return render(request, 'processing/fill_holes.html', {'model': model})
 
 
@@ -311,184 +196,181 @@ def ovalize_model(request, model_id):
     model = get_object_or_404(Model3D, id=model_id)
     
     if request.method == 'POST':
-        try:
-            from .services import ModelProcessor
-            import time
-            import os
-            from django.core.files import File
-            
-            # Parametreleri al
-            data = json.loads(request.body)
-            intensity = int(data.get('intensity', 5))
-            region = data.get('region', 'all')
-            preserve_edges = data.get('preserve_edges', True)
-            
-            # İşleme başlama zamanı
-            start_time = time.time()
-            
-            # Model işlemcisini başlat
-            processor = ModelProcessor(model.original_file.path)
-            
-            # Ovalleştirme işlemini uygula
-            success = processor.ovalize_model(
-                intensity=intensity,
-                preserve_edges=preserve_edges
-            )
-            
-            if not success:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Ovalleştirme işlemi başarısız oldu'
-                }, status=400)
-            
-            # Ovalleştirilmiş modeli kaydet
-            temp_path = processor.save_stl()
-            
-            # ProcessingStep oluştur
-            step = ProcessingStep.objects.create(
-                model=model,
-                step_type='ovalization',
-                parameters={
-                    'intensity': intensity,
-                    'region': region,
-                    'preserve_edges': preserve_edges
-                },
-                execution_time=time.time() - start_time,
-                success=True
-            )
-            
-            # Dosyayı ProcessingStep'e kaydet
-            with open(temp_path, 'rb') as f:
-                step.result_file.save(
-                    f'ovalize_{model.id}_{step.id}.stl',
-                    File(f),
-                    save=True
-                )
-            
-            # Temp dosyayı sil
-            os.unlink(temp_path)
-            
-            # Orijinal model dosyasını güncelle
-            with open(step.result_file.path, 'rb') as f:
-                model.original_file.save(
-                    model.original_file.name,
-                    File(f),
-                    save=True
-                )
-            
-            messages.success(request, f'Ovalleştirme işlemi başarıyla tamamlandı! ({step.execution_time:.2f} saniye)')
-            
-            return JsonResponse({
-                'success': True,
-                'step_id': str(step.id),
-                'message': 'Model başarıyla ovalleştirildi ve kaydedildi',
-                'redirect_url': f'/processing/{model.id}/'
-            })
-            
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            }, status=500)
+        return _enqueue_response(request, model, 'ovalization')
     
     return render(request, 'processing/ovalize.html', {'model': model})
 
 
+def decimate_model(request, model_id):
+    """Seyreltme (face sayısı bütçesi)"""
+    model = get_object_or_404(Model3D, id=model_id)
+    
+    if request.method == 'POST':
+        return _enqueue_response(request, model, 'decimation')
+    
+    analysis = getattr(model, 'analysis', None)
+    return render(request, 'processing/decimate.html', {
+        'model': model,
+        'faces_count': analysis.faces_count if analysis else None,
+        'face_budget': settings.UPLOAD_FACE_BUDGET,
+    })
+
+
+def bulge_model(request, model_id):
+    """Kanal ucu bombeleştirme"""
+    model = get_object_or_404(Model3D, id=model_id)
+    
+    if request.method == 'POST':
+        return _enqueue_response(request, model, 'bulging')
+    
+    return render(request, 'processing/bulge.html', {'model': model})
+
+
+@require_POST
+def bulge_region(request, model_id):
+    """
+    Bombeleştirmenin değiştirdiği vertex'ler (API endpoint)
+    
+    Görüntüleyicideki geometri seviyesi (?lod=) üzerinde yalnızca etki
+    bölgesi hesaplanır ve döner: uint32 sayı, uint32 indeksler, float32
+    konumlar. Yanıt bölge boyutundadır; tam çözünürlükte de etkileşimlidir.
+    Kanal ucu, işlemin kendisiyle aynı olması için her seviyede tam
+    çözünürlüklü güncel mesh'te bulunur (dosya özetiyle önbellekte).
+    """
+    from apps.visualization.services import geometry_encoder
+    from apps.visualization.services.lod import find_lod
+    
+    model = get_object_or_404(Model3D, id=model_id)
+    try:
+        parameters = get_operation('bulging')['parse'](json.loads(request.body))
+        lod, _ = find_lod(model, request.GET.get('lod'))
+        path = lod.file.path if lod is not None else model.current_file.path
+        
+        center, _ = file_canal_tip(model.current_file.path)
+        mesh = mesh_cache.load(path)
+        mesh_hash = mesh_cache.key_for(path)
+        indices, positions = deformation.bulge(
+            mesh, center, parameters['radius'], parameters['amount'], mesh_hash=mesh_hash
+        )
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+    
+    encoding = geometry_encoder.negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+    payload = b''.join([
+        np.uint32(len(indices)).tobytes(),
+        indices.astype('<u4').tobytes(),
+        positions.astype('<f4').tobytes(),
+    ])
+    response = HttpResponse(geometry_encoder.compress(payload, encoding), content_type='application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
 def drill_hole(request, model_id):
     """Delik delme"""
     model = get_object_or_404(Model3D, id=model_id)
     
     if request.method == 'POST':
-        try:
-            from .services import ModelProcessor
-            import time
-            import os
-            from django.core.files import File
-            
-            # Parametreleri al
-            data = json.loads(request.body)
-            diameter = float(data.get('diameter', 2.0))
-            depth = float(data.get('depth', 5.0))
-            position = data.get('position', 'center')
-            hole_type = data.get('hole_type', 'through')
-            count = int(data.get('count', 1))
-            
-            # İşleme başlama zamanı
-            start_time = time.time()
-            
-            # Model işlemcisini başlat
-            processor = ModelProcessor(model.original_file.path)
-            
-            # Delik delme işlemini uygula
-            success = processor.drill_hole(
-                diameter=diameter,
-                depth=depth,
-                position=position,
-                hole_type=hole_type,
-                count=count
-            )
-            
-            if not success:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Delik delme işlemi başarısız oldu'
-                }, status=400)
-            
-            # İşlenmiş modeli kaydet
-            temp_path = processor.save_stl()
-            
-            # ProcessingStep oluştur
-            step = ProcessingStep.objects.create(
-                model=model,
-                step_type='drilling',
-                parameters={
-                    'diameter': diameter,
-                    'depth': depth,
-                    'position': position,
-                    'hole_type': hole_type,
-                    'count': count
-                },
-                execution_time=time.time() - start_time,
-                success=True
-            )
-            
-            # Dosyayı ProcessingStep'e kaydet
-            with open(temp_path, 'rb') as f:
-                step.result_file.save(
-                    f'drill_{model.id}_{step.id}.stl',
-                    File(f),
-                    save=True
-                )
-            
-            # Temp dosyayı sil
-            os.unlink(temp_path)
-            
-            # Orijinal model dosyasını güncelle
-            with open(step.result_file.path, 'rb') as f:
-                model.original_file.save(
-                    model.original_file.name,
-                    File(f),
-                    save=True
-                )
-            
-            messages.success(request, f'Delik delme işlemi başarıyla tamamlandı! ({step.execution_time:.2f} saniye)')
-            
-            return JsonResponse({
-                'success': True,
-                'step_id': str(step.id),
-                'message': 'Delikler başarıyla delindi ve kaydedildi',
-                'redirect_url': f'/processing/{model.id}/'
-            })
-            
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            }, status=500)
+        return _enqueue_response(request, model, 'drilling')
     
     return render(request, 'processing/drill.html', {'model': model})
 
 
+@require_POST
+def enqueue_processing_job(request, model_id):
+    """Herhangi bir işlem tipini kuyruğa ekle (API endpoint)"""
+    model = get_object_or_404(Model3D, id=model_id)
+    try:
+        data = json.loads(request.body)
+        step_type = data.get('step_type')
+        parameters = get_operation(step_type)['parse'](data.get('parameters', {}))
+        job = enqueue_job(model, step_type, parameters)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+    
+    return JsonResponse(_job_payload(job), status=202)
+
+
+@require_POST
+def run_pipeline(request, model_id):
+    """Sıralı işlem zincirini tek görev olarak kuyruğa ekle (API endpoint)"""
+    model = get_object_or_404(Model3D, id=model_id)
+    try:
+        data = json.loads(request.body)
+        job = enqueue_job(model, 'pipeline', parse_pipeline(data))
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+    
+    return JsonResponse(_job_payload(job), status=202)
+
+
+@require_POST
+def preview_operation(request, model_id, step_type):
+    """
+    İşlemi kaydetmeden düşük çözünürlükte önizle (API endpoint)
+    
+    Sonuç görüntüleyicinin geometri paketi (NWVB) olarak döner;
+    ProcessingStep oluşturulmaz, model değişmez.
+    """
+    from apps.visualization.services import geometry_encoder
+    
+    model = get_object_or_404(Model3D, id=model_id)
+    try:
+        operation = get_operation(step_type)
+        parameters = operation['parse'](json.loads(request.body))
+        path = preview_source(model, operation.get('face_growth', 1), operation.get('needs_volume', False))
+        
+        encoding = geometry_encoder.negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        cache_key = preview_cache_key(path, step_type, parameters, encoding)
+        body = cache.get(cache_key)
+        if body is None:
+            mesh = run_preview(path, step_type, parameters)
+            body = geometry_encoder.compress(geometry_encoder.encode_geometry(mesh), encoding)
+            cache.set(cache_key, body, timeout=600)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+    
+    response = HttpResponse(body, content_type='application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def job_status(request, job_id):
+    """Görev durumunu sorgula (API endpoint)"""
+    job = get_object_or_404(ProcessingJob, id=job_id)
+    return JsonResponse(_job_payload(job))
+
+
+@require_POST
+def cancel_processing_job(request, job_id):
+    """Görevi iptal et (API endpoint)"""
+    job = get_object_or_404(ProcessingJob, id=job_id)
+    if not cancel_job(job):
+        return JsonResponse({
+            'success': False,
+            'error': 'Görev zaten tamamlanmış'
+        }, status=409)
+    
+    job.refresh_from_db()
+    return JsonResponse(_job_payload(job))
+
+
 @require_POST
 def save_processing_step(request, model_id):
     """İşlem adımını kaydet (API endpoint)"""
@@ -502,6 +384,7 @@ def save_processing_step(request, model_id):
         # ProcessingStep oluştur (şimdilik dosya olmadan)
         step = ProcessingStep.objects.create(
             model=model,
+            parent=model.current_step,
             step_type=step_type,
             parameters=parameters,
             execution_time=0.0,  # Backend'de gerçek süre hesaplanacak
@@ -526,6 +409,30 @@ def save_processing_step(request, model_id):
 def complete_processing(request, model_id):
     """İşlemleri tamamla ve sonraki aşamaya geç"""
     model = get_object_or_404(Model3D, id=model_id)
+    
+    try:
+        from .services import ModelProcessor
+        
+        # Ara adımlar kompakt formatta; final model burada STL'e export edilir
+        processor = ModelProcessor(model.current_file.path)
+        stats = processor.get_stats()
+        processed = ProcessedModel(
+            original_model=model,
+            final_vertices_count=stats['vertices_count'],
+            final_faces_count=stats['faces_count'],
+            is_printable=stats['is_watertight']
+        )
+        processed.processed_file.save(
+            f'{model.id}.stl',
+            processor.export_file(file_type='stl'),
+            save=False
+        )
+        processed.save()
+        processed.processing_steps.set(versions.VersionTree(model).chain(model.current_step))
+    except Exception as e:
+        messages.error(request, f'Final model oluşturulamadı: {str(e)}')
+        return redirect('processing:processing_dashboard', model_id=model.id)
+    
     model.is_processed = True
     model.save()
     
@@ -0,0 +1 @@
+# Visualization services
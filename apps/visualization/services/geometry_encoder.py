@@ -0,0 +1,123 @@
+"""
+Görüntüleyici için kompakt geometri kodlayıcı
+İndeksli, 16-bit nicemlenmiş pozisyon ve oktahedral normal içeren ikili paket
+
+Paket düzeni (little-endian):
+    0   4s   sihirli değer b'NWVB'
+    4   u2   format sürümü
+    6   u2   bayraklar (bit 0: 32-bit indeks)
+    8   u4   vertex sayısı (V)
+    12  u4   face sayısı (F)
+    16  3f4  pozisyon başlangıcı (bounds min)
+    28  3f4  pozisyon ölçeği (extent / 65535)
+    40  ...  48 bayta kadar sıfır dolgu
+    48  u2   pozisyonlar (V x 3)
+    ..  i1   oktahedral normaller (V x 2)
+    ..  u2/u4 indeksler (F x 3)
+"""
+import gzip
+import struct
+
+import numpy as np
+import trimesh
+
+MAGIC = b'NWVB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII3f3f')
+HEADER_SIZE = 48
+
+FLAG_INDEX_32 = 1
+
+QUANTIZATION_MAX = 65535
+
+try:
+    import brotli
+except ImportError:  # brotli opsiyonel; yoksa gzip kullanılır
+    brotli = None
+
+
+def quantize_positions(vertices: np.ndarray):
+    """
+    Pozisyonları bounding box içinde 16-bit tam sayılara nicemle
+
+    Returns:
+        (quantized uint16 (V,3), origin (3,), scale (3,))
+    """
+    origin = vertices.min(axis=0)
+    extent = vertices.max(axis=0) - origin
+    scale = extent / QUANTIZATION_MAX
+    safe_scale = np.where(scale > 0, scale, 1.0)
+    quantized = np.rint((vertices - origin) / safe_scale)
+    return np.clip(quantized, 0, QUANTIZATION_MAX).astype('<u2'), origin, scale
+
+
+def octahedral_encode(normals: np.ndarray) -> np.ndarray:
+    """
+    Birim normalleri oktahedral izdüşümle 2 bileşenli int8'e kodla
+
+    Returns:
+        int8 (V, 2)
+    """
+    l1 = np.abs(normals).sum(axis=1, keepdims=True)
+    n = normals / np.where(l1 > 0, l1, 1.0)
+    x, y, z = n[:, 0], n[:, 1], n[:, 2]
+
+    sign_x = np.where(x >= 0, 1.0, -1.0)
+    sign_y = np.where(y >= 0, 1.0, -1.0)
+    lower = z < 0
+    ox = np.where(lower, (1.0 - np.abs(y)) * sign_x, x)
+    oy = np.where(lower, (1.0 - np.abs(x)) * sign_y, y)
+
+    encoded = np.rint(np.clip(np.column_stack([ox, oy]), -1.0, 1.0) * 127)
+    return encoded.astype(np.int8)
+
+
+def encode_geometry(mesh: trimesh.Trimesh) -> bytes:
+    """
+    Mesh'i görüntüleyici paketine kodla
+
+    Args:
+        mesh: Kodlanacak trimesh nesnesi
+
+    Returns:
+        İkili paket
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces)
+
+    positions, origin, scale = quantize_positions(vertices)
+    normals = octahedral_encode(np.asarray(mesh.vertex_normals))
+
+    flags = 0
+    if len(vertices) > 0xFFFF:
+        flags |= FLAG_INDEX_32
+        indices = faces.astype('<u4')
+    else:
+        indices = faces.astype('<u2')
+
+    header = HEADER.pack(MAGIC, VERSION, flags, len(vertices), len(faces), *origin, *scale)
+    return b''.join([
+        header.ljust(HEADER_SIZE, b'\x00'),
+        positions.tobytes(),
+        normals.tobytes(),
+        indices.tobytes(),
+    ])
+
+
+def negotiate_encoding(accept_encoding: str):
+    """İstemcinin desteklediği en iyi sıkıştırmayı seç ('br', 'gzip' veya None)"""
+    accepted = {part.split(';')[0].strip() for part in (accept_encoding or '').split(',')}
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(payload: bytes, encoding):
+    """Paketi seçilen yöntemle sıkıştır"""
+    if encoding == 'br':
+        return brotli.compress(payload, quality=5)
+    if encoding == 'gzip':
+        return gzip.compress(payload, compresslevel=6)
+    return payload
@@ -0,0 +1,144 @@
+"""
+Önizleme (LOD) Servisi
+Görüntüleyicinin önce yüklediği seyreltilmiş mesh seviyelerini üretir ve günceller
+"""
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from apps.core.services import mesh_format
+from apps.core.services.decimation import decimate
+from apps.core.services.mesh_cache import mesh_cache
+from apps.models.models import MeshLOD
+
+
+def lod_ratios():
+    """Ayarlardaki seviyeler, küçükten büyüğe"""
+    return sorted(getattr(settings, 'MESH_LOD_RATIOS', [0.05, 0.2]))
+
+
+def _save_level(model, ratio, mesh, digest):
+    lod = MeshLOD(model=model, ratio=ratio)
+    max_size = getattr(settings, 'PROCESSING_SPOOL_MAX_BYTES', 64 * 1024 * 1024)
+    lod.file.save(
+        f'lod.{mesh_format.EXTENSION}',
+        mesh_format.export_file(mesh, max_size),
+        save=False
+    )
+    lod.faces_count = len(mesh.faces)
+    lod.source_digest = digest
+    lod.save()
+    mesh_cache.put(lod.file.path, mesh)
+
+
+def _prune_levels(model, keep):
+    """Son kullanılan `keep` mesh özeti dışındaki seviyeleri sil"""
+    digests = []
+    for digest in model.lods.order_by('-updated_at').values_list('source_digest', flat=True):
+        if digest not in digests:
+            digests.append(digest)
+    for lod in model.lods.exclude(source_digest__in=digests[:keep]):
+        lod.file.delete(save=False)
+        lod.delete()
+
+
+def update_lods(model, mesh=None, previous_digest=None, rigid_transform=None):
+    """
+    Modelin önizleme seviyelerini güncel mesh'e göre güncelle
+
+    Seviyeler kaynak mesh özetiyle saklanır; son MESH_LOD_KEEP_VERSIONS
+    sürümün seviyeleri tutulduğundan geri alma/yinelemede mevcut
+    seviyeler yeniden kullanılır. Yalnızca eksik seviyeler üretilir.
+    Mesh yalnızca katı dönüşümle (döndürme) değiştiyse önceki sürümün
+    seviyeleri yeniden seyreltilmez, aynı dönüşümle taşınır.
+
+    Args:
+        model: Model3D
+        mesh: Güncel mesh (None ise gerekirse model.current_file'dan yüklenir)
+        previous_digest: Dönüşümden önceki mesh özeti
+        rigid_transform: Önceki mesh'ten güncel mesh'e 4x4 dönüşüm matrisi
+    """
+    digest = mesh_cache.key_for(model.current_file.path)
+    min_faces = getattr(settings, 'MESH_LOD_MIN_FACES', 2000)
+    ratios = lod_ratios()
+
+    # Ayarlardan çıkarılmış oranlar
+    for lod in model.lods.exclude(ratio__in=ratios):
+        lod.file.delete(save=False)
+        lod.delete()
+
+    levels = list(model.lods.filter(source_digest__in=[digest, previous_digest]))
+    current = {lod.ratio: lod for lod in levels if lod.source_digest == digest}
+    previous = {lod.ratio: lod for lod in levels if lod.source_digest == previous_digest}
+
+    # Yeniden kullanılan seviyeler en son kullanılan olarak işaretlenir
+    model.lods.filter(pk__in=[lod.pk for lod in current.values()]).update(updated_at=timezone.now())
+
+    for ratio in ratios:
+        if ratio in current:
+            continue
+        if mesh is None:
+            mesh = mesh_cache.load(model.current_file.path)
+
+        target_faces = int(len(mesh.faces) * ratio)
+        if target_faces < min_faces:
+            # Küçük mesh'lerde önizleme gereksiz; tam çözünürlük yeterli
+            continue
+
+        if rigid_transform is not None and ratio in previous:
+            level = mesh_cache.load(previous[ratio].file.path)
+            level.apply_transform(rigid_transform)
+        else:
+            level = decimate(mesh, target_faces)
+
+        _save_level(model, ratio, level, digest)
+
+    _prune_levels(model, getattr(settings, 'MESH_LOD_KEEP_VERSIONS', 4))
+
+
+def current_lods(model):
+    """
+    Güncel mesh'ten üretilmiş önizleme seviyeleri (küçükten büyüğe)
+
+    Sürüm değiştiğinde (geri alma/yineleme) veya güncelleme başarısız
+    olduğunda eski mesh'in seviyeleri dışarıda kalır.
+    """
+    digest = mesh_cache.key_for(model.current_file.path)
+    return [lod for lod in model.lods.all() if lod.source_digest == digest]
+
+
+def find_lod(model, level):
+    """
+    İstenen önizleme seviyesini bul
+
+    Yalnızca güncel mesh'ten üretilmiş seviyeler kullanılır (bkz.
+    current_lods); uygun seviye yoksa tam çözünürlük döner.
+
+    Args:
+        level: 'coarse' (en küçük seviye) veya face oranı
+
+    Returns:
+        (MeshLOD veya None, sonraki seviye: oran, 'full' veya None)
+    """
+    if level is None:
+        return None, None
+    lods = current_lods(model)
+    if not lods:
+        return None, None
+
+    if level == 'coarse':
+        index = 0
+    else:
+        try:
+            ratio = float(level)
+        except ValueError:
+            return None, None
+        ratios = np.array([lod.ratio for lod in lods])
+        matches = np.flatnonzero(np.isclose(ratios, ratio))
+        if not len(matches):
+            return None, None
+        index = int(matches[0])
+
+    following = lods[index + 1].ratio if index + 1 < len(lods) else 'full'
+    return lods[index], following
+
@@ -5,6 +5,8 @@ app_name = 'visualization'
 
 urlpatterns = [
     path('<uuid:model_id>/', views.visualize_model, name='visualize_model'),
+    path('<uuid:model_id>/geometry/', views.model_geometry, name='model_geometry'),
+    path('<uuid:model_id>/thickness/', views.thickness_overlay, name='thickness_overlay'),
 ]
 
 
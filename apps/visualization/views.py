@@ -1,5 +1,14 @@
 from django.shortcuts import render, get_object_or_404
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+from scipy.spatial import cKDTree
 from apps.models.models import Model3D
+from apps.core.services.mesh_cache import mesh_cache
+from apps.analysis.services.thickness import ThicknessEngine
+from .services import geometry_encoder
+from .services.lod import find_lod
 
 
 def visualize_model(request, model_id):
@@ -9,3 +18,96 @@ def visualize_model(request, model_id):
     return render(request, 'visualization/viewer.html', {
         'model': model
     })
+
+
+def _geometry_source(model, request):
+    """
+    İstenen geometrinin dosya yolu ve bir sonraki seviye
+
+    ?lod=coarse veya ?lod=<oran> önizleme seviyesini seçer; seviye
+    yoksa (küçük mesh) tam çözünürlük döner.
+    """
+    lod, following = find_lod(model, request.GET.get('lod'))
+    if lod is None:
+        return model.current_file.path, None
+    return lod.file.path, following
+
+
+def _geometry_etag(request, model_id):
+    """Geometri paketinin ETag'i: mesh içerik özeti + paket sürümü"""
+    model = Model3D.objects.filter(id=model_id).first()
+    if model is None:
+        return None
+    path, _ = _geometry_source(model, request)
+    digest = mesh_cache.key_for(path)
+    return f'{digest}-v{geometry_encoder.VERSION}'
+
+
+@condition(etag_func=_geometry_etag)
+def model_geometry(request, model_id):
+    """Görüntüleyici için sıkıştırılmış ikili geometri paketi (API endpoint)"""
+    model = get_object_or_404(Model3D, id=model_id)
+    path, following = _geometry_source(model, request)
+    
+    etag = f'{mesh_cache.key_for(path)}-v{geometry_encoder.VERSION}'
+    encoding = geometry_encoder.negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+    cache_key = f'geometry:{etag}:{encoding}'
+    
+    body = cache.get(cache_key)
+    if body is None:
+        payload = geometry_encoder.encode_geometry(mesh_cache.load(path))
+        body = geometry_encoder.compress(payload, encoding)
+        cache.set(cache_key, body, timeout=3600)
+    
+    response = HttpResponse(body, content_type='application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if following is not None:
+        # Görüntüleyici sıradaki seviyeyi arka planda yükler
+        response['X-Mesh-Lod-Next'] = str(following)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    # Tarayıcı her seferinde ETag ile doğrular; değişmediyse 304 döner
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _thickness_colors(path, full_path):
+    """
+    Geometri seviyesinin vertex sırasıyla kalınlık renkleri (uint8 RGB)
+
+    Kalınlık her zaman tam çözünürlükte ölçülür; önizleme seviyelerinin
+    vertex'leri en yakın tam çözünürlük vertex'inin değerini alır.
+    """
+    full = mesh_cache.load(full_path)
+    field = ThicknessEngine(full, mesh_hash=mesh_cache.key_for(full_path)).field()
+    if path != full_path:
+        _, nearest = cKDTree(full.vertices).query(mesh_cache.load(path).vertices)
+        field = field[nearest]
+    return ThicknessEngine.colors(field).tobytes()
+
+
+def thickness_overlay(request, model_id):
+    """
+    Duvar kalınlığı renk haritası (API endpoint)
+
+    Geometri paketiyle aynı ?lod= seviyesinin vertex'leri için 3 bayt
+    RGB dizisi; kırmızı ince, yeşil kalın duvardır.
+    """
+    model = get_object_or_404(Model3D, id=model_id)
+    path, _ = _geometry_source(model, request)
+    full_path = model.current_file.path
+    
+    encoding = geometry_encoder.negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+    cache_key = f'thickness-colors:{mesh_cache.key_for(path)}:{mesh_cache.key_for(full_path)}:{encoding}'
+    
+    body = cache.get(cache_key)
+    if body is None:
+        body = geometry_encoder.compress(_thickness_colors(path, full_path), encoding)
+        cache.set(cache_key, body, timeout=3600)
+    
+    response = HttpResponse(body, content_type='application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -174,3 +174,45 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50MB
 
 # Supported 3D file formats
 SUPPORTED_3D_FORMATS = ['.stl', '.ply']
+
+# Paylaşımlı mesh önbelleği bellek bütçesi (bayt)
+MESH_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Arka plan işleme worker'ı (python manage.py run_processing_worker)
+PROCESSING_WORKER_PROCESSES = 2
+PROCESSING_WORKER_POLL_INTERVAL = 1.0  # saniye
+# Bu kadar süre ilerleme yazmayan çalışan görev çökmüş sayılır ve başarısız işaretlenir
+PROCESSING_JOB_STALE_SECONDS = 30 * 60
+
+# İşlem sonuçları bu boyuta kadar bellekte export edilir, üstü diske taşar
+PROCESSING_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+# Önizleme (LOD) seviyeleri: tam çözünürlüğe göre face oranları
+MESH_LOD_RATIOS = [0.05, 0.2]
+MESH_LOD_MIN_FACES = 2000  # Bu sayının altına seyreltilmez
+MESH_LOD_KEEP_VERSIONS = 4  # Seviyeleri tutulan son sürüm sayısı (geri alma/yineleme)
+
+# Yüklemede "bütçeye indir" seçiliyse bu sayıdan fazla face'li taramalar
+# kuadrik seyreltme görevi olarak bu sayıya indirilir
+UPLOAD_FACE_BUDGET = 500_000
+
+# Sürüm geçmişi: her N adımda veya keyframe'den bu yana yeniden oynatma
+# süresi sınırı aşılınca sürüm dosyası kalıcı tutulur (keyframe); aradaki
+# eski sürümlerin dosyaları silinir ve gerekince yeniden oynatılarak kurulur
+VERSION_KEYFRAME_INTERVAL = 4
+VERSION_KEYFRAME_MAX_REPLAY_SECONDS = 20.0
+# Güncel sürümün bu kadar ata sürümü dosyasıyla tutulur (anında geri alma)
+VERSION_RECENT_ARTIFACTS = 2
+# Dosyası olmayan sürümlerin bellek içi önbellek bütçesi (bayt)
+VERSION_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Parametre önizlemesi (kaydetmeden) en fazla bu kadar face üzerinde çalışır
+PROCESSING_PREVIEW_MAX_FACES = 20000
+
+# Toplu analiz süreç havuzu (python manage.py analyze_models); None = CPU sayısı
+ANALYSIS_BULK_PROCESSES = None
+
+# Profilleme: aşama süreleri her zaman kaydedilir (GET /metrics/)
+PROFILING_TRACEMALLOC = False  # Python ayırma tepe değeri (ek yükü vardır)
+PROFILING_DUMP_DIR = None  # Örn. BASE_DIR / 'profiles'; ayarlıysa her görev/analiz profili buraya dökülür
+PROFILING_BACKEND = 'cprofile'  # veya 'pyinstrument' (kuruluysa)